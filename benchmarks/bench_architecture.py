@@ -0,0 +1,58 @@
+'''Compares the default and compact architecture presets of the builders: parameters, FLOPs per window, single window latency (p50/p99) and windows per second on large batches.
+
+    Usage:
+        python -m benchmarks.bench_architecture --calls 200 --windows 10000
+'''
+import argparse
+
+import numpy as np
+import pandas as pd
+
+from cerberus.predictors.univarstandard import BasicMultStepUniVar
+from cerberus.predictors.univarhybrid import HybridMultStepUniVar
+from cerberus.predictors.multivarstandard import BasicMultStepVar
+from benchmarks.bench_inference import FEATURES, latencies
+from benchmarks.bench_numpy_engine import throughput
+
+PRESETS = ('default', 'compact')
+
+
+def predictors(data: pd.DataFrame, steps_past: int, steps_future: int, sub_seq: int):
+    '''Yields a factory, the builders to compare and matching input windows for each predictor class.
+    '''
+    series = data['target']
+    univariate = np.lib.stride_tricks.sliding_window_view(np.array(series), steps_past)
+    multivariate = np.lib.stride_tricks.sliding_window_view(np.array(data[FEATURES[1:]]), steps_past, axis=0).transpose(0, 2, 1)
+    yield lambda: BasicMultStepUniVar(steps_past, steps_future, data=series, scale='standard'), ('create_mlp', 'create_cnn', 'create_lstm', 'create_bigru', 'create_encdec_lstm'), univariate
+    yield lambda: HybridMultStepUniVar(sub_seq, steps_past, steps_future, data=series, scale='standard'), ('create_cnnlstm',), univariate
+    yield lambda: BasicMultStepVar(steps_past, steps_future, data=data, features=FEATURES, scale='standard'), ('create_lstm', 'create_gru'), multivariate
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--calls', type=int, default=200)
+    parser.add_argument('--windows', type=int, default=10000)
+    parser.add_argument('--rows', type=int, default=20000)
+    parser.add_argument('--steps_past', type=int, default=10)
+    parser.add_argument('--steps_future', type=int, default=5)
+    parser.add_argument('--sub_seq', type=int, default=2)
+    args = parser.parse_args()
+
+    data = pd.read_csv('tests/example_dataset/CaliforniaHousing.csv')[:args.rows]
+
+    print(f"{'predictor':<22}{'architecture':<22}{'preset':<10}{'params':>9}{'MFLOPs':>9}{'p50':>9}{'p99':>9}  (ms){'windows/s':>12}")
+    for factory, builders, windows in predictors(data, args.steps_past, args.steps_future, args.sub_seq):
+        windows = windows[:args.windows]
+        for builder in builders:
+            for preset in PRESETS:
+                predictor = factory()
+                getattr(predictor, builder)(spec=preset)
+                report = predictor.model_report()
+                forecast = lambda batch: predictor.predict_batch(batch, batch_size=len(windows), low_latency=True)
+                latency = latencies(lambda: forecast(windows[:1]), args.calls)
+                print(f'{type(predictor).__name__:<22}{predictor.model_id:<22}{preset:<10}{report.params.sum():>9}{report.flops.sum() / 1e6:>9.3f}'
+                      f'{np.percentile(latency, 50):>9.2f}{np.percentile(latency, 99):>9.2f}      {throughput(forecast, windows):>12.0f}')
+
+
+if __name__ == '__main__':
+    main()
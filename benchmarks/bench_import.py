@@ -0,0 +1,47 @@
+'''Measures import time of the cerberus package in fresh interpreters. Exits with status 1 if import cerberus exceeds the budget, so it can guard against regressions in CI.
+
+    Usage:
+        python -m benchmarks.bench_import --repeat 5 --budget 1.5
+'''
+import argparse
+import subprocess
+import sys
+import time
+
+STATEMENTS = [
+    'import cerberus',
+    'from cerberus import BasicMultStepUniVar, BasicMultStepVar, HybridMultStepUniVar, HybridMultStepVar',
+    'from cerberus.preprocessing import sequence_windows',
+    'import tensorflow', # reference: cost of the dependency every import paid before
+]
+
+
+def import_time(statement: str, repeat: int) -> float:
+    '''Returns the best wall clock time of running a statement in a fresh interpreter.
+    '''
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, '-c', statement], check=True, capture_output=True)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--budget', type=float, default=None, help='Maximum seconds allowed for import cerberus.')
+    args = parser.parse_args()
+
+    baseline = import_time('pass', args.repeat)
+    times = {statement: import_time(statement, args.repeat) - baseline for statement in STATEMENTS}
+    for statement, seconds in times.items():
+        print(f'{seconds:8.3f}s  {statement}')
+
+    if args.budget is not None and times['import cerberus'] > args.budget:
+        print(f'import cerberus took longer than the budget of {args.budget}s')
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
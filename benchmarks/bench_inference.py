@@ -0,0 +1,66 @@
+'''Reports single window predict latency (p50/p99) of keras.Model.predict against the compiled low latency path for every create_* architecture.
+
+    Usage:
+        python -m benchmarks.bench_inference --calls 200
+'''
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from cerberus.predictors.univarstandard import BasicMultStepUniVar
+from cerberus.predictors.univarhybrid import HybridMultStepUniVar
+from cerberus.predictors.multivarstandard import BasicMultStepVar
+from cerberus.predictors.multivarhybrid import HybridMultStepVar
+
+FEATURES = ['target', 'HouseAge', 'AveRooms', 'AveBedrms', 'Population', 'AveOccup', 'Latitude', 'Longitude', 'MedInc']
+
+
+def predictors(data: pd.DataFrame, steps_past: int, steps_future: int, sub_seq: int):
+    '''Yields a factory and a matching input window for each predictor class.
+    '''
+    series = data['target']
+    yield lambda: BasicMultStepUniVar(steps_past, steps_future, data=series, scale='standard'), np.array(series[:steps_past])
+    yield lambda: HybridMultStepUniVar(sub_seq, steps_past, steps_future, data=series, scale='standard'), np.array(series[:steps_past])
+    yield lambda: BasicMultStepVar(steps_past, steps_future, data=data, features=FEATURES, scale='standard'), np.array(data[FEATURES[1:]][:steps_past])
+    yield lambda: HybridMultStepVar(sub_seq, steps_past, steps_future, data=data, features=FEATURES, scale='standard'), np.array(data[FEATURES[1:]][:steps_past])
+
+
+def latencies(function, calls: int) -> np.ndarray:
+    '''Returns per call latencies in milliseconds after a warm up call.
+    '''
+    function()
+    times = np.empty(calls)
+    for i in range(calls):
+        start = time.perf_counter()
+        function()
+        times[i] = time.perf_counter() - start
+    return times * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--calls', type=int, default=200)
+    parser.add_argument('--rows', type=int, default=2000)
+    parser.add_argument('--steps_past', type=int, default=10)
+    parser.add_argument('--steps_future', type=int, default=5)
+    parser.add_argument('--sub_seq', type=int, default=2)
+    args = parser.parse_args()
+
+    data = pd.read_csv('tests/example_dataset/CaliforniaHousing.csv')[:args.rows]
+
+    print(f"{'predictor':<22}{'architecture':<22}{'predict p50':>12}{'p99':>9}{'compiled p50':>14}{'p99':>9}  (ms)")
+    for factory, window in predictors(data, args.steps_past, args.steps_future, args.sub_seq):
+        for builder in sorted(name for name in dir(factory()) if name.startswith('create_')):
+            predictor = factory()
+            getattr(predictor, builder)()
+            keras_path = latencies(lambda: predictor.predict(window), args.calls)
+            compiled_path = latencies(lambda: predictor.predict(window, low_latency=True), args.calls)
+            print(f'{type(predictor).__name__:<22}{predictor.model_id:<22}'
+                  f'{np.percentile(keras_path, 50):>12.3f}{np.percentile(keras_path, 99):>9.3f}'
+                  f'{np.percentile(compiled_path, 50):>14.3f}{np.percentile(compiled_path, 99):>9.3f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,69 @@
+'''Compares the NumPy engine with the compiled TensorFlow forward pass for the MLP and CNN architectures: single window latency (p50/p99) and windows per second on large batches.
+
+    Usage:
+        python -m benchmarks.bench_numpy_engine --calls 500 --windows 10000
+'''
+import argparse
+import os
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+from cerberus.inference.numpy_engine import export_numpy, NumpyPredictor
+from cerberus.predictors.univarstandard import BasicMultStepUniVar
+from cerberus.predictors.multivarstandard import BasicMultStepVar
+from benchmarks.bench_inference import FEATURES, latencies
+
+
+def predictors(data: pd.DataFrame, steps_past: int, steps_future: int):
+    '''Yields a factory and matching input windows for each predictor class.
+    '''
+    series = data['target']
+    yield lambda: BasicMultStepUniVar(steps_past, steps_future, data=series, scale='standard'), np.lib.stride_tricks.sliding_window_view(np.array(series), steps_past)
+    yield lambda: BasicMultStepVar(steps_past, steps_future, data=data, features=FEATURES, scale='standard'), np.lib.stride_tricks.sliding_window_view(np.array(data[FEATURES[1:]]), steps_past, axis=0).transpose(0, 2, 1)
+
+
+def throughput(function, windows: np.ndarray) -> float:
+    '''Returns forecast windows per second of one call on all windows after a warm up call.
+    '''
+    function(windows[:10])
+    start = time.perf_counter()
+    function(windows)
+    return len(windows) / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--calls', type=int, default=500)
+    parser.add_argument('--windows', type=int, default=10000)
+    parser.add_argument('--rows', type=int, default=20000)
+    parser.add_argument('--steps_past', type=int, default=10)
+    parser.add_argument('--steps_future', type=int, default=5)
+    args = parser.parse_args()
+
+    data = pd.read_csv('tests/example_dataset/CaliforniaHousing.csv')[:args.rows]
+
+    print(f"{'predictor':<22}{'architecture':<14}{'compiled p50':>14}{'p99':>9}{'numpy p50':>11}{'p99':>9}  (us){'compiled':>14}{'numpy':>12}  (windows/s)")
+    with tempfile.TemporaryDirectory() as location:
+        for factory, windows in predictors(data, args.steps_past, args.steps_future):
+            windows = windows[:args.windows]
+            for builder in ('create_mlp', 'create_cnn'):
+                predictor = factory()
+                getattr(predictor, builder)()
+                path = os.path.join(location, f'{builder}.npz')
+                export_numpy(predictor, path)
+                engine = NumpyPredictor(path)
+
+                compiled = lambda batch: predictor.predict_batch(batch, batch_size=len(windows), low_latency=True)
+                compiled_latency = latencies(lambda: compiled(windows[:1]), args.calls) * 1000
+                numpy_latency = latencies(lambda: engine.predict_batch(windows[:1]), args.calls) * 1000
+                print(f'{type(predictor).__name__:<22}{predictor.model_id:<14}'
+                      f'{np.percentile(compiled_latency, 50):>14.1f}{np.percentile(compiled_latency, 99):>9.1f}'
+                      f'{np.percentile(numpy_latency, 50):>11.1f}{np.percentile(numpy_latency, 99):>9.1f}      '
+                      f'{throughput(compiled, windows):>14.0f}{throughput(engine.predict_batch, windows):>12.0f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,94 @@
+'''Load generator for the micro-batching inference server. Concurrent clients send single window requests back to back, once against one predict call per request in a thread pool and once against MicroBatchServer. Reports throughput and latency percentiles.
+
+    Usage:
+        python -m benchmarks.bench_serving --clients 64 --requests 50
+'''
+import argparse
+import asyncio
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+from cerberus.inference.server import MicroBatchServer
+from cerberus.predictors.multivarstandard import BasicMultStepVar
+from cerberus.predictors.univarhybrid import HybridMultStepUniVar
+
+FEATURES = ['target', 'HouseAge', 'AveRooms', 'AveBedrms', 'Population', 'AveOccup', 'Latitude', 'Longitude', 'MedInc']
+
+
+def predictors(data: pd.DataFrame, steps_past: int, steps_future: int, sub_seq: int):
+    '''Yields a factory, a builder and the input windows of each served predictor class.
+    '''
+    series = data['target']
+    univariate = np.lib.stride_tricks.sliding_window_view(np.array(series), steps_past)
+    multivariate = np.lib.stride_tricks.sliding_window_view(np.array(data[FEATURES[1:]]), steps_past, axis=0).transpose(0, 2, 1)
+    yield lambda: BasicMultStepVar(steps_past, steps_future, data=data, features=FEATURES, scale='standard'), 'create_lstm', multivariate
+    yield lambda: HybridMultStepUniVar(sub_seq, steps_past, steps_future, data=series, scale='standard'), 'create_cnnlstm', univariate
+
+
+async def load(send, windows: np.ndarray, clients: int, requests: int) -> (float, np.ndarray):
+    '''Runs concurrent clients sending requests back to back. Returns the wall time in seconds and the request latencies in milliseconds.
+    '''
+    latencies = []
+
+    async def client(offset: int):
+        for i in range(requests):
+            start = time.perf_counter()
+            await send(windows[(offset + i) % len(windows)])
+            latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(client(offset * requests) for offset in range(clients)))
+    return time.perf_counter() - start, np.array(latencies) * 1000
+
+
+async def unbatched(predictor: object, windows: np.ndarray, clients: int, requests: int) -> (float, np.ndarray):
+    send = lambda window: asyncio.to_thread(predictor.predict, window, low_latency=True)
+    await send(windows[0]) # warm up
+    return await load(send, windows, clients, requests)
+
+
+async def batched(server: MicroBatchServer, windows: np.ndarray, clients: int, requests: int) -> (float, np.ndarray):
+    async with server:
+        await server.predict(windows[0]) # warm up
+        server.batches = 0
+        return await load(server.predict, windows, clients, requests)
+
+
+def report(name: str, seconds: float, latencies: np.ndarray):
+    print(f'{name:<40}{len(latencies) / seconds:>12.1f}'
+          f'{np.percentile(latencies, 50):>10.2f}{np.percentile(latencies, 95):>10.2f}{np.percentile(latencies, 99):>10.2f}')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--clients', type=int, default=64)
+    parser.add_argument('--requests', type=int, default=50, help='requests per client')
+    parser.add_argument('--max_batch_size', type=int, default=64)
+    parser.add_argument('--max_wait', type=float, default=0.002, help='seconds')
+    parser.add_argument('--rows', type=int, default=2000)
+    parser.add_argument('--steps_past', type=int, default=10)
+    parser.add_argument('--steps_future', type=int, default=5)
+    parser.add_argument('--sub_seq', type=int, default=2)
+    args = parser.parse_args()
+
+    data = pd.read_csv('tests/example_dataset/CaliforniaHousing.csv')[:args.rows]
+
+    print(f"{'predictor':<40}{'requests/s':>12}{'p50':>10}{'p95':>10}{'p99':>10}  (ms)")
+    for factory, builder, windows in predictors(data, args.steps_past, args.steps_future, args.sub_seq):
+        trained = factory()
+        getattr(trained, builder)()
+        with tempfile.TemporaryDirectory() as location:
+            trained.save_model(location)
+            server = MicroBatchServer.load(factory(), location, max_batch_size=args.max_batch_size, max_wait=args.max_wait)
+        name = type(trained).__name__
+
+        report(f'{name} predict per request', *asyncio.run(unbatched(server.predictor, windows, args.clients, args.requests)))
+        report(f'{name} micro-batched', *asyncio.run(batched(server, windows, args.clients, args.requests)))
+        print(f'{"":<40}{args.clients * args.requests / server.batches:>12.1f} requests per model call')
+
+
+if __name__ == '__main__':
+    main()
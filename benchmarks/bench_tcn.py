@@ -0,0 +1,58 @@
+'''Compares the architectures processing all time steps in parallel, the temporal convolutional network and the Transformer encoder, with the LSTM on the CaliforniaHousing dataset: training seconds per epoch, validation loss, parameters, FLOPs per window, single window latency (p50) and windows per second on large batches, for growing window lengths.
+
+    Usage:
+        python -m benchmarks.bench_tcn --epochs 5 --steps_past 10 50 --architectures create_lstm create_tcn create_transformer
+'''
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from cerberus.predictors.univarstandard import BasicMultStepUniVar
+from cerberus.predictors.multivarstandard import BasicMultStepVar
+from benchmarks.bench_inference import FEATURES, latencies
+from benchmarks.bench_numpy_engine import throughput
+
+
+def predictors(data: pd.DataFrame, steps_past: int, steps_future: int):
+    '''Yields a factory and matching input windows for each predictor class.
+    '''
+    series = data['target']
+    yield lambda: BasicMultStepUniVar(steps_past, steps_future, data=series, scale='standard'), np.lib.stride_tricks.sliding_window_view(np.array(series), steps_past)
+    yield lambda: BasicMultStepVar(steps_past, steps_future, data=data, features=FEATURES, scale='standard'), np.lib.stride_tricks.sliding_window_view(np.array(data[FEATURES[1:]]), steps_past, axis=0).transpose(0, 2, 1)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--epochs', type=int, default=5)
+    parser.add_argument('--batch_size', type=int, default=64)
+    parser.add_argument('--calls', type=int, default=200)
+    parser.add_argument('--windows', type=int, default=10000)
+    parser.add_argument('--rows', type=int, default=5000)
+    parser.add_argument('--steps_past', type=int, nargs='+', default=[10, 50])
+    parser.add_argument('--steps_future', type=int, default=5)
+    parser.add_argument('--architectures', nargs='+', default=['create_lstm', 'create_tcn', 'create_transformer'])
+    args = parser.parse_args()
+
+    data = pd.read_csv('tests/example_dataset/CaliforniaHousing.csv')[:args.rows]
+
+    print(f"{'predictor':<22}{'steps_past':>11}{'architecture':>15}{'s/epoch':>9}{'val_loss':>10}{'params':>9}{'MFLOPs':>9}{'p50 (ms)':>10}{'windows/s':>12}")
+    for steps_past in args.steps_past:
+        for factory, windows in predictors(data, steps_past, args.steps_future):
+            windows = windows[:args.windows]
+            for builder in args.architectures:
+                predictor = factory()
+                getattr(predictor, builder)()
+                start = time.perf_counter()
+                history = predictor.fit_model(args.epochs, show_progress=0, batch_size=args.batch_size).history
+                seconds = (time.perf_counter() - start) / args.epochs
+                report = predictor.model_report()
+                forecast = lambda batch: predictor.predict_batch(batch, batch_size=len(windows), low_latency=True)
+                latency = latencies(lambda: forecast(windows[:1]), args.calls)
+                print(f'{type(predictor).__name__:<22}{steps_past:>11}{predictor.model_id:>15}{seconds:>9.2f}{history["val_loss"][-1]:>10.4f}'
+                      f'{report.params.sum():>9}{report.flops.sum() / 1e6:>9.3f}{np.percentile(latency, 50):>10.2f}{throughput(forecast, windows):>12.0f}')
+
+
+if __name__ == '__main__':
+    main()
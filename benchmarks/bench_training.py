@@ -0,0 +1,69 @@
+'''Compares training throughput (epochs/second) of every architecture in univarstandard.py and multivarstandard.py in float32, with XLA and with XLA plus bfloat16 mixed precision.
+
+    Usage:
+        python -m benchmarks.bench_training --rows 5000 --epochs 3
+'''
+import argparse
+import time
+
+import pandas as pd
+
+from tensorflow import keras
+
+from cerberus.predictors.univarstandard import BasicMultStepUniVar
+from cerberus.predictors.multivarstandard import BasicMultStepVar
+from cerberus.training.acceleration import bfloat16_supported
+
+FEATURES = ['target', 'HouseAge', 'AveRooms', 'AveBedrms', 'Population', 'AveOccup', 'Latitude', 'Longitude', 'MedInc']
+
+MODES = {
+    'float32': dict(),
+    'xla': dict(jit_compile=True),
+    'xla+bf16': dict(jit_compile=True, mixed_precision=True),
+}
+
+
+class EpochTimer(keras.callbacks.Callback):
+    '''Records wall clock time per epoch.
+    '''
+    def on_train_begin(self, logs=None):
+        self.times = []
+
+    def on_epoch_begin(self, epoch, logs=None):
+        self.start = time.perf_counter()
+
+    def on_epoch_end(self, epoch, logs=None):
+        self.times.append(time.perf_counter() - self.start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=5000)
+    parser.add_argument('--epochs', type=int, default=3, help='Epochs per run, the first one (tracing and compilation) is excluded.')
+    parser.add_argument('--batch_size', type=int, default=64)
+    parser.add_argument('--steps_past', type=int, default=20)
+    parser.add_argument('--steps_future', type=int, default=5)
+    args = parser.parse_args()
+
+    data = pd.read_csv('tests/example_dataset/CaliforniaHousing.csv')[:args.rows]
+    factories = [
+        lambda: BasicMultStepUniVar(args.steps_past, args.steps_future, data=data['target'], scale='standard'),
+        lambda: BasicMultStepVar(args.steps_past, args.steps_future, data=data, features=FEATURES, scale='standard'),
+    ]
+    modes = MODES if bfloat16_supported() else {mode: options for mode, options in MODES.items() if 'mixed_precision' not in options}
+
+    print(f"{'predictor':<22}{'architecture':<22}" + ''.join(f'{mode:>12}' for mode in modes) + '  (epochs/s)')
+    for factory in factories:
+        for builder in sorted(name for name in dir(factory()) if name.startswith('create_')):
+            rates = []
+            for options in modes.values():
+                predictor = factory()
+                getattr(predictor, builder)(**options)
+                timer = EpochTimer()
+                predictor.model.fit(predictor.input_x, predictor.input_y, validation_split=0.2, batch_size=args.batch_size, epochs=args.epochs, verbose=0, callbacks=[timer])
+                rates.append(len(timer.times[1:]) / sum(timer.times[1:]))
+            print(f'{type(predictor).__name__:<22}{predictor.model_id:<22}' + ''.join(f'{rate:>12.2f}' for rate in rates))
+
+
+if __name__ == '__main__':
+    main()
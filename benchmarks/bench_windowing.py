@@ -0,0 +1,64 @@
+'''Compares the strided windowing engine against the original per-index Python loop.
+
+    Usage:
+        python -m benchmarks.bench_windowing --length 1000000 --steps_past 48 --steps_future 12
+'''
+import argparse
+import time
+
+import numpy as np
+
+from cerberus.preprocessing.windowing import sequence_windows
+
+
+def loop_windows(input_sequence, steps_past, steps_future):
+    '''Original _sequence_prep loop of the univariate predictors.
+    '''
+    X = []
+    y = []
+    length = len(input_sequence)
+    for i in range(length):
+        last = i + steps_past
+        if last > length - steps_future:
+            break
+        X.append(input_sequence[i:last])
+        y.append(input_sequence[last:last + steps_future])
+    return np.array(X), np.array(y)
+
+
+def timed(function, repeat):
+    '''Returns the best wall clock time of function over repeat runs.
+    '''
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--length', type=int, default=1_000_000)
+    parser.add_argument('--steps_past', type=int, default=48)
+    parser.add_argument('--steps_future', type=int, default=12)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    series = np.random.default_rng(0).standard_normal((args.length, 1))
+
+    X_loop, y_loop = loop_windows(series, args.steps_past, args.steps_future)
+    X, y = sequence_windows(series, args.steps_past, args.steps_future)
+    assert np.array_equal(X, X_loop) and np.array_equal(y, y_loop)
+
+    loop_time = timed(lambda: loop_windows(series, args.steps_past, args.steps_future), args.repeat)
+    strided_time = timed(lambda: sequence_windows(series, args.steps_past, args.steps_future), args.repeat)
+
+    print(f'length={args.length} steps_past={args.steps_past} steps_future={args.steps_future}')
+    print(f'loop:    {loop_time:.4f}s  {(X_loop.nbytes + y_loop.nbytes) / 2**20:.1f} MiB materialised')
+    print(f'strided: {strided_time:.6f}s  0.0 MiB materialised (views on {series.nbytes / 2**20:.1f} MiB series)')
+    print(f'speedup: {loop_time / strided_time:.0f}x')
+
+
+if __name__ == '__main__':
+    main()
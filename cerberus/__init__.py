@@ -1,3 +1,17 @@
 __version__ = "0.1.0"
 
-from cerberus import predictors
+from cerberus.lazy import lazy_exports
+
+# predictors and their dependencies (tensorflow, scikit-learn, matplotlib) are only imported on first access
+__getattr__, __dir__ = lazy_exports(
+    'cerberus',
+    {
+        'BasicMultStepVar': 'cerberus.predictors.multivarstandard',
+        'HybridMultStepVar': 'cerberus.predictors.multivarhybrid',
+        'BasicMultStepUniVar': 'cerberus.predictors.univarstandard',
+        'HybridMultStepUniVar': 'cerberus.predictors.univarhybrid',
+        'GlobalMultStepUniVar': 'cerberus.predictors.univarglobal',
+    },
+    submodules=('predictors', 'preprocessing', 'inference', 'training', 'evaluation'))
+
+__all__ = ['predictors', 'BasicMultStepVar', 'HybridMultStepVar', 'BasicMultStepUniVar', 'HybridMultStepUniVar', 'GlobalMultStepUniVar'] # star imports only resolve lazy names listed here
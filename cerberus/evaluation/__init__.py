@@ -0,0 +1 @@
+from cerberus.evaluation.backtest import forecast_origins, walk_forward, horizon_scores, backtest, expanding_backtest
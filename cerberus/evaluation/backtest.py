@@ -0,0 +1,147 @@
+import warnings
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+from numpy import array
+from numpy import absolute
+from numpy import sqrt
+from numpy import nan
+from numpy import nanmean
+from numpy import isfinite
+from numpy import errstate
+from numpy import concatenate
+from numpy import linspace
+
+import pandas as pd
+from pandas import DataFrame
+
+from cerberus.predictors.blueprints_predictors.abstract_multivariate import MultiVariateMultiStep
+from cerberus.preprocessing.windowing import sequence_windows, window_count
+from cerberus.workers import limit_threads
+
+
+def forecast_origins(predictor: object, data, stride: int = 1) -> (array, array):
+    '''Cuts every forecast origin of a held out series into an input window and the values that followed it. Windows are strided views, nothing is copied.
+        Parameters:
+            predictor (object): Predictor defining steps_past and steps_future. Multivariate predictors also define the features.
+            data (DataFrame): Held out series in original units. Univariate predictors accept Series and arrays as well.
+            stride (int): Steps between two consecutive origins.
+        Returns:
+            X (array): Input windows of shape (origins, steps_past) or (origins, steps_past, features).
+            y (array): Actual values of shape (origins, steps_future).
+    '''
+    multivariate = isinstance(predictor, MultiVariateMultiStep)
+    target_offset = -1 if multivariate else 0 # same alignment as in training
+    if window_count(len(data), predictor.steps_past, predictor.steps_future, target_offset) <= 0:
+        raise ValueError('Held out series is too short for the requested steps to look backwards and forward')
+
+    if multivariate:
+        frame = array(data[predictor.features], dtype=float)
+        X, _ = sequence_windows(frame[:, 1:], predictor.steps_past, predictor.steps_future, target_offset)
+        _, y = sequence_windows(frame[:, 0], predictor.steps_past, predictor.steps_future, target_offset)
+    else:
+        X, y = sequence_windows(array(data, dtype=float).reshape(-1), predictor.steps_past, predictor.steps_future)
+    return X[::stride], y[::stride]
+
+
+def walk_forward(predictor: object, data, stride: int = 1, batch_size: int = 1024, low_latency: bool = False) -> (array, array):
+    '''Forecasts steps_future ahead from every origin of a held out series with batched model calls.
+        Parameters:
+            predictor (object): Trained predictor.
+            data (DataFrame): Held out series in original units.
+            stride (int): Steps between two consecutive origins.
+            batch_size (int): Maximum number of origins per model call.
+            low_latency (bool): Run the compiled forward pass instead of keras predict_on_batch.
+        Returns:
+            forecasts (array): Forecasts of shape (origins, steps_future) in original units.
+            actuals (array): Actual values of shape (origins, steps_future).
+    '''
+    X, actuals = forecast_origins(predictor, data, stride)
+    forecasts = predictor.predict_batch(X, batch_size=batch_size, low_latency=low_latency)
+    if not isinstance(predictor, MultiVariateMultiStep): # univariate predictors forecast the scaled series
+        forecasts = predictor.scaler.inverse_transform(forecasts.reshape(-1, 1)).reshape(forecasts.shape)
+    return forecasts, array(actuals)
+
+
+def horizon_scores(forecasts: array, actuals: array) -> DataFrame:
+    '''Scores forecasts per horizon step.
+        Parameters:
+            forecasts (array): Forecasts of shape (origins, steps_future).
+            actuals (array): Actual values of the same shape.
+        Returns:
+            scores (DataFrame): MAE, RMSE and MAPE (in percent, zero actuals are skipped) indexed by horizon step starting at 1.
+    '''
+    errors = forecasts - actuals
+    with errstate(divide='ignore', invalid='ignore'):
+        percentage = absolute(errors / actuals)
+    percentage[~isfinite(percentage)] = nan
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore', RuntimeWarning) # steps with only zero actuals have no MAPE
+        mape = 100 * nanmean(percentage, axis=0)
+
+    return DataFrame({
+        'mae': absolute(errors).mean(axis=0),
+        'rmse': sqrt((errors ** 2).mean(axis=0)),
+        'mape': mape,
+    }, index=pd.RangeIndex(1, errors.shape[1] + 1, name='step'))
+
+
+def backtest(predictor: object, data, stride: int = 1, batch_size: int = 1024, low_latency: bool = False) -> DataFrame:
+    '''Walk-forward backtest of a trained predictor on a held out series.
+        Parameters:
+            predictor (object): Trained predictor.
+            data (DataFrame): Held out series in original units.
+            stride (int): Steps between two consecutive origins.
+            batch_size (int): Maximum number of origins per model call.
+            low_latency (bool): Run the compiled forward pass instead of keras predict_on_batch.
+        Returns:
+            scores (DataFrame): MAE, RMSE and MAPE per horizon step.
+    '''
+    return horizon_scores(*walk_forward(predictor, data, stride, batch_size, low_latency))
+
+
+def _rows(data, start: int, stop: int):
+    return data.iloc[start:stop] if hasattr(data, 'iloc') else data[start:stop]
+
+
+def _fold(predictor_class: type, config: dict, architecture: str, epochs: int, fit_options: dict, test, stride: int, batch_size: int) -> (array, array):
+    '''Trains a fresh predictor on the history of one fold and forecasts its test block. Runs in a worker process.
+    '''
+    predictor = predictor_class(**config)
+    getattr(predictor, architecture)()
+    predictor.fit_model(epochs, show_progress=0, **fit_options)
+    return walk_forward(predictor, test, stride, batch_size)
+
+
+def expanding_backtest(predictor_class: type, config: dict, architecture: str, epochs: int, folds: int = 3, initial: float = 0.5, stride: int = 1, fit_options: dict = None, batch_size: int = 1024, processes: int = None, threads_per_worker: int = 1) -> (DataFrame, DataFrame):
+    '''Expanding window backtest. The series after the initial history is split into consecutive test blocks. Every fold retrains on all data before its block (scaler included, so nothing leaks) and forecasts the block walk-forward. Folds run in parallel worker processes.
+        Parameters:
+            predictor_class (type): Predictor class such as BasicMultStepUniVar.
+            config (dict): Constructor arguments of the predictor. config['data'] holds the complete series.
+            architecture (str): Builder to train, for example 'create_lstm'.
+            epochs (int): Training epochs per fold.
+            folds (int): Number of test blocks.
+            initial (float): Fraction of the series used as history of the first fold.
+            stride (int): Steps between two consecutive origins.
+            fit_options (dict): Further arguments of fit_model.
+            batch_size (int): Maximum number of origins per model call.
+            processes (int): Number of workers. Defaults to one per fold.
+            threads_per_worker (int): Size of the tensorflow thread pools of each worker.
+        Returns:
+            scores (DataFrame): MAE, RMSE and MAPE per horizon step over all folds.
+            fold_scores (DataFrame): The same scores per fold, with a fold column.
+    '''
+    data = config['data']
+    steps_past = config['steps_past']
+    cuts = linspace(int(len(data) * initial), len(data), folds + 1).astype(int)
+
+    context = multiprocessing.get_context('spawn') # tensorflow is not fork safe
+    with ProcessPoolExecutor(processes or folds, mp_context=context, initializer=limit_threads, initargs=(threads_per_worker,)) as pool:
+        futures = [
+            pool.submit(_fold, predictor_class, {**config, 'data': _rows(data, 0, start)}, architecture, epochs, fit_options or {}, _rows(data, start - steps_past, stop), stride, batch_size)
+            for start, stop in zip(cuts[:-1], cuts[1:])]
+        results = [future.result() for future in futures]
+
+    fold_scores = pd.concat([horizon_scores(*result).assign(fold=fold) for fold, result in enumerate(results)])
+    forecasts, actuals = (concatenate(parts) for parts in zip(*results))
+    return horizon_scores(forecasts, actuals), fold_scores
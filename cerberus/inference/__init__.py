@@ -0,0 +1,18 @@
+from cerberus.inference.batching import window_batches, batch_forecast
+from cerberus.inference.rollout import RingBuffer, recursive_forecast
+from cerberus.inference.server import MicroBatchServer
+from cerberus.inference.numpy_engine import export_numpy, NumpyPredictor
+from cerberus.lazy import lazy_exports
+
+# compiled and lite need tensorflow and are imported on first access
+__getattr__, __dir__ = lazy_exports(
+    'cerberus.inference',
+    {
+        'input_signature': 'cerberus.inference.compiled',
+        'compiled_forward': 'cerberus.inference.compiled',
+        'export_tflite': 'cerberus.inference.lite',
+        'load_tflite': 'cerberus.inference.lite',
+        'LiteModel': 'cerberus.inference.lite',
+    })
+
+__all__ = ['window_batches', 'batch_forecast', 'RingBuffer', 'recursive_forecast', 'MicroBatchServer', 'export_numpy', 'NumpyPredictor', 'input_signature', 'compiled_forward', 'export_tflite', 'load_tflite', 'LiteModel'] # star imports only resolve lazy names listed here
@@ -0,0 +1,43 @@
+from itertools import islice
+
+from numpy import array
+from numpy import concatenate
+from numpy import ndarray
+
+
+def window_batches(windows, batch_size: int):
+    '''Yields consecutive batches of windows. Arrays are sliced without copying, other iterables are consumed lazily.
+        Parameters:
+            windows (array): Array of shape (n_windows, ...) or any iterable of windows.
+            batch_size (int): Maximum number of windows per batch.
+        Returns:
+            batches (generator): Arrays of at most batch_size windows.
+    '''
+    if batch_size <= 0:
+        raise ValueError('Batch size needs to be bigger than 0')
+    if isinstance(windows, ndarray):
+        for start in range(0, len(windows), batch_size):
+            yield windows[start:start + batch_size]
+        return
+    iterator = iter(windows)
+    while True:
+        batch = list(islice(iterator, batch_size))
+        if not batch:
+            return
+        yield array(batch)
+
+
+def batch_forecast(forward, prepare, windows, batch_size: int) -> array:
+    '''Forecasts many windows with one model call per batch.
+        Parameters:
+            forward (callable): Runs the model on a prepared batch.
+            prepare (callable): Scales and reshapes a batch of raw windows into the model input layout.
+            windows (array): Array of shape (n_windows, ...) or any iterable of windows.
+            batch_size (int): Maximum number of windows per model call.
+        Returns:
+            forecasts (array): Contiguous array of shape (n_windows, steps_future).
+    '''
+    forecasts = [array(forward(prepare(batch))).reshape(len(batch), -1) for batch in window_batches(windows, batch_size)]
+    if not forecasts:
+        raise ValueError('No input sequences to forecast')
+    return concatenate(forecasts)
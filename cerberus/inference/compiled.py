@@ -0,0 +1,51 @@
+from __future__ import annotations
+
+from weakref import ref
+from weakref import WeakKeyDictionary
+
+from numpy import array
+
+from cerberus.lazy import LazyImport
+from cerberus.inference.lite import LiteModel
+
+tf = LazyImport('tensorflow')
+keras = LazyImport('tensorflow', 'keras')
+
+_forward_cache = WeakKeyDictionary() # keras model -> compiled forward pass
+
+
+def input_signature(model: keras.Model) -> tf.TensorSpec:
+    '''Derives a fixed input signature from the input shape of a built model. The batch dimension stays open.
+        Parameters:
+            model (Model): Built keras model.
+        Returns:
+            spec (TensorSpec): Signature of the model input, a list of signatures for models with several inputs.
+    '''
+    if isinstance(model.input_shape, list):
+        return [tf.TensorSpec((None,) + tuple(shape[1:]), keras.backend.floatx()) for shape in model.input_shape]
+    return tf.TensorSpec((None,) + tuple(model.input_shape[1:]), keras.backend.floatx())
+
+
+def compiled_forward(model: keras.Model):
+    '''Returns a cached tf.function forward pass of a model. Calling it skips the data adapter and predict loop of keras.Model.predict, the graph is traced only once per model.
+        Parameters:
+            model (Model): Built keras model.
+        Returns:
+            forward (callable): Takes an input batch (a list of batches for models with several inputs) and returns the model output as array.
+    '''
+    if isinstance(model, LiteModel): # interpreters run without tracing
+        return model.predict_on_batch
+    forward = _forward_cache.get(model)
+    if forward is None:
+        specs = input_signature(model)
+        multiple = isinstance(specs, list)
+        specs = specs if multiple else [specs]
+        dtype = specs[0].dtype.as_numpy_dtype
+        reference = ref(model) # the cached value must not keep its key alive, or the model is never freed
+        graph = tf.function(lambda *x: reference()(list(x) if multiple else x[0], training=False), input_signature=specs)
+
+        def forward(data: array) -> array:
+            return graph(*(array(part, dtype=dtype) for part in (data if multiple else [data]))).numpy()
+
+        _forward_cache[model] = forward
+    return forward
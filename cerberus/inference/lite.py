@@ -0,0 +1,164 @@
+from __future__ import annotations
+
+import os
+import json
+
+from numpy import array
+from numpy import float32
+from numpy import concatenate
+from numpy import zeros
+
+from cerberus.preprocessing.windowing import sliding_windows
+from cerberus.lazy import LazyImport
+
+tf = LazyImport('tensorflow')
+keras = LazyImport('tensorflow', 'keras')
+scaling = LazyImport('cerberus.preprocessing.scaling')
+
+MODEL_FILE = 'model.tflite'
+META_FILE = 'lite.json'
+QUANTIZATIONS = ('', 'float16', 'dynamic', 'int8')
+
+
+def _interpreter_class() -> type:
+    '''Returns the lightest TFLite interpreter installed. ai_edge_litert and tflite_runtime run without the TensorFlow runtime, tf.lite is the fallback.
+    '''
+    try:
+        from ai_edge_litert.interpreter import Interpreter
+    except ImportError:
+        try:
+            from tflite_runtime.interpreter import Interpreter
+        except ImportError:
+            Interpreter = tf.lite.Interpreter
+    return Interpreter
+
+
+def _calibration_inputs(predictor: object, samples: int) -> list:
+    '''Model inputs of the first training windows, used to calibrate int8 activations.
+    '''
+    inputs = predictor.get_X_input
+    if inputs is None: # streaming multivariate hybrids keep no windows, they are cut from the start of the stored features
+        features = predictor.data[1:].transpose()[:samples + predictor.steps_past - 1]
+        inputs = predictor._input_layout(sliding_windows(features, predictor.steps_past))
+    inputs = inputs[:samples]
+    if hasattr(predictor, '_model_inputs'): # global predictors keep the series codes of their windows apart
+        inputs = predictor._model_inputs(inputs, predictor.input_codes[:samples])
+    return inputs if isinstance(inputs, list) else [inputs]
+
+
+def export_tflite(predictor: object, location: str, quantize: str = '', batch_size: int = 32, calibration: int = 256) -> str:
+    '''Converts the model of a predictor into a TFLite flatbuffer and saves it with the fitted scaler. The batch size is fixed in the flatbuffer, as the converter only lowers recurrent layers with static shapes. LiteModel pads smaller batches.
+        Parameters:
+            predictor (object): Predictor with a model built by one of its create_* builders.
+            location (str): Directory to export to.
+            quantize (str): Post-training quantisation. '' keeps float32 weights, 'float16' halves the weights, 'dynamic' stores int8 weights, 'int8' quantises weights and activations calibrated on training windows (models without recurrent layers only).
+            batch_size (int): Number of windows per interpreter call.
+            calibration (int): Number of training windows used to calibrate int8 activations.
+        Returns:
+            path (str): Path of the flatbuffer.
+    '''
+    if quantize not in QUANTIZATIONS:
+        raise ValueError(f'Quantisation {quantize} is not supported, choose from {QUANTIZATIONS}')
+    if batch_size <= 0:
+        raise ValueError('Batch size needs to be bigger than 0')
+    model = predictor.model
+    if quantize == 'int8' and any(isinstance(layer, keras.layers.RNN) for layer in model.submodules):
+        raise ValueError("Full int8 quantisation does not support recurrent layers, use quantize='dynamic'")
+    shapes = model.input_shape if isinstance(model.input_shape, list) else [model.input_shape]
+    specs = [tf.TensorSpec((batch_size,) + tuple(shape[1:]), tf.float32, name=f'input_{position}') for position, shape in enumerate(shapes)]
+    multiple = len(specs) > 1
+    forward = tf.function(lambda *x: model(list(x) if multiple else x[0], training=False)).get_concrete_function(*specs)
+
+    converter = tf.lite.TFLiteConverter.from_concrete_functions([forward], model)
+    if quantize:
+        converter.optimizations = [tf.lite.Optimize.DEFAULT]
+    if quantize == 'float16':
+        converter.target_spec.supported_types = [tf.float16]
+    elif quantize == 'int8':
+        inputs = _calibration_inputs(predictor, calibration)
+
+        def representative():
+            for start in range(0, len(inputs[0]) - batch_size + 1, batch_size):
+                yield {f'input_{position}': array(part[start:start + batch_size], dtype=float32) for position, part in enumerate(inputs)} # by name, the flatbuffer may order its inputs differently
+
+        converter.representative_dataset = representative
+
+    os.makedirs(location, exist_ok=True)
+    path = os.path.join(location, MODEL_FILE)
+    with open(path, 'wb') as file:
+        file.write(converter.convert())
+    scaling.save_scaler(predictor.scaler, location)
+    with open(os.path.join(location, META_FILE), 'w') as file:
+        json.dump({'batch_size': batch_size, 'input_shape': [list(shape[1:]) for shape in shapes], 'multiple_inputs': multiple, 'quantize': quantize}, file)
+    return path
+
+
+class LiteModel:
+    '''Runs an exported TFLite flatbuffer with the calls predictors make on a keras model (input_shape, predict and predict_on_batch), so a predictor serves it through its own predict methods.
+
+    Methods
+    -------
+    predict_on_batch(data):
+        Forecasts a batch of model inputs.
+    predict(data, verbose=0):
+        Same as predict_on_batch.
+    '''
+    def __init__(self, location: str, threads: int = None) -> object:
+        '''
+            Parameters:
+                location (str): Directory written by export_tflite.
+                threads (int): Number of interpreter threads, defaults to the interpreter default.
+        '''
+        with open(os.path.join(location, META_FILE)) as file:
+            meta = json.load(file)
+        self.batch_size = meta['batch_size']
+        self.multiple_inputs = meta['multiple_inputs']
+        self.quantize = meta['quantize']
+        shapes = [(None,) + tuple(shape) for shape in meta['input_shape']]
+        self.input_shape = shapes if self.multiple_inputs else shapes[0]
+
+        self.interpreter = _interpreter_class()(model_path=os.path.join(location, MODEL_FILE), num_threads=threads)
+        self.interpreter.allocate_tensors()
+        inputs = {detail['name']: detail['index'] for detail in self.interpreter.get_input_details()}
+        self._inputs = [next(index for name, index in inputs.items() if f'input_{position}' in name) for position in range(len(shapes))]
+        self._output = self.interpreter.get_output_details()[0]['index']
+
+    def _invoke(self, parts: list) -> array:
+        '''Runs the interpreter on one batch of at most batch_size windows, padded to the fixed batch size.
+        '''
+        count = len(parts[0])
+        for index, part in zip(self._inputs, parts):
+            batch = zeros((self.batch_size,) + part.shape[1:], dtype=float32)
+            batch[:count] = part
+            self.interpreter.set_tensor(index, batch)
+        self.interpreter.invoke()
+        return self.interpreter.get_tensor(self._output)[:count]
+
+    def predict_on_batch(self, data) -> array:
+        '''Forecasts a batch of model inputs of any size.
+            Parameters:
+                data (array): Model input batch, a list of batches for models with several inputs.
+            Returns:
+                (array): Model output of shape (batch, steps_future).
+        '''
+        parts = [array(part, dtype=float32) for part in (data if self.multiple_inputs else [data])]
+        return concatenate([self._invoke([part[start:start + self.batch_size] for part in parts]) for start in range(0, len(parts[0]), self.batch_size)])
+
+    def predict(self, data, verbose: int = 0) -> array:
+        return self.predict_on_batch(data)
+
+
+def load_tflite(predictor: object, location: str, threads: int = None) -> object:
+    '''Replaces the model of a predictor with an exported TFLite flatbuffer and loads the scaler saved with it. The predictor forecasts through its usual predict methods, with the same scaling and reshaping, but runs the interpreter instead of TensorFlow.
+        Parameters:
+            predictor (object): Predictor with the configuration the model was trained with.
+            location (str): Directory written by export_tflite.
+            threads (int): Number of interpreter threads.
+        Returns:
+            predictor (object): The same predictor.
+    '''
+    predictor.model = LiteModel(location, threads)
+    if hasattr(predictor, '_record_input_layout'):
+        predictor._record_input_layout()
+    predictor.scaler = scaling.load_scaler(location, predictor.scaler)
+    return predictor
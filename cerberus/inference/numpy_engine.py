@@ -0,0 +1,147 @@
+import json
+
+from numpy import array
+from numpy import float32
+from numpy import zeros
+from numpy import ones
+from numpy import full
+from numpy import inf
+from numpy import exp
+from numpy import tanh
+from numpy import maximum
+from numpy import concatenate
+from numpy import savez_compressed
+from numpy import load
+
+from cerberus.lazy import LazyImport
+
+pd = LazyImport('pandas')
+
+ACTIVATIONS = {
+    'linear': lambda x: x,
+    'relu': lambda x: maximum(x, 0),
+    'tanh': tanh,
+    'sigmoid': lambda x: 1 / (1 + exp(-x)),
+}
+LAYERS = ('Dense', 'Conv1D', 'MaxPooling1D', 'Flatten', 'Dropout', 'InputLayer')
+
+
+def _layer_spec(layer: object) -> dict:
+    '''Extracts the settings of a supported keras layer needed to replay its forward pass.
+    '''
+    kind = type(layer).__name__
+    config = layer.get_config()
+    if kind not in LAYERS:
+        raise ValueError(f'Layer {kind} is not supported by the NumPy engine, supported layers are {LAYERS}')
+    if 'activation' in config and config['activation'] not in ACTIVATIONS:
+        raise ValueError(f"Activation {config['activation']} is not supported by the NumPy engine")
+    if kind == 'Conv1D' and (config['padding'] != 'valid' or tuple(config['strides']) != (1,) or tuple(config['dilation_rate']) != (1,)):
+        raise ValueError('The NumPy engine only runs Conv1D layers with valid padding, stride 1 and no dilation')
+    if kind == 'MaxPooling1D' and tuple(config['strides']) != tuple(config['pool_size']):
+        raise ValueError('The NumPy engine only runs MaxPooling1D layers with strides equal to the pool size')
+    spec = {'kind': kind, 'activation': config.get('activation', 'linear'), 'weights': len(layer.get_weights())}
+    if kind == 'MaxPooling1D':
+        spec.update(pool_size=config['pool_size'][0], padding=config['padding'])
+    return spec
+
+
+def export_numpy(predictor: object, path: str):
+    '''Extracts the trained weights of an MLP or CNN predictor model and its input scaling into a compressed .npz file, which NumpyPredictor runs without TensorFlow.
+        Parameters:
+            predictor (object): Predictor whose model is a keras Sequential of Dense, Conv1D, MaxPooling1D and Flatten layers, such as create_mlp or create_cnn of BasicMultStepUniVar and BasicMultStepVar.
+            path (str): Path of the .npz file.
+    '''
+    model = predictor.model
+    if type(model).__name__ != 'Sequential':
+        raise ValueError('The NumPy engine only runs Sequential models, such as the MLP and CNN builders create')
+    specs = [_layer_spec(layer) for layer in model.layers]
+    weights = {f'layer{position}_{index}': array(value, dtype=float32) for position, layer in enumerate(model.layers) for index, value in enumerate(layer.get_weights())}
+
+    shape = model.input_shape[1:]
+    columns = shape[-1] if len(shape) == 2 else shape[0] // predictor.steps_past
+    # every scaler of the predictors is affine per column, transform(x) = offset + x * scale
+    offset = array(predictor.scaler.transform(zeros((1, columns))), dtype=float).reshape(-1)
+    scale = array(predictor.scaler.transform(ones((1, columns))), dtype=float).reshape(-1) - offset
+
+    header = {'layers': specs, 'input_shape': list(shape), 'steps_past': predictor.steps_past, 'model_id': getattr(predictor, 'model_id', '')}
+    savez_compressed(path, header=array(json.dumps(header)), offset=offset, scale=scale, **weights)
+
+
+class NumpyPredictor:
+    '''Runs an MLP or CNN exported by export_numpy with NumPy alone. Windows are scaled and reshaped like predict of the predictor the model was trained with, and thousands of windows are forecast with one vectorised call.
+
+    Methods
+    -------
+    predict(data):
+        Forecasts a single input sequence.
+    predict_batch(data, batch_size=None):
+        Forecasts many input sequences.
+    '''
+    def __init__(self, path: str) -> object:
+        '''
+            Parameters:
+                path (str): Path of an .npz file written by export_numpy.
+        '''
+        with load(path) as archive:
+            header = json.loads(str(archive['header']))
+            self.offset = archive['offset']
+            self.scale = archive['scale']
+            self.layers = [(spec, [archive[f'layer{position}_{index}'] for index in range(spec['weights'])]) for position, spec in enumerate(header['layers'])]
+        self.input_shape = tuple(header['input_shape'])
+        self.steps_past = header['steps_past']
+        self.model_id = header['model_id']
+
+    def _prepare_batch(self, data: array) -> array:
+        '''Scales a batch of sequences and brings it into the model input layout.
+        '''
+        data = array(data, dtype=float).reshape(len(data), self.steps_past, -1)
+        data = (self.offset + data * self.scale).astype(float32)
+        return data.reshape((len(data),) + self.input_shape)
+
+    def _forward(self, x: array) -> array:
+        '''Replays the layers of the exported model.
+        '''
+        for spec, weights in self.layers:
+            kind = spec['kind']
+            if kind == 'Dense':
+                x = x @ weights[0] + (weights[1] if len(weights) > 1 else 0)
+            elif kind == 'Conv1D':
+                kernel = weights[0] # (kernel_size, channels, filters)
+                steps = x.shape[1] - len(kernel) + 1
+                # one matrix product per kernel tap, a kernel of size 1 is a single dense product over all steps
+                x = sum(x[:, tap:tap + steps] @ kernel[tap] for tap in range(len(kernel))) + (weights[1] if len(weights) > 1 else 0)
+            elif kind == 'MaxPooling1D':
+                pool = spec['pool_size']
+                steps = x.shape[1] // pool * pool
+                if spec['padding'] == 'same' and steps < x.shape[1]:
+                    steps += pool
+                    x = concatenate((x, full((len(x), steps - x.shape[1], x.shape[2]), -inf, dtype=x.dtype)), axis=1)
+                x = x[:, :steps].reshape(len(x), steps // pool, pool, x.shape[2]).max(axis=2)
+            elif kind == 'Flatten':
+                x = x.reshape(len(x), -1)
+            x = ACTIVATIONS[spec['activation']](x)
+        return x
+
+    def predict(self, data: array) -> 'pd.DataFrame':
+        '''Takes in a sequence of values and outputs a forecast.
+            Parameters:
+                data (array): Input sequence which needs to be forecasted.
+            Returns:
+                (DataFrame): Forecast for sequence provided, the same as predict of the predictor.
+        '''
+        y_pred = self._forward(self._prepare_batch(array(data)[None]))
+        return pd.DataFrame(y_pred.reshape(-1, 1), columns=[f'{self.model_id}'])
+
+    def predict_batch(self, data: array, batch_size: int = None) -> array:
+        '''Takes in many sequences of values and forecasts all of them with vectorised NumPy calls.
+            Parameters:
+                data (array): Input sequences of shape (n_windows, steps_past) or (n_windows, steps_past, features).
+                batch_size (int): Maximum number of sequences per call, bounds the memory of intermediate activations. Defaults to all at once.
+            Returns:
+                (array): Forecasts of shape (n_windows, steps_future).
+        '''
+        data = array(data)
+        if len(data) == 0:
+            raise ValueError('No input sequences to forecast')
+        batch_size = batch_size or len(data)
+        return concatenate([self._forward(self._prepare_batch(data[start:start + batch_size])) for start in range(0, len(data), batch_size)])
@@ -0,0 +1,55 @@
+from numpy import array
+from numpy import empty
+from numpy import arange
+from numpy import concatenate
+
+
+class RingBuffer:
+    '''Preallocated input windows of many series. New values overwrite the oldest ones in place, so advancing a window never shifts or reallocates memory. Every value is stored twice, at its column and one window length further, so the current windows are always a contiguous slice of the buffer.
+    '''
+    def __init__(self, windows: array):
+        '''
+            Parameters:
+                windows (array): Initial windows of shape (series, size), oldest value first.
+        '''
+        windows = array(windows, dtype=float)
+        self.size = windows.shape[1]
+        self.buffer = concatenate((windows, windows), axis=1) # own copy, the caller's windows stay untouched
+        self.head = 0 # column of the oldest value
+
+    def push(self, values: array):
+        '''Appends values of shape (series, k) to every window, dropping the k oldest values.
+        '''
+        values = values[:, -self.size:] # older values than the window holds would be overwritten right away
+        columns = (self.head + arange(values.shape[1])) % self.size
+        self.buffer[:, columns] = values
+        self.buffer[:, columns + self.size] = values
+        self.head = (self.head + values.shape[1]) % self.size
+
+    def window(self) -> array:
+        '''Returns the current windows of shape (series, size), oldest value first. The windows are a view on the buffer, the next push changes them.
+        '''
+        return self.buffer[:, self.head:self.head + self.size]
+
+
+def recursive_forecast(step, windows: array, horizon: int) -> array:
+    '''Forecasts beyond the trained horizon by feeding forecasts back into the input windows. All series advance together, so every iteration is one batched model call that adds steps_future values to every forecast.
+        Parameters:
+            step (callable): Forecasts a batch of windows of shape (series, steps_past), returns (series, steps_future).
+            windows (array): Initial windows of shape (series, steps_past) in model units.
+            horizon (int): Number of steps to forecast.
+        Returns:
+            forecasts (array): Forecasts of shape (series, horizon) in model units.
+    '''
+    if horizon <= 0:
+        raise ValueError('Horizon needs to be bigger than 0')
+    ring = RingBuffer(windows)
+    forecasts = empty((ring.buffer.shape[0], horizon))
+    done = 0
+    while done < horizon:
+        predicted = array(step(ring.window()))
+        predicted = predicted.reshape(len(predicted), -1)[:, :horizon - done]
+        forecasts[:, done:done + predicted.shape[1]] = predicted
+        ring.push(predicted)
+        done += predicted.shape[1]
+    return forecasts
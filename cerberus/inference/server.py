@@ -0,0 +1,151 @@
+import asyncio
+from time import monotonic
+from concurrent.futures import ThreadPoolExecutor
+
+from numpy import array
+from numpy import stack
+
+
+class MicroBatchServer:
+    '''Asyncio front-end of a trained predictor. Concurrent requests are collected into micro-batches and every batch is forecast with a single model call in a worker thread, so the event loop never blocks on the model and the model runs once per batch instead of once per request. Windows are checked before they join a batch, so a malformed request only fails its own caller.
+
+    Methods
+    -------
+    load(predictor, location, **options):
+        Loads a saved model into a predictor through its load_model and wraps it in a server.
+    start():
+        Starts the batching task.
+    stop():
+        Forecasts the requests still waiting and stops the batching task.
+    predict(window):
+        Forecasts a single input window once its micro-batch ran.
+    '''
+    def __init__(self, predictor: object, max_batch_size: int = 64, max_wait: float = 0.002, low_latency: bool = True) -> object:
+        '''
+            Parameters:
+                predictor (object): Trained predictor with a predict_batch method.
+                max_batch_size (int): Maximum number of windows per model call.
+                max_wait (float): Seconds a batch waits for further requests after its first one arrived.
+                low_latency (bool): Run the compiled forward pass instead of keras predict_on_batch.
+        '''
+        if max_batch_size <= 0:
+            raise ValueError('Max batch size needs to be bigger than 0')
+        if max_wait < 0:
+            raise ValueError('Max wait cannot be negative')
+        self.predictor = predictor
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait
+        self.low_latency = low_latency
+        self.batches = 0 # model calls so far
+        self._queue = None
+        self._task = None
+        self._executor = None
+
+    @classmethod
+    def load(cls, predictor: object, location: str, **options) -> 'MicroBatchServer':
+        '''Loads a saved model and its scaler into a predictor and wraps it in a server.
+            Parameters:
+                predictor (object): Predictor with the configuration the model was trained with.
+                location (str): Path of the saved model.
+                options: Further arguments of the server, such as max_batch_size or max_wait.
+            Returns:
+                server (MicroBatchServer): Server of the loaded model, not started yet.
+        '''
+        predictor.load_model(location)
+        return cls(predictor, **options)
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    async def start(self):
+        '''Starts the batching task on the running event loop.
+        '''
+        if self.running:
+            return
+        self._queue = asyncio.Queue()
+        self._executor = ThreadPoolExecutor(1, thread_name_prefix='cerberus-inference') # one model call at a time
+        self._task = asyncio.create_task(self._serve())
+
+    async def stop(self):
+        '''Forecasts the requests still waiting and stops the batching task.
+        '''
+        if not self.running:
+            return
+        await self._queue.put(None)
+        await self._task
+        self._executor.shutdown()
+        self._task = None
+        while not self._queue.empty(): # requests sent while stopping
+            request = self._queue.get_nowait()
+            if request is not None:
+                request[1].cancel()
+
+    async def __aenter__(self) -> 'MicroBatchServer':
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.stop()
+
+    async def predict(self, window: array) -> array:
+        '''Forecasts a single input window. The request joins the current micro-batch and resolves once its batch ran.
+            Parameters:
+                window (array): Input window of shape (steps_past,) or (steps_past, features) in original units.
+            Returns:
+                (array): Forecast of shape (steps_future,), in the same units as predict_batch.
+        '''
+        if not self.running:
+            raise RuntimeError('Server is not running, call start() first')
+        window = array(window, dtype=float)
+        steps_past, features = self.predictor.steps_past, getattr(self.predictor, 'features', None) # the first feature of multivariate predictors is the target
+        if (window.shape != (steps_past, len(features) - 1)) if features else (window.size != steps_past):
+            raise ValueError(f'Input window has shape {window.shape}, expected {steps_past} steps' + (f' of {len(features) - 1} features' if features else '')) # fails this caller only, the window never joins a batch
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((window, future))
+        return await future
+
+    async def _collect(self, first: tuple) -> (list, bool):
+        '''Collects requests following the first one until the batch is full or max_wait passed. Returns the batch and whether the server was asked to stop.
+        '''
+        batch = [first]
+        deadline = monotonic() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            try:
+                request = self._queue.get_nowait() # requests already waiting join without a timer
+            except asyncio.QueueEmpty:
+                remaining = deadline - monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    request = await asyncio.wait_for(self._queue.get(), remaining)
+                except asyncio.TimeoutError:
+                    break
+            if request is None:
+                return batch, True
+            batch.append(request)
+        return batch, False
+
+    async def _serve(self):
+        loop = asyncio.get_running_loop()
+        stopping = False
+        while not stopping:
+            first = await self._queue.get()
+            if first is None:
+                break
+            batch, stopping = await self._collect(first)
+            windows, futures = zip(*batch)
+            call = loop.run_in_executor(self._executor, self._forecast, windows)
+            await asyncio.wait([call]) # never raises here, the error belongs to the requests of this batch
+            error = call.exception()
+            for position, future in enumerate(futures):
+                if future.done(): # the caller may have been cancelled meanwhile
+                    continue
+                if error is None:
+                    future.set_result(call.result()[position])
+                else:
+                    future.set_exception(error)
+
+    def _forecast(self, windows: tuple) -> array:
+        self.batches += 1
+        return self.predictor.predict_batch(stack(windows), batch_size=self.max_batch_size, low_latency=self.low_latency)
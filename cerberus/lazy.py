@@ -0,0 +1,62 @@
+import sys
+from importlib import import_module
+
+
+class LazyImport:
+    '''Stands in for a module, or an attribute path inside a module, and only imports it on first attribute access.
+
+        Example:
+            keras = LazyImport('tensorflow', 'keras')
+            keras.Sequential() # tensorflow is imported here
+    '''
+    def __init__(self, module: str, path: str = ''):
+        '''
+            Parameters:
+                module (str): Name of the module to import.
+                path (str): Dotted attribute path inside the module.
+        '''
+        self._module = module
+        self._path = path
+        self._target = None
+
+    def _resolve(self) -> object:
+        '''Imports the module and follows the attribute path.
+        '''
+        if self._target is None:
+            target = import_module(self._module)
+            for name in filter(None, self._path.split('.')):
+                target = getattr(target, name)
+            self._target = target
+        return self._target
+
+    def __getattr__(self, name: str) -> object:
+        return getattr(self._resolve(), name)
+
+    def __repr__(self) -> str:
+        return f"<lazy import '{'.'.join(filter(None, (self._module, self._path)))}'>"
+
+
+def lazy_exports(package: str, exports: dict, submodules: tuple = ()):
+    '''Creates module level __getattr__ and __dir__ functions (PEP 562) that import exported names on first access.
+        Parameters:
+            package (str): Name of the package the functions are created for.
+            exports (dict): Maps exported names to the module defining them.
+            submodules (tuple): Submodules of the package that are imported on first access.
+        Returns:
+            __getattr__ (callable): Module level attribute hook.
+            __dir__ (callable): Module level dir hook.
+    '''
+    def __getattr__(name: str) -> object:
+        if name in exports:
+            value = getattr(import_module(exports[name]), name)
+        elif name in submodules:
+            value = import_module(f'{package}.{name}')
+        else:
+            raise AttributeError(f"module '{package}' has no attribute '{name}'")
+        setattr(sys.modules[package], name, value) # later lookups skip the hook
+        return value
+
+    def __dir__() -> list:
+        return sorted(set(vars(sys.modules[package])) | set(exports) | set(submodules))
+
+    return __getattr__, __dir__
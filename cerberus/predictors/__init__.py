@@ -1,4 +1,13 @@
-from cerberus.predictors.multivarstandard import BasicMultStepVar
-from cerberus.predictors.multivarhybrid import HybridMultStepVar
-from cerberus.predictors.univarstandard import BasicMultStepUniVar
-from cerberus.predictors.univarhybrid import HybridMultStepUniVar
+from cerberus.lazy import lazy_exports
+
+__getattr__, __dir__ = lazy_exports(
+    'cerberus.predictors',
+    {
+        'BasicMultStepVar': 'cerberus.predictors.multivarstandard',
+        'HybridMultStepVar': 'cerberus.predictors.multivarhybrid',
+        'BasicMultStepUniVar': 'cerberus.predictors.univarstandard',
+        'HybridMultStepUniVar': 'cerberus.predictors.univarhybrid',
+        'GlobalMultStepUniVar': 'cerberus.predictors.univarglobal',
+    })
+
+__all__ = ['BasicMultStepVar', 'HybridMultStepVar', 'BasicMultStepUniVar', 'HybridMultStepUniVar', 'GlobalMultStepUniVar'] # star imports only resolve lazy names listed here
@@ -56,23 +56,39 @@ class MultiVariateMultiStep(ABC):
         pass
 
     @abstractmethod
-    def fit_model(self, epochs: int, show_progress: int = 1, validation_split: float = 0.20, batch_size: int = 10):
+    def fit_model(self, epochs: int, show_progress: int = 1, validation_split: float = 0.20, batch_size: int = 10, shuffle_buffer: int = None, jit_compile: bool = None, large_batch: bool = False, warmup_epochs: int = 5, early_stopping: int = 0, checkpoint_dir: str = '', checkpoint_every: int = 1, resume: bool = False):
         pass
 
     @abstractmethod
     def model_blueprint(self):
         pass
 
+    @abstractmethod
+    def model_report(self) -> DataFrame:
+        pass
+
     @abstractmethod
     def show_performance(self):
         pass
 
     @abstractmethod
-    def predict(self, data: array) -> DataFrame:
+    def predict(self, data: array, low_latency: bool = False) -> DataFrame:
+        pass
+
+    @abstractmethod
+    def predict_batch(self, data: array, batch_size: int = 1024, low_latency: bool = False) -> array:
+        pass
+
+    @abstractmethod
+    def update(self, data: DataFrame, epochs: int = 1, replay: int = 0, batch_size: int = 10, show_progress: int = 0, seed: int = None):
+        pass
+
+    @abstractmethod
+    def save_store(self, location: str):
         pass
 
     @abstractmethod
-    def save_model(self):
+    def save_model(self, location: str = ''):
         pass
 
     @abstractmethod
@@ -0,0 +1,352 @@
+from __future__ import annotations
+
+from cerberus.preprocessing.windowing import panel_windows
+from cerberus.inference.batching import batch_forecast
+from cerberus.inference.compiled import compiled_forward
+from cerberus.inference.rollout import recursive_forecast
+from cerberus.training.acceleration import accelerated
+from cerberus.training.architecture import ArchitectureSpec, resolve_spec, recurrent_stack, model_report
+from cerberus.lazy import LazyImport
+
+from numpy import array
+from numpy import ceil
+from numpy import stack
+from numpy import column_stack
+from numpy import bincount
+from numpy import arange
+from numpy import repeat
+from numpy import cumsum
+
+import pandas as pd
+from pandas import DataFrame
+import os
+
+# heavy dependencies are imported on first use: tensorflow once a model is built, fitted or loaded,
+# matplotlib once results are plotted
+tf = LazyImport('tensorflow')
+keras = LazyImport('tensorflow', 'keras')
+layers = LazyImport('tensorflow', 'keras.layers')
+plt = LazyImport('matplotlib.pyplot')
+scaling = LazyImport('cerberus.preprocessing.scaling')
+lr_scaling = LazyImport('cerberus.training.large_batch')
+checkpoints = LazyImport('cerberus.training.checkpoints')
+
+
+class GlobalMultStepUniVar:
+    '''Implements a global univariate multistep predictor: one network is trained on the windows of many series and forecasts all of them. It keeps only the windows, not the series, so unlike the single series predictors it has no update(): fine-tune with fit_model on a predictor built from the recent panel.
+
+        Methods
+        -------
+        _series(self, data) -> dict:
+            Private method to bring long format frames and dicts of series into one format.
+        _model_inputs(self, X: array, codes: array) -> list:
+            Private method to assemble the model inputs.
+        set_model_id(self, name: str)
+            Setter method to change model id name.
+        create_mlp(self):
+            Builds MLP structure.
+        create_lstm(self):
+            Builds LSTM structure.
+        create_gru(self):
+            Builds GRU structure.
+        create_cnn(self):
+            Builds CNN structure.
+        fit_model(self, epochs: int, show_progress: int = 1):
+            Trains the shared model on the windows of all series.
+        model_blueprint(self):
+            Print blueprint of layer structure.
+        model_report(self):
+            Parameters and FLOPs per forward pass of every layer.
+        show_performance(self):
+            Evaluate and plot model performance.
+        predict(self, data):
+            Forecasts every series from its latest observations in one batched call.
+        predict_recursive(self, data, horizon: int):
+            Forecasts every series beyond steps_future by feeding forecasts back into the input windows.
+        save_model(self, location: str = ''):
+            Saves current Keras model and fitted per series scaler to current directory.
+        load_model(self, location: str):
+            Load model from location specified.
+    '''
+    def __init__(self, steps_past: int, steps_future: int, data = pd.DataFrame(), id_column: str = 'series', value_column: str = 'value', time_column: str = None, scale: str = '', embedding_dim: int = 0) -> object:
+        '''
+            Parameters:
+                steps_past (int): Steps predictor will look backward.
+                steps_future (int): Steps predictor will look forward.
+                data (DataFrame): Long format frame with one row per series and time step, or a dict mapping series ids to sequences.
+                id_column (str): Column of the long format frame holding the series id.
+                value_column (str): Column of the long format frame holding the observations.
+                time_column (str): Column to order the observations of each series by. Rows are taken in frame order if not given.
+                scale (str): Scaling method, applied to every series independently.
+                embedding_dim (int): Size of a learned series id embedding fed to the network next to the window. 0 trains without series ids.
+        '''
+        self.steps_past = steps_past
+        self.steps_future = steps_future
+        self.id_column = id_column
+        self.value_column = value_column
+        self.time_column = time_column
+        self.embedding_dim = embedding_dim
+        self.scaler = scaling.SeriesScaler(scale)
+        self.loss = ''
+        self.metrics = ''
+        self.model_id = '' # to identify model (example: name)
+
+        if len(data) > 0:
+            series = self._series(data)
+            self.scaler.fit(series)
+            scaled = [self.scaler.transform(values, [code]) for code, values in enumerate(series.values())]
+            X, self.input_y, self.input_codes = panel_windows(scaled, steps_past, steps_future)
+            self.input_x = X.reshape((X.shape[0], X.shape[1], 1))
+
+    def _series(self, data) -> dict:
+        '''Brings the input into a dict mapping series ids to 1D arrays.
+            Parameters:
+                data (DataFrame): Long format frame or dict of sequences.
+            Returns:
+                series (dict): Observations of every series in time order.
+        '''
+        if isinstance(data, dict):
+            return {key: array(values, dtype=float).reshape(-1) for key, values in data.items()}
+        if self.time_column is not None:
+            data = data.sort_values(self.time_column, kind='stable')
+        return {key: array(group, dtype=float) for key, group in data.groupby(self.id_column, sort=False)[self.value_column]}
+
+    def _model_inputs(self, X: array, codes: array) -> list:
+        '''Assembles the model inputs from windows and series codes.
+        '''
+        return [X, codes.reshape(-1, 1)] if self.embedding_dim else X
+
+    def _prepare_batch(self, data: array) -> list:
+        '''Splits a batch of packed rows (scaled window followed by the series code) into model inputs.
+        '''
+        X = data[:, :self.steps_past].reshape((len(data), self.steps_past, 1))
+        return self._model_inputs(X, data[:, self.steps_past])
+
+    def _head(self, inputs: keras.Input, encoded: tf.Tensor, optimizer: str, loss: str, metrics: str, spec: ArchitectureSpec):
+        '''Adds the series embedding and the output layers shared by all architectures and compiles the model.
+        '''
+        self.loss = loss
+        self.metrics = metrics
+        inputs = [inputs]
+        if self.embedding_dim:
+            codes = keras.Input(shape=(1,), name='series')
+            embedded = layers.Flatten()(layers.Embedding(len(self.scaler.ids), self.embedding_dim)(codes))
+            encoded = layers.Concatenate()([encoded, embedded])
+            inputs.append(codes)
+        encoded = layers.Dense(spec.scaled(25), activation='relu')(encoded)
+        output = layers.Dense(self.steps_future)(encoded)
+
+        self.model = keras.Model(inputs if self.embedding_dim else inputs[0], output)
+        self.model.compile(optimizer=optimizer, loss=loss, metrics=metrics)
+
+    def set_model_id(self, name: str):
+        '''Setter method to change model id field.
+        '''
+        self.model_id = name
+
+    @property
+    def get_X_input(self) -> array:
+        '''Get transformed feature data.
+        '''
+        return self.input_x
+
+    @property
+    def get_X_input_shape(self) -> tuple:
+        '''Get shape fo transformed feature data.
+        '''
+        return self.input_x.shape
+
+    @property
+    def get_y_input(self) -> array:
+        '''Get transformed target data.
+        '''
+        return self.input_y
+
+    @property
+    def get_y_input_shape(self) -> tuple:
+        '''Get shape fo transformed target data.
+        '''
+        return self.input_y.shape
+
+    @accelerated
+    def create_mlp(self, optimizer: str = 'adam', loss: str = 'mean_squared_error', metrics: str = 'mean_squared_error', spec: str | dict | ArchitectureSpec = 'default'):
+        '''Creates MLP model by defining all layers with activation functions, optimizer, loss function and evaluation metrics.
+            Parameters:
+                spec (str | dict | ArchitectureSpec): Layer widths and depth, a preset name ('default', 'compact'), keyword arguments of ArchitectureSpec or a spec.
+        '''
+        self.set_model_id('MLP')
+        spec = resolve_spec(spec)
+
+        inputs = keras.Input(shape=(self.steps_past, 1), name='window')
+        encoded = layers.Flatten()(inputs)
+        for units in spec.sizes((50, 25)):
+            encoded = layers.Dense(units, activation='relu')(encoded)
+        self._head(inputs, encoded, optimizer, loss, metrics, spec)
+
+    @accelerated
+    def create_lstm(self, optimizer: str = 'adam', loss: str = 'mean_squared_error', metrics: str = 'mean_squared_error', spec: str | dict | ArchitectureSpec = 'default'):
+        '''Creates LSTM model by defining all layers with activation functions, optimizer, loss function and evaluation metrics.
+            Parameters:
+                spec (str | dict | ArchitectureSpec): Layer widths and depth, a preset name ('default', 'compact'), keyword arguments of ArchitectureSpec or a spec.
+        '''
+        self.set_model_id('LSTM')
+        spec = resolve_spec(spec)
+
+        inputs = keras.Input(shape=(self.steps_past, 1), name='window')
+        encoded = inputs
+        for layer in recurrent_stack(layers.LSTM, spec.sizes((40, 50))):
+            encoded = layer(encoded)
+        self._head(inputs, encoded, optimizer, loss, metrics, spec)
+
+    @accelerated
+    def create_gru(self, optimizer: str = 'adam', loss: str = 'mean_squared_error', metrics: str = 'mean_squared_error', spec: str | dict | ArchitectureSpec = 'default'):
+        '''Creates GRU model by defining all layers with activation functions, optimizer, loss function and evaluation metrics.
+            Parameters:
+                spec (str | dict | ArchitectureSpec): Layer widths and depth, a preset name ('default', 'compact'), keyword arguments of ArchitectureSpec or a spec.
+        '''
+        self.set_model_id('GRU')
+        spec = resolve_spec(spec)
+
+        inputs = keras.Input(shape=(self.steps_past, 1), name='window')
+        encoded = inputs
+        for layer in recurrent_stack(layers.GRU, spec.sizes((40, 50))):
+            encoded = layer(encoded)
+        self._head(inputs, encoded, optimizer, loss, metrics, spec)
+
+    @accelerated
+    def create_cnn(self, optimizer: str = 'adam', loss: str = 'mean_squared_error', metrics: str = 'mean_squared_error', spec: str | dict | ArchitectureSpec = 'default'):
+        '''Creates CNN model by defining all layers with activation functions, optimizer, loss function and evaluation metrics.
+            Parameters:
+                spec (str | dict | ArchitectureSpec): Layer widths and depth, a preset name ('default', 'compact'), keyword arguments of ArchitectureSpec or a spec.
+        '''
+        self.set_model_id('CNN')
+        spec = resolve_spec(spec)
+
+        inputs = keras.Input(shape=(self.steps_past, 1), name='window')
+        encoded = inputs
+        for filters in spec.sizes((64,)):
+            encoded = layers.Conv1D(filters=filters, kernel_size=2, activation='relu')(encoded)
+        encoded = layers.MaxPooling1D(pool_size=2, padding='same')(encoded)
+        encoded = layers.Flatten()(encoded)
+        encoded = layers.Dense(spec.scaled(50), activation='relu')(encoded)
+        self._head(inputs, encoded, optimizer, loss, metrics, spec)
+
+    def _validation_mask(self, validation_split: float) -> array:
+        '''Marks the last fraction of the windows of every series as validation samples, so that validation always lies in the future of training.
+        '''
+        counts = bincount(self.input_codes, minlength=len(self.scaler.ids))
+        position = arange(len(self.input_codes)) - repeat(cumsum(counts) - counts, counts)
+        return position >= ceil(counts * (1. - validation_split))[self.input_codes]
+
+    def fit_model(self, epochs: int, show_progress: int = 1, validation_split: float = 0.20, batch_size: int = 10, jit_compile: bool = None, large_batch: bool = False, warmup_epochs: int = 5, early_stopping: int = 0, checkpoint_dir: str = '', checkpoint_every: int = 1, resume: bool = False):
+        '''Trains the shared model on the windows of all series. Validation holds out the most recent windows of every series.
+            Parameters:
+                epochs (int): Number of epochs to train the model.
+                show_progress (int): Prints training progress.
+                validation_split (float): Fraction of the windows of every series held out for validation.
+                batch_size (int): Number of samples per gradient update.
+                jit_compile (bool): Switch XLA compilation on or off for this and later runs. None keeps the setting chosen in create_*.
+                large_batch (bool): Scale the learning rate to batch_size (square root rule) and warm it up, for batch sizes in the thousands.
+                warmup_epochs (int): Large batch mode only. Epochs to ramp the learning rate up over.
+                early_stopping (int): Stops after that many epochs without improvement of the validation loss and restores the best weights. 0 trains all epochs.
+                checkpoint_dir (str): Saves weights and optimizer state to this directory every checkpoint_every epochs.
+                checkpoint_every (int): Epochs between two checkpoints.
+                resume (bool): Continues an interrupted run from the latest checkpoint in checkpoint_dir, epochs counts the epochs of the whole run.
+        '''
+        if jit_compile is not None:
+            self.model.jit_compile = jit_compile
+        callbacks = lr_scaling.large_batch_callbacks(self.model, batch_size, large_batch, warmup_epochs)
+        stopping, initial_epoch = checkpoints.checkpoint_callbacks(self.model, early_stopping, checkpoint_dir, checkpoint_every, resume, 'val_loss' if validation_split else 'loss')
+        callbacks += stopping
+
+        validation = self._validation_mask(validation_split)
+        train = ~validation
+        validation_data = (self._model_inputs(self.input_x[validation], self.input_codes[validation]), self.input_y[validation]) if validation.any() else None
+        self.details = self.model.fit(self._model_inputs(self.input_x[train], self.input_codes[train]), self.input_y[train], validation_data=validation_data, batch_size=batch_size, epochs=epochs, verbose=show_progress, callbacks=callbacks, initial_epoch=initial_epoch)
+        return self.details
+
+    def model_blueprint(self):
+        '''Prints a summary of the models layer structure.
+        '''
+        self.model.summary()
+
+    def model_report(self) -> DataFrame:
+        '''Counts the parameters and floating point operations per forward pass of a single window, layer by layer.
+            Returns:
+                report (DataFrame): One row per layer with its parameters and flops, the column sums are the totals of the model.
+        '''
+        return model_report(self.model)
+
+    def show_performance(self):
+        '''Plots:
+        1. Models mean squared error of trainings and validation data. (Model loss)
+        '''
+        information = self.details
+
+        plt.plot(information.history['loss'])
+        plt.plot(information.history['val_loss'])
+        plt.title(self.model_id + ' Model Loss')
+        plt.ylabel(self.loss)
+        plt.xlabel('Epoch')
+        plt.legend(['Train', 'Test'], loc='upper right')
+        plt.tight_layout()
+        plt.show()
+
+    def predict(self, data, batch_size: int = 1024, low_latency: bool = False) -> DataFrame:
+        '''Forecasts every series from its latest steps_past observations with one model call per batch.
+            Parameters:
+                data (DataFrame): Long format frame or dict of sequences. Every series needs to be known from training and hold at least steps_past observations.
+                batch_size (int): Maximum number of series per model call.
+                low_latency (bool): Run a cached tf.function forward pass instead of keras.Model.predict_on_batch.
+            Returns:
+                (DataFrame): Forecasts in original units, one row per series and one column per step.
+        '''
+        return self.predict_recursive(data, self.steps_future, batch_size, low_latency)
+
+    def _latest_windows(self, data) -> (list, array, array):
+        '''Cuts the latest steps_past observations of every series and scales them.
+            Returns:
+                ids (list): Series ids.
+                codes (array): Series codes of the scaler.
+                windows (array): Scaled windows of shape (series, steps_past).
+        '''
+        series = self._series(data)
+        short = [key for key, values in series.items() if len(values) < self.steps_past]
+        if short:
+            raise ValueError(f'Series {short[:5]} hold fewer than {self.steps_past} observations')
+        codes = self.scaler.codes(list(series))
+        return list(series), codes, self.scaler.transform(stack([values[-self.steps_past:] for values in series.values()]), codes)
+
+    def predict_recursive(self, data, horizon: int, batch_size: int = 1024, low_latency: bool = False) -> DataFrame:
+        '''Forecasts every series beyond steps_future by feeding the forecasts back into the input windows. Every iteration forecasts all series with one batched model call and adds steps_future values.
+            Parameters:
+                data (DataFrame): Long format frame or dict of sequences. Every series needs to be known from training and hold at least steps_past observations.
+                horizon (int): Number of steps to forecast.
+                batch_size (int): Maximum number of series per model call.
+                low_latency (bool): Run a cached tf.function forward pass instead of keras.Model.predict_on_batch.
+            Returns:
+                (DataFrame): Forecasts in original units, one row per series and one column per step.
+        '''
+        ids, codes, windows = self._latest_windows(data)
+        forward = compiled_forward(self.model) if low_latency else self.model.predict_on_batch
+        step = lambda batch: batch_forecast(forward, self._prepare_batch, column_stack((batch, codes)), batch_size)
+        y_pred = self.scaler.inverse_transform(recursive_forecast(step, windows, horizon), codes)
+
+        return pd.DataFrame(y_pred, index=pd.Index(ids, name=self.id_column), columns=range(1, horizon + 1))
+
+    def save_model(self, location: str = ''):
+        '''Save the current model and its fitted per series scaler to the current directory.
+            Parameters:
+                location (str): Directory to save to. Defaults to the current directory.
+        '''
+        location = os.path.abspath(location or os.getcwd())
+        self.model.save(location)
+        scaling.save_scaler(self.scaler, location)
+
+    def load_model(self, location: str):
+        '''Load a keras model and its fitted per series scaler from the path specified.
+            Parameters:
+                location (str): Path of keras model location
+        '''
+        self.model = keras.models.load_model(location)
+        self.scaler = scaling.load_scaler(location, self.scaler)
@@ -1,21 +1,41 @@
+from __future__ import annotations
+
 from cerberus.predictors.blueprints_predictors.abstract_univariate import UniVariateMultiStep
+from cerberus.preprocessing.windowing import sequence_windows, window_count, append_series, StaleWindows
+from cerberus.preprocessing.pipeline import train_validation_datasets
+from cerberus.inference.batching import batch_forecast
+from cerberus.inference.compiled import compiled_forward
+from cerberus.inference.rollout import recursive_forecast
+from cerberus.training.acceleration import accelerated
+from cerberus.training.architecture import ArchitectureSpec, resolve_spec, recurrent_stack, model_report
+from cerberus.lazy import LazyImport
 
-import matplotlib.pyplot as plt
 from numpy import array
 from numpy import reshape
+from numpy import concatenate
+from numpy.random import default_rng
+
 import pandas as pd
 from pandas import DataFrame
 import os
+from functools import partial
+from typing import TYPE_CHECKING
 
-from sklearn.preprocessing import StandardScaler, MinMaxScaler, MaxAbsScaler, FunctionTransformer
+# heavy dependencies are imported on first use: tensorflow once a model is built, fitted or loaded,
+# matplotlib once results are plotted and scikit-learn once data is scaled
+tf = LazyImport('tensorflow')
+keras = LazyImport('tensorflow', 'keras')
+layers = LazyImport('tensorflow', 'keras.layers')
+plt = LazyImport('matplotlib.pyplot')
+scaling = LazyImport('cerberus.preprocessing.scaling')
+lr_scaling = LazyImport('cerberus.training.large_batch')
+checkpoints = LazyImport('cerberus.training.checkpoints')
+attention = LazyImport('cerberus.training.attention')
+window_store = LazyImport('cerberus.preprocessing.store')
 
-import pandas as pd
-from pandas import DataFrame
-import os
+if TYPE_CHECKING:
+    from cerberus.preprocessing.cache import PreparedCache
 
-import tensorflow as tf
-from tensorflow import keras
-from tensorflow.keras.layers import LSTM, Dense, Flatten, Conv1D, MaxPooling1D, Dropout, Bidirectional, TimeDistributed, GRU, SimpleRNN
 
 class HybridMultStepUniVar(UniVariateMultiStep):
     '''Implements neural network based univariate multipstep hybrid predictors.
@@ -30,40 +50,63 @@ class HybridMultStepUniVar(UniVariateMultiStep):
             Setter method to change model id name.
         create_cnnlstm(self):
             Builds CNN-LSTM structure.
+        create_cnntransformer(self):
+            Builds CNN-Transformer structure.
         fit_model(self, epochs: int, show_progress: int = 1):
             Training the in the prior defined model. Count of epochs need to be defined.
         model_blueprint(self):
             Print blueprint of layer structure.
+        model_report(self):
+            Parameters and FLOPs per forward pass of every layer.
         show_performance(self):
             Evaluate and plot model performance.
         predict(self, data: array, scale: str = 'standard'):
             Takes in input data and outputs model forecasts.
-        save_model(self):
-            Saves current ceras model to current directory.
+        predict_batch(self, data: array, batch_size: int = 1024):
+            Forecasts many input sequences with one model call per batch.
+        predict_recursive(self, data: array, horizon: int):
+            Forecasts beyond steps_future by feeding forecasts back into the input windows.
+        update(self, data, epochs: int = 1, replay: int = 0):
+            Appends new observations and fine-tunes the model on the windows they complete.
+        save_store(self, location: str):
+            Writes the scaled series and fitted scaler to a memory mappable window store.
+        save_model(self, location: str = ''):
+            Saves current Keras model and fitted scaler to current directory.
         load_model(self, location: str):
             Load model from location specified.
     '''
-    def __init__(self, sub_seq: int, steps_past: int, steps_future: int, data = pd.DataFrame(), scale: str = '') -> object:
+    input_x = StaleWindows() # windows of the stored series, update defers rebuilding them
+    input_y = StaleWindows()
+
+    def __init__(self, sub_seq: int, steps_past: int, steps_future: int, data = pd.DataFrame(), scale: str = '', streaming: bool = False, store: str = '', cache: PreparedCache = None) -> object:
         '''
             Parameters:
                 sub_seq (int): Further division of given steps a predictor will look backward.
                 steps_past (int): Steps predictor will look backward.
                 steps_future (int): Steps predictor will look forward.
                 data (array): Input data for model training. Default is empty to enable loading pre-trained models.
+                scale (str): Scaling method.
+                streaming (bool): Keep only the scaled series in memory and cut the training windows on the fly in fit_model.
+                store (str): Directory of a window store written by save_store. The scaled series and scaler are memory mapped from it instead of preparing data.
+                cache (PreparedCache): Opt-in cache of prepared inputs. Repeated configurations memory map their X/y tensors from it instead of preparing them again.
         '''
         self.sub_seq = sub_seq
+        self.modified_back = steps_past // sub_seq
         self.steps_past = steps_past
         self.steps_future = steps_future
+        self.streaming = streaming
         self.loss = ''
         self.metrics = ''
 
         self.scaler = self._scaling(scale)
 
 
-        if len(data) > 0:
-            self.data = array(data)
-            self.data = self._data_prep(data)
-            self.input_x, self.input_y, self.modified_back = self._sequence_prep(self.data, sub_seq, steps_past, steps_future)
+        if store or len(data) > 0:
+            prepare = partial(self._prepare_inputs, data, store)
+            if cache is not None and not store:
+                cache.restore(self, prepare, data, sub_seq=sub_seq, steps_past=steps_past, steps_future=steps_future, scale=scale)
+            else:
+                prepare()
         else:
             self.data = data
 
@@ -76,29 +119,41 @@ class HybridMultStepUniVar(UniVariateMultiStep):
             Returns:
                 scaler (object): Returns scikit learn scaler object.
         '''
-        if method == '':
-            scaler = FunctionTransformer(lambda x: x, validate=True)
-        elif method == 'standard':
-            scaler = StandardScaler()
-        elif method == 'minmax':
-            scaler = MinMaxScaler()
-        elif method == 'maxabs':
-            scaler = MaxAbsScaler()
-        elif method == 'normalize':
-            scaler = FunctionTransformer(lambda x: (x - x.min()) / (x.max() - x.min()), validate= True)
+        return scaling.get_scaler(method)
+
+    def _prepare_inputs(self, data, store: str):
+        '''Prepares the scaled series and the X/y training tensors, either from raw data or from a window store.
+            Parameters:
+                data (DataFrame): Input data for model training.
+                store (str): Directory of a window store, takes precedence over data.
+        '''
+        self.data = self._open_store(store) if store else self._data_prep(data)
+        self.input_x, self.input_y, self.modified_back = self._sequence_prep(self.data, self.sub_seq, self.steps_past, self.steps_future) # zero-copy views on self.data
 
-        return scaler
+    def _open_store(self, location: str) -> array:
+        '''Memory maps the scaled series of a window store and restores the scaler it was scaled with.
+            Parameters:
+                location (str): Directory of the window store.
+            Returns:
+                series (memmap): Read-only scaled series of shape (length, 1).
+        '''
+        series, self.scaler, meta = window_store.open_store(location)
+        if meta['features'] is not None:
+            raise ValueError(f'Window store at {location} holds a multivariate series')
+        return series
 
-    def _data_prep(self, data: DataFrame) -> array:
+    def _data_prep(self, data: DataFrame, fit: bool = True) -> array:
         '''Prepares data input for model intake. Applies scaling to data.
             Parameters:
                 data (DataFrame): Input time series.
+                fit (bool): Fit the scaler. False applies the frozen scaler, for example to new observations.
             Returns:
                 scaled (array): Scaled input time series.
         '''
         data = array(data).reshape(-1, 1)
 
-        self.scaler.fit(data)
+        if fit:
+            self.scaler.fit(data)
         scaled = self.scaler.transform(data)
 
         return scaled
@@ -118,25 +173,32 @@ class HybridMultStepUniVar(UniVariateMultiStep):
         length = len(input_sequence)
         if length == 0:
             return (0, 0, steps_past // sub_seq)
-        X = []
-        y = []
-        if length <= steps_past:
-            raise ValueError('Input sequence is equal to or shorter than steps to look backwards')
-        if steps_future <= 0:
-            raise ValueError('Steps in the future need to be bigger than 0')
-
-        for i in range(length):
-            last = i + steps_past
-            if last > length - steps_future:
-                break
-            X.append(input_sequence[i:last])
-            y.append(input_sequence[last:last + steps_future])
-        y = array(y)
-        X = array(X)
+        X, y = sequence_windows(input_sequence, steps_past, steps_future)
         modified_back = X.shape[1]//sub_seq
         X = X.reshape((X.shape[0], sub_seq, modified_back, 1))
         return X, y, modified_back # special treatment to account for sub sequence division
 
+    def _input_layout(self, data: array) -> array:
+        '''Divides a batch of scaled sequences of shape (batch, steps_past, 1) into sub sequences.
+            Parameters:
+                data (array): Batch of scaled input sequences.
+            Returns:
+                (array): Model input batch of shape (batch, sub_seq, steps_past // sub_seq, 1).
+        '''
+        return data.reshape((data.shape[0], self.sub_seq, self.steps_past // self.sub_seq, 1))
+
+    def _prepare_batch(self, data: array) -> array:
+        '''Scales a batch of sequences with the training scaler in one vectorised call and brings it into the model input layout.
+            Parameters:
+                data (array): Batch of input sequences.
+            Returns:
+                (array): Model input batch.
+        '''
+        data = array(data, dtype=float).reshape(len(data), -1, 1)
+        data = self.scaler.transform(data.reshape(-1, 1)).reshape(data.shape)
+
+        return self._input_layout(data)
+
     def set_model_id(self, name: str):
         '''Setter method to change model id field.
         '''
@@ -178,115 +240,185 @@ class HybridMultStepUniVar(UniVariateMultiStep):
         '''
         return self.metrics
 
-    def create_cnnrnn(self, optimizer: str = 'adam', loss: str = 'mean_squared_error', metrics: str = 'mean_squared_error'):
+    @accelerated
+    def create_cnnrnn(self, optimizer: str = 'adam', loss: str = 'mean_squared_error', metrics: str = 'mean_squared_error', spec: str | dict | ArchitectureSpec = 'default'):
         '''Creates CNN-RNN hybrid model by defining all layers with activation functions, optimizer, loss function and evaluation metrics.
+            Parameters:
+                spec (str | dict | ArchitectureSpec): Layer widths and depth, a preset name ('default', 'compact'), keyword arguments of ArchitectureSpec or a spec.
         '''
         self.set_model_id('CNN-RNN')
         self.loss = loss
         self.metrics = metrics
+        spec = resolve_spec(spec)
 
         self.model = keras.Sequential()
-        self.model.add(TimeDistributed(Conv1D(filters=64, kernel_size=1, activation='relu'), input_shape=(None,self.modified_back, 1)))
-        self.model.add(TimeDistributed(Conv1D(filters=32, kernel_size=1, activation='relu')))
-        self.model.add(TimeDistributed(MaxPooling1D(pool_size=2)))
-        self.model.add(TimeDistributed(Flatten()))
-        self.model.add(SimpleRNN(50, activation='relu', return_sequences=True))
-        self.model.add(SimpleRNN(25, activation='relu'))
-        self.model.add(Dense(self.input_y.shape[1]))
+        self.model.add(keras.Input(shape=(None,self.modified_back, 1)))
+        self.model.add(layers.TimeDistributed(layers.Conv1D(filters=spec.scaled(64), kernel_size=1, activation='relu')))
+        self.model.add(layers.TimeDistributed(layers.Conv1D(filters=spec.scaled(32), kernel_size=1, activation='relu')))
+        self.model.add(layers.TimeDistributed(layers.MaxPooling1D(pool_size=2)))
+        self.model.add(layers.TimeDistributed(layers.Flatten()))
+        for layer in recurrent_stack(layers.SimpleRNN, spec.sizes((50, 25))):
+            self.model.add(layer)
+        self.model.add(layers.Dense(self.input_y.shape[1]))
         self.model.compile(optimizer=optimizer, loss=loss, metrics=metrics)
 
-    def create_cnnlstm(self, optimizer: str = 'adam', loss: str = 'mean_squared_error', metrics: str = 'mean_squared_error'):
+    @accelerated
+    def create_cnnlstm(self, optimizer: str = 'adam', loss: str = 'mean_squared_error', metrics: str = 'mean_squared_error', spec: str | dict | ArchitectureSpec = 'default'):
         '''Creates CNN-LSTM hybrid model by defining all layers with activation functions, optimizer, loss function and evaluation metrics.
+            Parameters:
+                spec (str | dict | ArchitectureSpec): Layer widths and depth, a preset name ('default', 'compact'), keyword arguments of ArchitectureSpec or a spec.
         '''
         self.set_model_id('CNN-LSTM')
         self.loss = loss
         self.metrics = metrics
+        spec = resolve_spec(spec)
 
         self.model = keras.Sequential()
-        self.model.add(TimeDistributed(Conv1D(filters=64, kernel_size=1, activation='relu'), input_shape=(None,self.modified_back, 1)))
-        self.model.add(TimeDistributed(Conv1D(filters=32, kernel_size=1, activation='relu')))
-        self.model.add(TimeDistributed(MaxPooling1D(pool_size=2)))
-        self.model.add(TimeDistributed(Flatten()))
-        self.model.add(LSTM(50, activation='relu', return_sequences=True))
-        self.model.add(LSTM(25, activation='relu'))
-        self.model.add(Dense(self.input_y.shape[1]))
+        self.model.add(keras.Input(shape=(None,self.modified_back, 1)))
+        self.model.add(layers.TimeDistributed(layers.Conv1D(filters=spec.scaled(64), kernel_size=1, activation='relu')))
+        self.model.add(layers.TimeDistributed(layers.Conv1D(filters=spec.scaled(32), kernel_size=1, activation='relu')))
+        self.model.add(layers.TimeDistributed(layers.MaxPooling1D(pool_size=2)))
+        self.model.add(layers.TimeDistributed(layers.Flatten()))
+        for layer in recurrent_stack(layers.LSTM, spec.sizes((50, 25))):
+            self.model.add(layer)
+        self.model.add(layers.Dense(self.input_y.shape[1]))
         self.model.compile(optimizer=optimizer, loss=loss, metrics=metrics)
 
-    def create_cnngru(self, optimizer: str = 'adam', loss: str = 'mean_squared_error', metrics: str = 'mean_squared_error'):
+    @accelerated
+    def create_cnngru(self, optimizer: str = 'adam', loss: str = 'mean_squared_error', metrics: str = 'mean_squared_error', spec: str | dict | ArchitectureSpec = 'default'):
         '''Creates CNN-GRU hybrid model by defining all layers with activation functions, optimizer, loss function and evaluation metrics.
+            Parameters:
+                spec (str | dict | ArchitectureSpec): Layer widths and depth, a preset name ('default', 'compact'), keyword arguments of ArchitectureSpec or a spec.
         '''
         self.set_model_id('CNN-GRU')
         self.loss = loss
         self.metrics = metrics
+        spec = resolve_spec(spec)
 
         self.model = keras.Sequential()
-        self.model.add(TimeDistributed(Conv1D(filters=64, kernel_size=1, activation='relu'), input_shape=(None,self.modified_back, 1)))
-        self.model.add(TimeDistributed(Conv1D(filters=32, kernel_size=1, activation='relu')))
-        self.model.add(TimeDistributed(MaxPooling1D(pool_size=2)))
-        self.model.add(TimeDistributed(Flatten()))
-        self.model.add(GRU(50, activation='relu', return_sequences=True))
-        self.model.add(GRU(25, activation='relu'))
-        self.model.add(Dense(self.input_y.shape[1]))
+        self.model.add(keras.Input(shape=(None,self.modified_back, 1)))
+        self.model.add(layers.TimeDistributed(layers.Conv1D(filters=spec.scaled(64), kernel_size=1, activation='relu')))
+        self.model.add(layers.TimeDistributed(layers.Conv1D(filters=spec.scaled(32), kernel_size=1, activation='relu')))
+        self.model.add(layers.TimeDistributed(layers.MaxPooling1D(pool_size=2)))
+        self.model.add(layers.TimeDistributed(layers.Flatten()))
+        for layer in recurrent_stack(layers.GRU, spec.sizes((50, 25))):
+            self.model.add(layer)
+        self.model.add(layers.Dense(self.input_y.shape[1]))
         self.model.compile(optimizer=optimizer, loss=loss, metrics=metrics)
 
-    def create_cnnbirnn(self, optimizer: str = 'adam', loss: str = 'mean_squared_error', metrics: str = 'mean_squared_error'):
+    @accelerated
+    def create_cnnbirnn(self, optimizer: str = 'adam', loss: str = 'mean_squared_error', metrics: str = 'mean_squared_error', spec: str | dict | ArchitectureSpec = 'default'):
         '''Creates CNN-Bidirectional-RNN hybrid model by defining all layers with activation functions, optimizer, loss function and evaluation metrics.
+            Parameters:
+                spec (str | dict | ArchitectureSpec): Layer widths and depth, a preset name ('default', 'compact'), keyword arguments of ArchitectureSpec or a spec.
         '''
         self.set_model_id('CNN-Bi-RNN')
         self.loss = loss
         self.metrics = metrics
+        spec = resolve_spec(spec)
 
         self.model = keras.Sequential()
-        self.model.add(TimeDistributed(Conv1D(filters=64, kernel_size=1, activation='relu'), input_shape=(None,self.modified_back, 1)))
-        self.model.add(TimeDistributed(Conv1D(filters=32, kernel_size=1, activation='relu')))
-        self.model.add(TimeDistributed(MaxPooling1D(pool_size=2)))
-        self.model.add(TimeDistributed(Flatten()))
-        self.model.add(Bidirectional(SimpleRNN(50, activation='relu', return_sequences=True)))
-        self.model.add(SimpleRNN(25, activation='relu'))
-        self.model.add(Dense(self.input_y.shape[1]))
+        self.model.add(keras.Input(shape=(None,self.modified_back, 1)))
+        self.model.add(layers.TimeDistributed(layers.Conv1D(filters=spec.scaled(64), kernel_size=1, activation='relu')))
+        self.model.add(layers.TimeDistributed(layers.Conv1D(filters=spec.scaled(32), kernel_size=1, activation='relu')))
+        self.model.add(layers.TimeDistributed(layers.MaxPooling1D(pool_size=2)))
+        self.model.add(layers.TimeDistributed(layers.Flatten()))
+        for layer in recurrent_stack(layers.SimpleRNN, spec.sizes((50, 25)), wrapper=layers.Bidirectional):
+            self.model.add(layer)
+        self.model.add(layers.Dense(self.input_y.shape[1]))
         self.model.compile(optimizer=optimizer, loss=loss, metrics=metrics)
 
-    def create_cnnbilstm(self, optimizer: str = 'adam', loss: str = 'mean_squared_error', metrics: str = 'mean_squared_error'):
+    @accelerated
+    def create_cnnbilstm(self, optimizer: str = 'adam', loss: str = 'mean_squared_error', metrics: str = 'mean_squared_error', spec: str | dict | ArchitectureSpec = 'default'):
         '''Creates CNN-Bidirectional-LSTM hybrid model by defining all layers with activation functions, optimizer, loss function and evaluation metrics.
+            Parameters:
+                spec (str | dict | ArchitectureSpec): Layer widths and depth, a preset name ('default', 'compact'), keyword arguments of ArchitectureSpec or a spec.
         '''
         self.set_model_id('CNN-Bi-LSTM')
         self.loss = loss
         self.metrics = metrics
+        spec = resolve_spec(spec)
 
         self.model = keras.Sequential()
-        self.model.add(TimeDistributed(Conv1D(filters=64, kernel_size=1, activation='relu'), input_shape=(None,self.modified_back, 1)))
-        self.model.add(TimeDistributed(Conv1D(filters=32, kernel_size=1, activation='relu')))
-        self.model.add(TimeDistributed(MaxPooling1D(pool_size=2)))
-        self.model.add(TimeDistributed(Flatten()))
-        self.model.add(Bidirectional(LSTM(50, activation='relu', return_sequences=True)))
-        self.model.add(LSTM(25, activation='relu'))
-        self.model.add(Dense(self.input_y.shape[1]))
+        self.model.add(keras.Input(shape=(None,self.modified_back, 1)))
+        self.model.add(layers.TimeDistributed(layers.Conv1D(filters=spec.scaled(64), kernel_size=1, activation='relu')))
+        self.model.add(layers.TimeDistributed(layers.Conv1D(filters=spec.scaled(32), kernel_size=1, activation='relu')))
+        self.model.add(layers.TimeDistributed(layers.MaxPooling1D(pool_size=2)))
+        self.model.add(layers.TimeDistributed(layers.Flatten()))
+        for layer in recurrent_stack(layers.LSTM, spec.sizes((50, 25)), wrapper=layers.Bidirectional):
+            self.model.add(layer)
+        self.model.add(layers.Dense(self.input_y.shape[1]))
         self.model.compile(optimizer=optimizer, loss=loss, metrics=metrics)
 
-    def create_cnnbigru(self, optimizer: str = 'adam', loss: str = 'mean_squared_error', metrics: str = 'mean_squared_error'):
+    @accelerated
+    def create_cnnbigru(self, optimizer: str = 'adam', loss: str = 'mean_squared_error', metrics: str = 'mean_squared_error', spec: str | dict | ArchitectureSpec = 'default'):
         '''Creates CNN-Bidirectional-GRU hybrid model by defining all layers with activation functions, optimizer, loss function and evaluation metrics.
+            Parameters:
+                spec (str | dict | ArchitectureSpec): Layer widths and depth, a preset name ('default', 'compact'), keyword arguments of ArchitectureSpec or a spec.
         '''
         self.set_model_id('CNN-Bi-GRU')
         self.loss = loss
         self.metrics = metrics
+        spec = resolve_spec(spec)
 
         self.model = keras.Sequential()
-        self.model.add(TimeDistributed(Conv1D(filters=64, kernel_size=1, activation='relu'), input_shape=(None,self.modified_back, 1)))
-        self.model.add(TimeDistributed(Conv1D(filters=32, kernel_size=1, activation='relu')))
-        self.model.add(TimeDistributed(MaxPooling1D(pool_size=2)))
-        self.model.add(TimeDistributed(Flatten()))
-        self.model.add(Bidirectional(GRU(50, activation='relu', return_sequences=True)))
-        self.model.add(GRU(25, activation='relu'))
-        self.model.add(Dense(self.input_y.shape[1]))
+        self.model.add(keras.Input(shape=(None,self.modified_back, 1)))
+        self.model.add(layers.TimeDistributed(layers.Conv1D(filters=spec.scaled(64), kernel_size=1, activation='relu')))
+        self.model.add(layers.TimeDistributed(layers.Conv1D(filters=spec.scaled(32), kernel_size=1, activation='relu')))
+        self.model.add(layers.TimeDistributed(layers.MaxPooling1D(pool_size=2)))
+        self.model.add(layers.TimeDistributed(layers.Flatten()))
+        for layer in recurrent_stack(layers.GRU, spec.sizes((50, 25)), wrapper=layers.Bidirectional):
+            self.model.add(layer)
+        self.model.add(layers.Dense(self.input_y.shape[1]))
+        self.model.compile(optimizer=optimizer, loss=loss, metrics=metrics)
+
+    @accelerated
+    def create_cnntransformer(self, optimizer: str = 'adam', loss: str = 'mean_squared_error', metrics: str = 'mean_squared_error', spec: str | dict | ArchitectureSpec = 'default', heads: int = 4):
+        '''Creates CNN-Transformer hybrid model, self-attention blocks over the sub sequences encoded by the convolutional layers.
+            Parameters:
+                spec (str | dict | ArchitectureSpec): Layer widths and depth, a preset name ('default', 'compact'), keyword arguments of ArchitectureSpec or a spec.
+                heads (int): Number of attention heads per block.
+        '''
+        self.set_model_id('CNN-Transformer')
+        self.loss = loss
+        self.metrics = metrics
+        spec = resolve_spec(spec)
+
+        inputs = keras.Input(shape=(None,self.modified_back, 1))
+        encoded = layers.TimeDistributed(layers.Conv1D(filters=spec.scaled(64), kernel_size=1, activation='relu'))(inputs)
+        encoded = layers.TimeDistributed(layers.Conv1D(filters=spec.scaled(32), kernel_size=1, activation='relu'))(encoded)
+        encoded = layers.TimeDistributed(layers.MaxPooling1D(pool_size=2))(encoded)
+        encoded = layers.TimeDistributed(layers.Flatten())(encoded)
+        encoded = attention.attention_blocks(encoded, spec.sizes((32, 32)), heads)
+        self.model = keras.Model(inputs, layers.Dense(self.input_y.shape[1])(encoded))
         self.model.compile(optimizer=optimizer, loss=loss, metrics=metrics)
 
-    def fit_model(self, epochs: int, show_progress: int = 1, validation_split=0.20, batch_size = 10):
+    def fit_model(self, epochs: int, show_progress: int = 1, validation_split=0.20, batch_size = 10, shuffle_buffer: int = None, jit_compile: bool = None, large_batch: bool = False, warmup_epochs: int = 5, early_stopping: int = 0, checkpoint_dir: str = '', checkpoint_every: int = 1, resume: bool = False):
         '''Trains the model on data provided. Perfroms validation.
             Parameters:
                 epochs (int): Number of epochs to train the model.
                 show_progress (int): Prints training progress.
+                validation_split (float): Fraction of samples held out for validation.
+                batch_size (int): Number of samples per gradient update.
+                shuffle_buffer (int): Streaming mode only. Number of samples to shuffle over, defaults to all training samples.
+                jit_compile (bool): Switch XLA compilation on or off for this and later runs. None keeps the setting chosen in create_*.
+                large_batch (bool): Scale the learning rate to batch_size (square root rule) and warm it up, for batch sizes in the thousands.
+                warmup_epochs (int): Large batch mode only. Epochs to ramp the learning rate up over.
+                early_stopping (int): Stops after that many epochs without improvement of the validation loss and restores the best weights. 0 trains all epochs.
+                checkpoint_dir (str): Saves weights and optimizer state to this directory every checkpoint_every epochs.
+                checkpoint_every (int): Epochs between two checkpoints.
+                resume (bool): Continues an interrupted run from the latest checkpoint in checkpoint_dir, epochs counts the epochs of the whole run.
         '''
-        self.details = self.model.fit(self.input_x, self.input_y, validation_split=validation_split, batch_size = batch_size, epochs = epochs, verbose=show_progress)
+        if jit_compile is not None:
+            self.model.jit_compile = jit_compile
+        callbacks = lr_scaling.large_batch_callbacks(self.model, batch_size, large_batch, warmup_epochs)
+        stopping, initial_epoch = checkpoints.checkpoint_callbacks(self.model, early_stopping, checkpoint_dir, checkpoint_every, resume, 'val_loss' if validation_split else 'loss')
+        callbacks += stopping
+        if self.streaming:
+            train, validation = train_validation_datasets(self.data, self.data, self.steps_past, self.steps_future, self.input_x.shape[1:], self.input_y.shape[1:], validation_split=validation_split, batch_size=batch_size, shuffle_buffer=shuffle_buffer)
+            self.details = self.model.fit(train, validation_data=validation, epochs = epochs, verbose=show_progress, callbacks=callbacks, initial_epoch=initial_epoch)
+        else:
+            self.details = self.model.fit(self.input_x, self.input_y, validation_split=validation_split, batch_size = batch_size, epochs = epochs, verbose=show_progress, callbacks=callbacks, initial_epoch=initial_epoch)
         return self.details
 
     def model_blueprint(self):
@@ -294,6 +426,13 @@ class HybridMultStepUniVar(UniVariateMultiStep):
         '''
         self.model.summary()
 
+    def model_report(self) -> DataFrame:
+        '''Counts the parameters and floating point operations per forward pass of a single window, layer by layer.
+            Returns:
+                report (DataFrame): One row per layer with its parameters and flops, the column sums are the totals of the model.
+        '''
+        return model_report(self.model, steps=self.input_x.shape[1]) # the number of sub sequences is left open in the model input
+
     def show_performance(self):
         '''Plots:
         1. Models mean squared error of trainings and validation data. (Model loss)
@@ -309,36 +448,106 @@ class HybridMultStepUniVar(UniVariateMultiStep):
         plt.tight_layout()
         plt.show()
 
-    def predict(self, data: array) -> DataFrame:
+    def predict(self, data: array, low_latency: bool = False) -> DataFrame:
         '''Takes in a sequence of values and outputs a forecast.
             Parameters:
                 data (array): Input sequence which needs to be forecasted.
+                low_latency (bool): Run a cached tf.function forward pass instead of keras.Model.predict.
             Returns:
                 (DataFrame): Forecast for sequence provided.
         '''
         data = array(data)
         data = data.reshape(-1, 1)
 
-        self.scaler.fit(data)
-        data = self.scaler.transform(data)
+        data = self.scaler.transform(data) # scaler fitted on the training data
+        forward = compiled_forward(self.model) if low_latency else partial(self.model.predict, verbose=0)
 
-        shape_ = int((data.shape[1] * self.steps_past) / self.sub_seq)
-        data = data.reshape(1, self.sub_seq, shape_ , 1)
+        data = self._input_layout(data.reshape(1, -1, 1))
 
-        y_pred = self.model.predict(data, verbose=0)
+        y_pred = forward(data)
 
         y_pred = y_pred.reshape(y_pred.shape[1], y_pred.shape[0])
 
         return pd.DataFrame(y_pred, columns=[f'{self.model_id}'])
 
-    def save_model(self):
-        '''Save the current model to the current directory.
+    def predict_batch(self, data: array, batch_size: int = 1024, low_latency: bool = False) -> array:
+        '''Takes in many sequences of values and forecasts all of them with one model call per batch.
+            Parameters:
+                data (array): Input sequences of shape (n_windows, steps_past) or an iterable of such sequences.
+                batch_size (int): Maximum number of sequences per model call.
+                low_latency (bool): Run a cached tf.function forward pass instead of keras.Model.predict_on_batch.
+            Returns:
+                (array): Forecasts of shape (n_windows, steps_future).
+        '''
+        forward = compiled_forward(self.model) if low_latency else self.model.predict_on_batch
+        return batch_forecast(forward, self._prepare_batch, data, batch_size)
+
+    def predict_recursive(self, data: array, horizon: int, batch_size: int = 1024, low_latency: bool = False) -> array:
+        '''Forecasts many input sequences beyond steps_future by feeding the forecasts back into the input windows. Every iteration forecasts all sequences with one batched model call and adds steps_future values.
+            Parameters:
+                data (array): Input sequences of shape (n_windows, steps_past).
+                horizon (int): Number of steps to forecast.
+                batch_size (int): Maximum number of sequences per model call.
+                low_latency (bool): Run a cached tf.function forward pass instead of keras.Model.predict_on_batch.
+            Returns:
+                (array): Forecasts of shape (n_windows, horizon), in the same units as predict_batch.
+        '''
+        windows = array(data, dtype=float).reshape(len(data), -1)
+        windows = self.scaler.transform(windows.reshape(-1, 1)).reshape(windows.shape) # scaled once, the rollout stays in model units
+        forward = compiled_forward(self.model) if low_latency else self.model.predict_on_batch
+        prepare = lambda batch: self._input_layout(batch.reshape(len(batch), -1, 1))
+        return recursive_forecast(partial(batch_forecast, forward, prepare, batch_size=batch_size), windows, horizon)
+
+    def _rebuild_windows(self):
+        '''Cuts the stored training windows from the scaled series again, after update appended to it.
+        '''
+        self.input_x, self.input_y, _ = self._sequence_prep(self.data, self.sub_seq, self.steps_past, self.steps_future) # zero-copy views on self.data
+
+    def update(self, data: array, epochs: int = 1, replay: int = 0, batch_size: int = 10, show_progress: int = 0, seed: int = None):
+        '''Appends new observations to the stored series and fine-tunes the model on the windows they complete, mixed with older replay windows. The stored windows are rebuilt on their next use.
+            Parameters:
+                data (array): New observations following the stored series.
+                epochs (int): Number of fine-tuning epochs.
+                replay (int): Number of older windows mixed in at random.
+                batch_size (int): Number of samples per gradient update.
+                show_progress (int): Prints training progress.
+                seed (int): Seed of the replay sampling.
+            Returns:
+                details (History): Keras history of the fine-tuning run.
+        '''
+        history = self.data
+        samples = window_count(len(history), self.steps_past, self.steps_future)
+        self.data = append_series(history, self._data_prep(data, fit=False))
+        X, y, _ = self._sequence_prep(self.data[samples:], self.sub_seq, self.steps_past, self.steps_future) # windows completed by the new observations only
+        X_replay, y_replay = X[:0], y[:0]
+        if replay:
+            chosen = default_rng(seed).choice(samples, min(replay, samples), replace=False)
+            windows, targets, _ = self._sequence_prep(history, self.sub_seq, self.steps_past, self.steps_future) # strided views, only the chosen windows are copied
+            X_replay, y_replay = windows[chosen], targets[chosen]
+        self._stale_windows = True # input_x and input_y are cut from the longer series on their next use
+        self.details = self.model.fit(concatenate((X, X_replay)), concatenate((y, y_replay)), batch_size=batch_size, epochs=epochs, verbose=show_progress, shuffle=True)
+        return self.details
+
+    def save_store(self, location: str):
+        '''Writes the scaled series and the fitted scaler to a window store. Predictors created with store=location memory map it instead of preparing the data again.
+            Parameters:
+                location (str): Directory of the window store.
+        '''
+        window_store.write_store(location, self.data, self.scaler)
+
+    def save_model(self, location: str = ''):
+        '''Save the current model and its fitted scaler to the current directory.
+            Parameters:
+                location (str): Directory to save to. Defaults to the current directory.
         '''
-        self.model.save(os.path.abspath(os.getcwd()))
+        location = os.path.abspath(location or os.getcwd())
+        self.model.save(location)
+        scaling.save_scaler(self.scaler, location)
 
     def load_model(self, location: str):
-        '''Load a keras model from the path specified.
+        '''Load a keras model and its fitted scaler from the path specified. Models saved without a scaler keep the current scaler.
             Parameters:
                 location (str): Path of keras model location
         '''
         self.model = keras.models.load_model(location)
+        self.scaler = scaling.load_scaler(location, self.scaler)
@@ -0,0 +1,20 @@
+from cerberus.preprocessing.windowing import window_count, sliding_windows, sequence_windows, multivariate_windows, panel_windows, append_series, StaleWindows
+from cerberus.lazy import lazy_exports
+
+# scaling, store and cache need scikit-learn and pipeline needs tensorflow, both are imported on first access
+__getattr__, __dir__ = lazy_exports(
+    'cerberus.preprocessing',
+    {
+        'get_scaler': 'cerberus.preprocessing.scaling',
+        'save_scaler': 'cerberus.preprocessing.scaling',
+        'load_scaler': 'cerberus.preprocessing.scaling',
+        'SeriesScaler': 'cerberus.preprocessing.scaling',
+        'write_store': 'cerberus.preprocessing.store',
+        'open_store': 'cerberus.preprocessing.store',
+        'PreparedCache': 'cerberus.preprocessing.cache',
+        'fingerprint': 'cerberus.preprocessing.cache',
+        'window_dataset': 'cerberus.preprocessing.pipeline',
+        'train_validation_datasets': 'cerberus.preprocessing.pipeline',
+    })
+
+__all__ = ['window_count', 'sliding_windows', 'sequence_windows', 'multivariate_windows', 'panel_windows', 'append_series', 'StaleWindows', 'get_scaler', 'save_scaler', 'load_scaler', 'SeriesScaler', 'write_store', 'open_store', 'PreparedCache', 'fingerprint', 'window_dataset', 'train_validation_datasets'] # star imports only resolve lazy names listed here
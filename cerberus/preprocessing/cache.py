@@ -0,0 +1,140 @@
+import os
+import json
+import shutil
+import tempfile
+from hashlib import blake2b
+
+from numpy import save
+from numpy import load
+from numpy import ascontiguousarray
+
+import pandas as pd
+
+from cerberus.preprocessing.scaling import save_scaler, load_scaler
+
+PREPARED = ('data', 'input_x', 'input_y') # predictor attributes held by a cache entry
+
+
+def fingerprint(data, **params) -> str:
+    '''Hashes input data together with the parameters it is prepared with. DataFrames and Series are hashed column wise by pandas, arrays by their raw bytes.
+        Parameters:
+            data (DataFrame): Raw input data. Series and arrays are accepted as well.
+            params: Parameters the prepared data depends on, such as features, steps and scale method.
+        Returns:
+            key (str): Hex digest identifying the prepared data.
+    '''
+    digest = blake2b(digest_size=16)
+    if isinstance(data, (pd.DataFrame, pd.Series)):
+        digest.update(pd.util.hash_pandas_object(data, index=False).to_numpy().tobytes())
+        digest.update(repr(list(data.columns) if isinstance(data, pd.DataFrame) else data.name).encode())
+    else:
+        data = ascontiguousarray(data)
+        digest.update(f'{data.dtype}{data.shape}'.encode())
+        digest.update(data.tobytes())
+    digest.update(json.dumps(params, sort_keys=True, default=str).encode())
+    return digest.hexdigest()
+
+
+class PreparedCache:
+    '''On-disk cache of prepared predictor inputs (scaled series, X and y tensors and the fitted scaler), keyed by a fingerprint of the raw data and the preparation parameters. Entries are memory mapped on a hit and the least recently used entries are evicted once the cache grows beyond its size limit.
+
+        Example:
+            cache = PreparedCache('~/.cache/cerberus', max_bytes=2**30)
+            predictor = BasicMultStepVar(10, 5, data=data, features=features, scale='standard', cache=cache)
+    '''
+    def __init__(self, directory: str, max_bytes: int = 2**30):
+        '''
+            Parameters:
+                directory (str): Directory holding the cache entries, created if missing.
+                max_bytes (int): Size limit of the cache on disk.
+        '''
+        self.directory = os.path.abspath(os.path.expanduser(directory))
+        self.max_bytes = max_bytes
+        os.makedirs(self.directory, exist_ok=True)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key)
+
+    def get(self, key: str) -> (dict, object):
+        '''Looks up an entry and marks it as recently used.
+            Parameters:
+                key (str): Fingerprint of the entry.
+            Returns:
+                arrays (dict): Read-only memory maps of the cached arrays by name, or None on a miss.
+                scaler (object): Fitted scaler of the entry.
+        '''
+        path = self._path(key)
+        if not os.path.isdir(path):
+            return None
+        os.utime(path) # modification time of the entry directory tracks its last use
+        arrays = {name[:-4]: load(os.path.join(path, name), mmap_mode='r') for name in os.listdir(path) if name.endswith('.npy')}
+        return arrays, load_scaler(path)
+
+    def put(self, key: str, arrays: dict, scaler: object):
+        '''Writes an entry and evicts least recently used entries beyond the size limit. The entry is written to a temporary directory first, so concurrent readers never see a partial entry.
+            Parameters:
+                key (str): Fingerprint of the entry.
+                arrays (dict): Arrays to cache by name. None values are skipped.
+                scaler (object): Fitted scaler of the entry.
+        '''
+        staging = tempfile.mkdtemp(dir=self.directory, prefix='.staging-')
+        for name, value in arrays.items():
+            if value is not None:
+                save(os.path.join(staging, f'{name}.npy'), value)
+        save_scaler(scaler, staging)
+        try:
+            os.rename(staging, self._path(key))
+        except OSError: # another process cached the same key in the meantime
+            shutil.rmtree(staging, ignore_errors=True)
+        self.evict(keep=key)
+
+    def size(self) -> int:
+        '''Returns the size of all cache entries in bytes.
+        '''
+        return sum(self._entry_size(entry) for entry in self._entries())
+
+    def _entries(self) -> list:
+        return [entry for entry in os.scandir(self.directory) if entry.is_dir() and not entry.name.startswith('.')]
+
+    @staticmethod
+    def _entry_size(entry: os.DirEntry) -> int:
+        return sum(file.stat().st_size for file in os.scandir(entry.path))
+
+    def evict(self, keep: str = None):
+        '''Removes least recently used entries until the cache fits its size limit.
+            Parameters:
+                keep (str): Key of an entry that is never evicted, usually the one just written.
+        '''
+        entries = sorted(self._entries(), key=lambda entry: entry.stat().st_mtime)
+        sizes = {entry.name: self._entry_size(entry) for entry in entries}
+        total = sum(sizes.values())
+        for entry in entries:
+            if total <= self.max_bytes:
+                break
+            if entry.name != keep:
+                shutil.rmtree(entry.path, ignore_errors=True)
+                total -= sizes[entry.name]
+
+    def clear(self):
+        '''Removes all entries.
+        '''
+        for entry in self._entries():
+            shutil.rmtree(entry.path, ignore_errors=True)
+
+    def restore(self, predictor: object, prepare: callable, data, **params):
+        '''Restores the prepared inputs of a predictor from the cache. On a miss prepare is run and its result is cached.
+            Parameters:
+                predictor (object): Predictor whose data, input_x, input_y and scaler are restored.
+                prepare (callable): Prepares the inputs of the predictor from the raw data.
+                data (DataFrame): Raw input data.
+                params: Everything else the prepared inputs depend on, such as features, steps and scale method.
+        '''
+        key = fingerprint(data, predictor=type(predictor).__name__, **params)
+        entry = self.get(key)
+        if entry is None:
+            prepare()
+            self.put(key, {name: getattr(predictor, name) for name in PREPARED}, predictor.scaler)
+        else:
+            arrays, predictor.scaler = entry
+            for name in PREPARED:
+                setattr(predictor, name, arrays.get(name))
@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+from numpy import array
+from numpy import arange
+
+from cerberus.lazy import LazyImport
+from cerberus.preprocessing.windowing import window_count
+
+tf = LazyImport('tensorflow')
+keras = LazyImport('tensorflow', 'keras')
+
+AUTOTUNE = -1 # value of tf.data.AUTOTUNE, spelled out to keep tensorflow out of the module import
+
+
+def window_dataset(inputs: array, targets: array, steps_past: int, steps_future: int, x_shape: tuple, y_shape: tuple, target_offset: int = 0, start: int = 0, stop: int = None, layout = None, batch_size: int = 10, shuffle_buffer: int = 0, num_parallel_calls: int = AUTOTUNE, prefetch: int = AUTOTUNE) -> tf.data.Dataset:
+    '''Builds a tf.data pipeline that cuts X/y windows out of a series batch by batch. The series stays a NumPy array (or memmap) outside the graph and only the windows of a batch are gathered from it, the window tensor is never materialised.
+        Parameters:
+            inputs (array): Series of shape (length, ...) the X windows are taken from.
+            targets (array): Series of shape (length, ...) the y windows are taken from.
+            steps_past (int): Steps the predictor will look backward.
+            steps_future (int): Steps the predictor will look forward.
+            x_shape (tuple): Shape of a single X sample as expected by the model.
+            y_shape (tuple): Shape of a single y sample as expected by the model.
+            target_offset (int): Shift of the target window relative to the end of the X window.
+            start (int): First sample index to include.
+            stop (int): Sample index to stop at. Defaults to all samples.
+            layout (callable): Optional function mapping a batch of gathered (batch, steps_past, ...) windows to the model input.
+            batch_size (int): Number of samples per batch.
+            shuffle_buffer (int): Number of sample indices to shuffle over. 0 disables shuffling.
+            num_parallel_calls (int): Parallelism of the window gathering map.
+            prefetch (int): Number of batches to prepare ahead of the training step.
+        Returns:
+            dataset (Dataset): Dataset yielding (X, y) batches.
+    '''
+    if stop is None:
+        stop = window_count(len(inputs), steps_past, steps_future, target_offset)
+
+    dtype = keras.backend.floatx()
+    past = arange(steps_past)
+    future = arange(steps_future) + steps_past + target_offset
+
+    def windows(index: array) -> (array, array):
+        # runs in NumPy on the array itself, a memmap only reads the pages the batch touches
+        return inputs[index[:, None] + past].astype(dtype), targets[index[:, None] + future].astype(dtype)
+
+    def gather(index):
+        X, y = tf.numpy_function(windows, [index], (dtype, dtype), stateful=False)
+        X.set_shape((None, steps_past) + tuple(inputs.shape[1:]))
+        if layout is None:
+            X = tf.reshape(X, (-1,) + tuple(x_shape))
+        else:
+            X = layout(X)
+        return X, tf.reshape(y, (-1,) + tuple(y_shape))
+
+    dataset = tf.data.Dataset.range(start, stop)
+    if shuffle_buffer:
+        dataset = dataset.shuffle(shuffle_buffer, reshuffle_each_iteration=True)
+    dataset = dataset.batch(batch_size).map(gather, num_parallel_calls=num_parallel_calls)
+    return dataset.prefetch(prefetch)
+
+
+def train_validation_datasets(inputs: array, targets: array, steps_past: int, steps_future: int, x_shape: tuple, y_shape: tuple, target_offset: int = 0, layout = None, validation_split: float = 0.20, batch_size: int = 10, shuffle_buffer: int = None) -> (tf.data.Dataset, tf.data.Dataset):
+    '''Splits the samples of a series the same way keras validation_split does (last fraction is held out) and builds a streaming dataset for each part.
+        Parameters:
+            validation_split (float): Fraction of samples held out for validation.
+            shuffle_buffer (int): Shuffle buffer of the training dataset. None shuffles over all training samples, 0 disables shuffling.
+            Remaining parameters are passed on to window_dataset.
+        Returns:
+            train (Dataset): Training dataset.
+            validation (Dataset): Validation dataset or None if validation_split is 0.
+    '''
+    samples = window_count(len(inputs), steps_past, steps_future, target_offset)
+    if samples <= 0:
+        raise ValueError('Input sequence is too short for the requested steps to look backwards and forward')
+    split = int(samples * (1. - validation_split)) # floored like keras
+    if shuffle_buffer is None:
+        shuffle_buffer = split
+
+    options = dict(steps_past=steps_past, steps_future=steps_future, x_shape=x_shape, y_shape=y_shape, target_offset=target_offset, layout=layout, batch_size=batch_size)
+    train = window_dataset(inputs, targets, start=0, stop=split, shuffle_buffer=shuffle_buffer, **options)
+    validation = window_dataset(inputs, targets, start=split, stop=samples, **options) if split < samples else None
+    return train, validation
@@ -0,0 +1,150 @@
+import os
+import pickle
+
+from numpy import array
+
+from sklearn.base import BaseEstimator, TransformerMixin
+from sklearn.preprocessing import StandardScaler, MinMaxScaler, MaxAbsScaler, FunctionTransformer
+from sklearn.utils import check_array
+
+SCALER_FILE = 'scaler.pkl'
+
+
+def identity(x: array) -> array:
+    '''Returns the input unchanged. Module level so that the scaler can be pickled.
+    '''
+    return x
+
+
+class NormalizeScaler(BaseEstimator, TransformerMixin):
+    '''Scales all values into the range seen during fit using one global minimum and maximum across all columns.
+    '''
+    def fit(self, X: array, y: array = None) -> object:
+        '''Stores minimum and range of the data.
+        '''
+        X = check_array(X)
+        self.min_ = X.min()
+        self.range_ = X.max() - X.min()
+        return self
+
+    def transform(self, X: array) -> array:
+        '''Applies the stored minimum and range.
+        '''
+        return (check_array(X) - self.min_) / self.range_
+
+    def inverse_transform(self, X: array) -> array:
+        '''Maps scaled values back into the original range.
+        '''
+        return check_array(X) * self.range_ + self.min_
+
+
+class SeriesScaler:
+    '''Scales many series independently, each with its own offset and scale, in single vectorised calls. Series are addressed by integer codes in the order they were fitted.
+    '''
+    METHODS = ('', 'standard', 'minmax', 'maxabs', 'normalize')
+
+    def __init__(self, method: str = ''):
+        '''
+            Parameters:
+                method (str): Scaling method applied to every series. One of '', 'standard', 'minmax', 'maxabs' or 'normalize'.
+        '''
+        if method not in self.METHODS:
+            raise ValueError(f'Unknown scaling method: {method}')
+        self.method = method
+
+    def fit(self, series: dict) -> object:
+        '''Stores offset and scale of every series.
+            Parameters:
+                series (dict): Maps series ids to 1D arrays.
+        '''
+        self.ids = list(series)
+        self.codes_ = {key: code for code, key in enumerate(self.ids)}
+        sequences = [array(values, dtype=float) for values in series.values()]
+        if self.method == 'standard':
+            offset, scale = [sequence.mean() for sequence in sequences], [sequence.std() for sequence in sequences]
+        elif self.method in ('minmax', 'normalize'):
+            offset, scale = [sequence.min() for sequence in sequences], [sequence.max() - sequence.min() for sequence in sequences]
+        elif self.method == 'maxabs':
+            offset, scale = [0.] * len(sequences), [abs(sequence).max() for sequence in sequences]
+        else:
+            offset, scale = [0.] * len(sequences), [1.] * len(sequences)
+        self.offset_ = array(offset)
+        self.scale_ = array(scale)
+        self.scale_[self.scale_ == 0] = 1. # constant series are only shifted, like scikit learn does
+        return self
+
+    def codes(self, ids: list) -> array:
+        '''Maps series ids to the integer codes used by transform.
+            Parameters:
+                ids (list): Series ids seen during fit.
+            Returns:
+                codes (array): Integer code of every id.
+        '''
+        unknown = [key for key in ids if key not in self.codes_]
+        if unknown:
+            raise ValueError(f'Series {unknown[:5]} were not seen during fit')
+        return array([self.codes_[key] for key in ids], dtype=int)
+
+    def _broadcast(self, values: array, codes: array) -> (array, array):
+        shape = (-1,) + (1,) * (array(values).ndim - 1)
+        return self.offset_[codes].reshape(shape), self.scale_[codes].reshape(shape)
+
+    def transform(self, values: array, codes: array) -> array:
+        '''Scales values of shape (n, ...) belonging to the series codes of shape (n,).
+        '''
+        offset, scale = self._broadcast(values, codes)
+        return (array(values, dtype=float) - offset) / scale
+
+    def inverse_transform(self, values: array, codes: array) -> array:
+        '''Maps scaled values of shape (n, ...) belonging to the series codes of shape (n,) back into their original range.
+        '''
+        offset, scale = self._broadcast(values, codes)
+        return array(values, dtype=float) * scale + offset
+
+
+def get_scaler(method: str) -> object:
+    '''Creates a picklable scikit learn scaler.
+        Parameters:
+            method (str): Scaling method. One of '', 'standard', 'minmax', 'maxabs' or 'normalize'.
+        Returns:
+            scaler (object): Returns scikit learn scaler object.
+    '''
+    if method == '':
+        scaler = FunctionTransformer(identity, validate=True)
+    elif method == 'standard':
+        scaler = StandardScaler()
+    elif method == 'minmax':
+        scaler = MinMaxScaler()
+    elif method == 'maxabs':
+        scaler = MaxAbsScaler()
+    elif method == 'normalize':
+        scaler = NormalizeScaler()
+    else:
+        raise ValueError(f'Unknown scaling method: {method}')
+
+    return scaler
+
+
+def save_scaler(scaler: object, location: str):
+    '''Pickles a fitted scaler next to a saved model.
+        Parameters:
+            scaler (object): Fitted scikit learn scaler.
+            location (str): Directory of the saved model.
+    '''
+    with open(os.path.join(location, SCALER_FILE), 'wb') as file:
+        pickle.dump(scaler, file)
+
+
+def load_scaler(location: str, default: object = None) -> object:
+    '''Loads the scaler saved next to a model.
+        Parameters:
+            location (str): Directory of the saved model.
+            default (object): Scaler to return if no scaler was saved with the model.
+        Returns:
+            scaler (object): Fitted scikit learn scaler.
+    '''
+    path = os.path.join(location, SCALER_FILE)
+    if not os.path.exists(path):
+        return default
+    with open(path, 'rb') as file:
+        return pickle.load(file)
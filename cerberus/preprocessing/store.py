@@ -0,0 +1,47 @@
+import os
+import json
+
+from numpy import array
+from numpy import save
+from numpy import load
+from numpy import memmap
+from numpy import ascontiguousarray
+
+from cerberus.preprocessing.scaling import save_scaler, load_scaler
+
+SERIES_FILE = 'series.npy'
+META_FILE = 'store.json'
+
+
+def write_store(location: str, series: array, scaler: object, features: list = None):
+    '''Writes a scaled series and its fitted scaler to a window store directory. Only the series is written, X/y windows are strided views on it and are cut when the store is opened.
+        Parameters:
+            location (str): Directory of the store, created if missing.
+            series (array): Scaled series in time major layout (length, channels). Multivariate stores hold the target in channel 0.
+            scaler (object): Fitted scaler of the series.
+            features (list): Feature names of the channels, None for univariate series.
+    '''
+    os.makedirs(location, exist_ok=True)
+    series = ascontiguousarray(series)
+    save(os.path.join(location, SERIES_FILE), series)
+    save_scaler(scaler, location)
+    with open(os.path.join(location, META_FILE), 'w') as file:
+        json.dump({'length': series.shape[0], 'channels': series.shape[1], 'dtype': str(series.dtype), 'features': features}, file)
+
+
+def open_store(location: str) -> (memmap, object, dict):
+    '''Opens a window store written by write_store. The series is memory mapped read-only, so all processes opening the same store share one page cached copy.
+        Parameters:
+            location (str): Directory of the store.
+        Returns:
+            series (memmap): Read-only memory map of shape (length, channels).
+            scaler (object): Fitted scaler of the series.
+            meta (dict): Length, channels, dtype and feature names of the store.
+    '''
+    path = os.path.join(location, META_FILE)
+    if not os.path.exists(path):
+        raise FileNotFoundError(f'No window store found at {location}')
+    with open(path) as file:
+        meta = json.load(file)
+    series = load(os.path.join(location, SERIES_FILE), mmap_mode='r')
+    return series, load_scaler(location), meta
@@ -0,0 +1,141 @@
+import warnings
+
+from numpy import array
+from numpy import memmap
+from numpy import ascontiguousarray
+from numpy import moveaxis
+from numpy import arange
+from numpy import repeat
+from numpy import cumsum
+from numpy import concatenate
+from numpy.lib.stride_tricks import sliding_window_view
+
+
+def sliding_windows(input_sequence: array, window: int) -> array:
+    '''Creates a read-only view of all windows of a given length along the first axis. No data is copied.
+        Parameters:
+            input_sequence (array): Sequence of shape (length, ...) that should be windowed.
+            window (int): Length of each window.
+        Returns:
+            windows (array): Read-only view of shape (length - window + 1, window, ...).
+    '''
+    windows = sliding_window_view(input_sequence, window, axis=0)
+    return moveaxis(windows, -1, 1)
+
+
+class StaleWindows:
+    '''Descriptor of the stored training windows of a predictor. Setting the stale flag of the predictor defers rebuilding them from its series to the next access, which calls the _rebuild_windows method of the predictor.
+    '''
+    def __set_name__(self, owner: type, name: str):
+        self.name = '_' + name
+
+    def __get__(self, predictor: object, owner: type = None) -> array:
+        if predictor is None:
+            return self
+        if predictor.__dict__.get('_stale_windows'):
+            predictor._stale_windows = False
+            predictor._rebuild_windows()
+        return predictor.__dict__.get(self.name)
+
+    def __set__(self, predictor: object, windows: array):
+        predictor.__dict__[self.name] = windows
+
+
+def append_series(series: array, new: array, axis: int = 0) -> array:
+    '''Appends new observations to a scaled series. A memory mapped series, such as one opened from a window store, is read into memory by the copy.
+        Parameters:
+            series (array): Scaled series.
+            new (array): Scaled observations following the series.
+            axis (int): Time axis of both arrays.
+        Returns:
+            series (array): Series holding both, in memory.
+    '''
+    if isinstance(series, memmap):
+        warnings.warn(f'Appending to a memory mapped series reads all {series.shape[axis]} stored steps into memory')
+    return concatenate((series, new), axis=axis)
+
+
+def window_count(length: int, steps_past: int, steps_future: int, target_offset: int = 0) -> int:
+    '''Counts the X/y samples a sequence of a given length yields. The count can be zero or negative for sequences that are too short.
+        Parameters:
+            length (int): Length of the time series.
+            steps_past (int): Steps the predictor will look backward.
+            steps_future (int): Steps the predictor will look forward.
+            target_offset (int): Shift of the target window relative to the end of the X window.
+        Returns:
+            samples (int): Number of complete X/y samples.
+    '''
+    if length <= steps_past:
+        raise ValueError('Input sequence is equal to or shorter than steps to look backwards')
+    if steps_future <= 0:
+        raise ValueError('Steps in the future need to be bigger than 0')
+
+    return length - (steps_past + target_offset) - steps_future + 1
+
+
+def sequence_windows(input_sequence: array, steps_past: int, steps_future: int, target_offset: int = 0) -> (array, array):
+    '''Splits a sequence into X and y windows using strided views instead of a Python loop. Sample i looks at input_sequence[i:i + steps_past] and predicts input_sequence[i + steps_past + target_offset:i + steps_past + target_offset + steps_future].
+        Parameters:
+            input_sequence (array): Sequence of shape (length, ...) that contains the time series.
+            steps_past (int): Steps the predictor will look backward.
+            steps_future (int): Steps the predictor will look forward.
+            target_offset (int): Shift of the target window relative to the end of the X window. The multivariate predictors use -1.
+        Returns:
+            X (array): Read-only view containing all looking back sequences.
+            y (array): Read-only view containing all looking forward sequences.
+    '''
+    length = len(input_sequence)
+    target_start = steps_past + target_offset
+    samples = window_count(length, steps_past, steps_future, target_offset)
+
+    if samples <= 0:
+        if target_offset < 0: # legacy multivariate behaviour: a single sample with a truncated target
+            return sliding_windows(input_sequence, steps_past)[:1], sliding_windows(input_sequence[target_start:], length - target_start)
+        raise ValueError('Input sequence is too short for the requested steps to look backwards and forward')
+
+    X = sliding_windows(input_sequence, steps_past)[:samples]
+    y = sliding_windows(input_sequence, steps_future)[target_start:target_start + samples]
+    return X, y
+
+
+def multivariate_windows(input_sequence: array, steps_past: int, steps_future: int, target_offset: int = -1) -> (array, array):
+    '''Splits a feature matrix into the multivariate X tensor and the target windows in a single pass. The first row of the matrix needs to be the target variable y.
+        Parameters:
+            input_sequence (array): Matrix of shape (1 + features, length) with the target in the first row. A transposed time major matrix (for example an opened window store) is windowed without copying.
+            steps_past (int): Steps the predictor will look backward.
+            steps_future (int): Steps the predictor will look forward.
+            target_offset (int): Shift of the target window relative to the end of the X window.
+        Returns:
+            X (array): Read-only view of shape (samples, steps_past, features).
+            y (array): Read-only view of shape (samples, steps_future).
+    '''
+    features = input_sequence[1:].transpose()
+    if features.strides[0] < features.strides[1]: # only allocation: time major copy of feature major input
+        features = ascontiguousarray(features)
+    X, _ = sequence_windows(features, steps_past, steps_future, target_offset)
+    _, y = sequence_windows(input_sequence[0], steps_past, steps_future, target_offset)
+    return X, y
+
+
+def panel_windows(sequences: list, steps_past: int, steps_future: int, target_offset: int = 0) -> (array, array, array):
+    '''Windows many sequences of different length into one training tensor with a single gather. Sequences too short for a complete sample contribute no windows.
+        Parameters:
+            sequences (list): 1D sequences.
+            steps_past (int): Steps the predictor will look backward.
+            steps_future (int): Steps the predictor will look forward.
+            target_offset (int): Shift of the target window relative to the end of the X window.
+        Returns:
+            X (array): Looking back windows of all sequences, shape (samples, steps_past).
+            y (array): Looking forward windows of all sequences, shape (samples, steps_future).
+            index (array): Position of the sequence every sample was cut from.
+    '''
+    lengths = array([len(sequence) for sequence in sequences], dtype=int)
+    counts = (lengths - (steps_past + target_offset) - steps_future + 1).clip(0)
+    offsets = cumsum(lengths) - lengths
+    index = repeat(arange(len(sequences)), counts)
+    starts = repeat(offsets, counts) + arange(counts.sum()) - repeat(cumsum(counts) - counts, counts)
+
+    flat = concatenate([array(sequence, dtype=float).reshape(-1) for sequence in sequences]) if len(sequences) else array([])
+    X = flat[starts[:, None] + arange(steps_past)]
+    y = flat[starts[:, None] + steps_past + target_offset + arange(steps_future)]
+    return X, y, index
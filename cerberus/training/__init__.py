@@ -0,0 +1,20 @@
+from cerberus.training.acceleration import bfloat16_supported, precision_policy, accelerated
+from cerberus.training.tournament import run_tournament, architectures_of
+from cerberus.training.search import run_search
+from cerberus.training.architecture import ArchitectureSpec, PRESETS, resolve_spec, model_report
+from cerberus.lazy import lazy_exports
+
+# large_batch, checkpoints and attention subclass keras classes, tensorflow is imported on first access
+__getattr__, __dir__ = lazy_exports(
+    'cerberus.training',
+    {
+        'scaled_learning_rate': 'cerberus.training.large_batch',
+        'LearningRateWarmup': 'cerberus.training.large_batch',
+        'large_batch_callbacks': 'cerberus.training.large_batch',
+        'TrainingCheckpoint': 'cerberus.training.checkpoints',
+        'checkpoint_callbacks': 'cerberus.training.checkpoints',
+        'PositionalEncoding': 'cerberus.training.attention',
+        'attention_blocks': 'cerberus.training.attention',
+    })
+
+__all__ = ['bfloat16_supported', 'precision_policy', 'accelerated', 'run_tournament', 'architectures_of', 'run_search', 'ArchitectureSpec', 'PRESETS', 'resolve_spec', 'model_report', 'scaled_learning_rate', 'LearningRateWarmup', 'large_batch_callbacks', 'TrainingCheckpoint', 'checkpoint_callbacks', 'PositionalEncoding', 'attention_blocks'] # star imports only resolve lazy names listed here
@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+import inspect
+import warnings
+from contextlib import contextmanager
+from functools import wraps
+
+from cerberus.lazy import LazyImport
+
+keras = LazyImport('tensorflow', 'keras')
+layers = LazyImport('tensorflow', 'keras.layers')
+
+MIXED_POLICY = 'mixed_bfloat16'
+
+
+def bfloat16_supported() -> bool:
+    '''Checks whether the CPU has native bfloat16 instructions (AVX512_BF16 or AMX).
+        Returns:
+            (bool): True if bfloat16 mixed precision is worthwhile on this host.
+    '''
+    try:
+        with open('/proc/cpuinfo') as file:
+            flags = file.read()
+    except OSError:
+        return False
+    return 'avx512_bf16' in flags or 'amx_bf16' in flags
+
+
+@contextmanager
+def precision_policy(mixed_precision: bool):
+    '''Builds layers under the bfloat16 mixed precision policy and restores the previous global policy afterwards.
+        Parameters:
+            mixed_precision (bool): Switch the policy to mixed_bfloat16 inside the context.
+    '''
+    previous = keras.mixed_precision.global_policy()
+    if mixed_precision:
+        keras.mixed_precision.set_global_policy(MIXED_POLICY)
+    try:
+        yield
+    finally:
+        keras.mixed_precision.set_global_policy(previous)
+
+
+def accelerated(builder):
+    '''Adds jit_compile and mixed_precision options to a create_* builder.
+
+        jit_compile (bool): Compile the model with XLA.
+        mixed_precision (bool): Build the layers with a bfloat16 compute dtype. Falls back to float32 with a warning if the CPU lacks bfloat16 support. Outputs and loss stay in float32.
+    '''
+    signature = inspect.signature(builder)
+
+    @wraps(builder)
+    def wrapper(self, *args, jit_compile: bool = False, mixed_precision: bool = False, **kwargs):
+        if mixed_precision and not bfloat16_supported():
+            warnings.warn('CPU does not support bfloat16, building the model in float32')
+            mixed_precision = False
+
+        with precision_policy(mixed_precision):
+            builder(self, *args, **kwargs)
+
+        if mixed_precision: # keep outputs and loss in float32
+            if isinstance(self.model, keras.Sequential):
+                self.model.add(layers.Activation('linear', dtype='float32'))
+            else:
+                self.model = keras.Model(self.model.inputs, layers.Activation('linear', dtype='float32')(self.model.output))
+        if jit_compile or mixed_precision:
+            options = signature.bind(self, *args, **kwargs)
+            options.apply_defaults()
+            self.model.compile(optimizer=options.arguments['optimizer'], loss=options.arguments['loss'], metrics=options.arguments['metrics'], jit_compile=jit_compile)
+
+    return wrapper
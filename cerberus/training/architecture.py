@@ -0,0 +1,211 @@
+from __future__ import annotations
+
+from math import ceil
+
+from numpy import prod
+from pandas import DataFrame
+
+from cerberus.lazy import LazyImport
+
+layers = LazyImport('tensorflow', 'keras.layers')
+
+GATES = {'SimpleRNN': 1, 'GRU': 3, 'LSTM': 4}
+FREE_LAYERS = ('InputLayer', 'Flatten', 'Reshape', 'Cropping1D', 'RepeatVector', 'Dropout', 'Activation', 'MaxPooling1D', 'AveragePooling1D', 'GlobalAveragePooling1D', 'GlobalMaxPooling1D', 'Concatenate', 'Add', 'Embedding', 'Lambda', 'LayerNormalization', 'BatchNormalization', 'PositionalEncoding')
+
+
+class ArchitectureSpec:
+    '''Width and depth of the layers a create_* builder stacks. Every builder has default layer sizes, the spec scales them, changes the number of stacked layers or replaces them.
+    Depth counts the main layer stack of a builder: the recurrent layers of recurrent, bidirectional and hybrid models, the encoder layers of encoder-decoder models (the decoder mirrors the encoder), the Conv1D layers of CNN models, the residual blocks of TCN models, the encoder blocks of Transformer models and the hidden Dense layers of MLP models.
+
+    Methods
+    -------
+    sizes(default):
+        Sizes of the main layer stack.
+    scaled(size):
+        Size of any other layer.
+    '''
+    def __init__(self, width: float = 1.0, depth: int = None, units: tuple = None):
+        '''
+            Parameters:
+                width (float): Multiplies the units and filters of every layer, 0.5 halves them.
+                depth (int): Number of layers of the main stack. Fewer layers keep the last ones of the default stack, more layers repeat its first layer. None keeps the default depth.
+                units (tuple): Explicit sizes of the main stack, replacing width and depth there.
+        '''
+        if width <= 0:
+            raise ValueError('Width needs to be bigger than 0')
+        if depth is not None and depth <= 0:
+            raise ValueError('Depth needs to be bigger than 0')
+        if units is not None and (len(units) == 0 or min(units) <= 0):
+            raise ValueError('Units need to hold at least one size bigger than 0')
+        self.width = width
+        self.depth = depth
+        self.units = tuple(units) if units is not None else None
+
+    def __repr__(self) -> str:
+        return f'ArchitectureSpec(width={self.width}, depth={self.depth}, units={self.units})'
+
+    def scaled(self, size: int) -> int:
+        '''Scales a layer size by the width, keeping at least one unit.
+            Parameters:
+                size (int): Default size of the layer.
+            Returns:
+                size (int): Size of the layer to build.
+        '''
+        return max(1, round(size * self.width))
+
+    def sizes(self, default: tuple) -> tuple:
+        '''Sizes of the main layer stack of a builder.
+            Parameters:
+                default (tuple): Default sizes of the stack, first layer first.
+            Returns:
+                sizes (tuple): Sizes of the stack to build.
+        '''
+        if self.units is not None:
+            return self.units
+        if self.depth is not None:
+            default = (default[0],) * (self.depth - len(default)) + tuple(default[-self.depth:])
+        return tuple(self.scaled(size) for size in default)
+
+
+PRESETS = {
+    'default': ArchitectureSpec(),
+    'compact': ArchitectureSpec(width=0.5, depth=1), # one layer of half the width, for low latency serving
+}
+
+
+def resolve_spec(spec: str | dict | ArchitectureSpec) -> ArchitectureSpec:
+    '''Turns the spec argument of a builder into an ArchitectureSpec.
+        Parameters:
+            spec (str | dict | ArchitectureSpec): Name of a preset ('default' or 'compact'), keyword arguments of ArchitectureSpec or a spec.
+        Returns:
+            spec (ArchitectureSpec): Spec to build the model with.
+    '''
+    if isinstance(spec, ArchitectureSpec):
+        return spec
+    if isinstance(spec, dict):
+        return ArchitectureSpec(**spec)
+    if spec not in PRESETS:
+        raise ValueError(f'Architecture preset {spec} does not exist, choose from {tuple(PRESETS)}')
+    return PRESETS[spec]
+
+
+def recurrent_stack(cell: type, sizes: tuple, return_sequences: bool = False, wrapper: type = None, activation: str = 'relu') -> list:
+    '''Creates stacked recurrent layers, every layer but the last passes its sequence on.
+        Parameters:
+            cell (type): Recurrent layer class, such as SimpleRNN, LSTM or GRU.
+            sizes (tuple): Units per layer.
+            return_sequences (bool): The last layer returns its sequence as well, as in decoders.
+            wrapper (type): Wraps the first layer, such as Bidirectional.
+            activation (str): Activation of all layers.
+        Returns:
+            layers (list): Layers to add to the model in order.
+    '''
+    stack = [cell(units, activation=activation, return_sequences=return_sequences or position < len(sizes) - 1) for position, units in enumerate(sizes)]
+    if wrapper is not None:
+        stack[0] = wrapper(stack[0])
+    return stack
+
+
+def receptive_field(blocks: int, kernel_size: int = 2) -> int:
+    '''Number of time steps the output of stacked temporal blocks sees, each block holding two causal convolutions with the dilation doubling from block to block.
+        Parameters:
+            blocks (int): Number of temporal blocks.
+            kernel_size (int): Kernel size of the convolutions.
+        Returns:
+            steps (int): Receptive field in time steps.
+    '''
+    return 1 + 2 * (kernel_size - 1) * (2 ** blocks - 1)
+
+
+def temporal_depth(steps_past: int, kernel_size: int = 2) -> int:
+    '''Smallest number of temporal blocks whose receptive field covers the input window.
+        Parameters:
+            steps_past (int): Length of the input window.
+            kernel_size (int): Kernel size of the convolutions.
+        Returns:
+            blocks (int): Number of temporal blocks.
+    '''
+    blocks = 1
+    while receptive_field(blocks, kernel_size) < steps_past:
+        blocks += 1
+    return blocks
+
+
+def temporal_blocks(inputs: object, sizes: tuple, kernel_size: int = 2, activation: str = 'relu') -> object:
+    '''Stacks the residual blocks of a temporal convolutional network. Each block holds two dilated causal Conv1D layers and adds its input back, projected by a 1x1 convolution where the number of filters changes. The dilation doubles from block to block, so all time steps are processed in parallel while the receptive field grows exponentially with depth. Too few blocks to cover the window enlarge the kernel instead.
+        Parameters:
+            inputs (Tensor): Window of shape (steps_past, features).
+            sizes (tuple): Filters per block.
+            kernel_size (int): Smallest kernel size of the convolutions.
+            activation (str): Activation of all convolutions.
+        Returns:
+            encoded (Tensor): Features of the last time step, which sees the whole window.
+    '''
+    steps_past = inputs.shape[1]
+    kernel_size = max(kernel_size, ceil((steps_past - 1) / (2 * (2 ** len(sizes) - 1))) + 1)
+    encoded = inputs
+    for block, filters in enumerate(sizes):
+        shortcut = encoded if encoded.shape[-1] == filters else layers.Conv1D(filters, kernel_size=1)(encoded)
+        for _ in range(2):
+            encoded = layers.Conv1D(filters, kernel_size, padding='causal', dilation_rate=2 ** block, activation=activation)(encoded)
+        encoded = layers.Activation(activation)(layers.Add()([shortcut, encoded]))
+    return layers.Flatten()(layers.Cropping1D((steps_past - 1, 0))(encoded)) # causal padding leaves the last step as the only one seeing every input
+
+
+def _shape(shape: tuple, steps: int) -> tuple:
+    '''Drops the batch dimension and fills in an unknown number of time steps.
+    '''
+    shape = tuple(steps if size is None else size for size in shape[1:])
+    if None in shape:
+        raise ValueError('The model has inputs of unknown length, pass the number of steps')
+    return shape
+
+
+def _flops(layer: object, input_shape: tuple, output_shape: tuple) -> float:
+    '''Floating point operations of one sample through a layer, a multiply-add counting as two.
+    '''
+    kind = type(layer).__name__
+    if kind == 'Dense':
+        return 2 * input_shape[-1] * layer.units * prod(output_shape[:-1])
+    if kind == 'Conv1D':
+        return 2 * layer.kernel_size[0] * input_shape[-1] // layer.groups * layer.filters * output_shape[0]
+    if kind in GATES:
+        return 2 * GATES[kind] * (input_shape[-1] + layer.units) * layer.units * input_shape[0]
+    if kind == 'Bidirectional':
+        return _flops(layer.forward_layer, input_shape, output_shape) + _flops(layer.backward_layer, input_shape, output_shape)
+    if kind == 'MultiHeadAttention':
+        config = layer.get_config()
+        heads, key_dim, value_dim = config['num_heads'], config['key_dim'], config['value_dim'] or config['key_dim']
+        steps, width = input_shape[0], input_shape[-1]
+        projections = 2 * steps * width * heads * (2 * key_dim + 2 * value_dim) # query, key and value in, attention output out
+        return projections + 2 * steps * steps * heads * (key_dim + value_dim) # scores and weighted sum of the values
+    if kind == 'TimeDistributed':
+        return input_shape[0] * _flops(layer.layer, input_shape[1:], output_shape[1:])
+    if kind in FREE_LAYERS or not layer.count_params():
+        return 0
+    return float('nan')
+
+
+def model_report(model: object, steps: int = None) -> DataFrame:
+    '''Parameter count and floating point operations per forward pass of a single window, per layer of a built model. Matrix products are counted with two operations per multiply-add. Element-wise work such as activations, pooling and additions is left out, as it is small next to the products. Layers the counter does not know report NaN operations.
+        Parameters:
+            model (Model): Built keras model.
+            steps (int): Number of sub sequences for models with inputs of unknown length, such as the univariate hybrids.
+        Returns:
+            report (DataFrame): One row per layer with its name, type, output shape, parameters and flops. The column sums are the totals of the model.
+    '''
+    rows = []
+    for layer in model.layers:
+        if type(layer).__name__ == 'InputLayer':
+            continue
+        shapes = (layer.input_shape, layer.output_shape)
+        if type(layer).__name__ == 'MultiHeadAttention': # self-attention, query and value are the same sequence
+            shapes = (shapes[0][0] if isinstance(shapes[0], list) else shapes[0], shapes[1])
+        if any(isinstance(shape, list) for shape in shapes): # layers merging several inputs
+            flops = 0 if type(layer).__name__ in FREE_LAYERS else float('nan')
+            output_shape = shapes[1]
+        else:
+            input_shape, output_shape = (_shape(shape, steps) for shape in shapes)
+            flops = _flops(layer, input_shape, output_shape)
+        rows.append((layer.name, type(layer).__name__, output_shape, layer.count_params(), flops))
+    return DataFrame(rows, columns=['layer', 'type', 'output_shape', 'params', 'flops'])
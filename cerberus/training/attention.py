@@ -0,0 +1,43 @@
+from __future__ import annotations
+
+from numpy import arange
+from numpy import float32
+
+from cerberus.lazy import LazyImport
+
+tf = LazyImport('tensorflow')
+keras = LazyImport('tensorflow', 'keras')
+layers = LazyImport('tensorflow', 'keras.layers')
+
+
+@keras.utils.register_keras_serializable(package='cerberus')
+class PositionalEncoding(keras.layers.Layer):
+    '''Adds the sinusoidal position encodings of the original Transformer to a sequence, so self-attention, which is blind to the order of its inputs, knows the position of every time step. Works on sequences of unknown length, such as the sub sequences of the univariate hybrids.
+    '''
+    def call(self, inputs: tf.Tensor) -> tf.Tensor:
+        width = inputs.shape[-1]
+        position = tf.cast(tf.range(tf.shape(inputs)[1]), 'float32')[:, None]
+        angles = position * (1 / 10000 ** (2 * (arange(width) // 2) / width)).astype(float32)
+        encoding = tf.where(arange(width) % 2 == 0, tf.sin(angles), tf.cos(angles))
+        return inputs + tf.cast(encoding, inputs.dtype)
+
+
+def attention_blocks(inputs: tf.Tensor, sizes: tuple, heads: int = 4, activation: str = 'relu') -> tf.Tensor:
+    '''Stacks Transformer encoder blocks on a sequence. The inputs are projected to the width of the first block and position encoded. Every block applies multi-head self-attention and a position-wise feed forward network, each with a residual connection and layer normalisation. Unlike recurrent layers, all time steps are processed in parallel.
+        Parameters:
+            inputs (Tensor): Sequence of shape (steps, features).
+            sizes (tuple): Model width per block, a block changing the width projects its input first.
+            heads (int): Number of attention heads, each of width size // heads.
+            activation (str): Activation of the feed forward networks.
+        Returns:
+            encoded (Tensor): Features of the whole sequence, averaged over time steps.
+    '''
+    encoded = PositionalEncoding()(layers.Dense(sizes[0])(inputs))
+    for width in sizes:
+        if encoded.shape[-1] != width:
+            encoded = layers.Dense(width)(encoded)
+        attended = layers.MultiHeadAttention(num_heads=heads, key_dim=max(1, width // heads))(encoded, encoded)
+        encoded = layers.LayerNormalization()(layers.Add()([encoded, attended]))
+        transformed = layers.Dense(width)(layers.Dense(2 * width, activation=activation)(encoded))
+        encoded = layers.LayerNormalization()(layers.Add()([encoded, transformed]))
+    return layers.GlobalAveragePooling1D()(encoded) # independent of the number of steps, which the univariate hybrids leave open
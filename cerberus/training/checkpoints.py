@@ -0,0 +1,110 @@
+from __future__ import annotations
+
+import os
+import json
+
+from numpy import savez
+from numpy import load
+
+from cerberus.lazy import LazyImport
+
+tf = LazyImport('tensorflow')
+keras = LazyImport('tensorflow', 'keras')
+
+STATE_FILE = 'training.json'
+BEST_WEIGHTS_FILE = 'best_weights.npz'
+
+
+class TrainingCheckpoint(keras.callbacks.Callback):
+    '''Saves the model weights, the optimizer state (slots and iteration count) and the epoch every few epochs, so an interrupted run resumes where it stopped. The state of an early stopping callback is saved alongside.
+    '''
+    def __init__(self, directory: str, every: int = 1, keep: int = 3, early_stopping: keras.callbacks.EarlyStopping = None):
+        '''
+            Parameters:
+                directory (str): Directory of the checkpoints.
+                every (int): Epochs between two checkpoints.
+                keep (int): Number of most recent checkpoints kept on disk.
+                early_stopping (EarlyStopping): Early stopping callback of the same run, its patience counter and best weights are saved as well.
+        '''
+        super().__init__()
+        if every <= 0:
+            raise ValueError('Checkpoint interval needs to be bigger than 0')
+        self.directory = directory
+        self.every = every
+        self.keep = keep
+        self.early_stopping = early_stopping
+        self.restored_state = None # early stopping state of a resumed run, applied when training begins
+
+    def _manager(self) -> tf.train.CheckpointManager:
+        checkpoint = tf.train.Checkpoint(model=self.model, optimizer=self.model.optimizer)
+        return tf.train.CheckpointManager(checkpoint, self.directory, max_to_keep=self.keep)
+
+    def restore(self, model: keras.Model) -> int:
+        '''Restores weights and optimizer state of the latest checkpoint into a model.
+            Parameters:
+                model (Model): Compiled model with the architecture the checkpoints were written for.
+            Returns:
+                initial_epoch (int): Number of epochs already trained, 0 if no checkpoint exists.
+        '''
+        self.set_model(model)
+        manager = self._manager()
+        if manager.latest_checkpoint is None:
+            return 0
+        manager.checkpoint.restore(manager.latest_checkpoint) # optimizer slots are restored once they are created in the first step
+        with open(os.path.join(self.directory, STATE_FILE)) as file:
+            state = json.load(file)
+        self.restored_state = state.get('early_stopping')
+        return state['epoch']
+
+    def on_train_begin(self, logs=None):
+        self.manager = self._manager()
+        if self.early_stopping is not None and self.restored_state is not None:
+            self.early_stopping.wait = self.restored_state['wait']
+            self.early_stopping.best = self.restored_state['best']
+            self.early_stopping.best_epoch = self.restored_state['best_epoch']
+            path = os.path.join(self.directory, BEST_WEIGHTS_FILE)
+            if os.path.exists(path):
+                with load(path) as weights:
+                    self.early_stopping.best_weights = [weights[f'arr_{index}'] for index in range(len(weights.files))]
+        self.restored_state = None
+
+    def on_epoch_end(self, epoch, logs=None):
+        if (epoch + 1) % self.every and not self.model.stop_training:
+            return
+        self.manager.save(checkpoint_number=epoch + 1)
+        state = {'epoch': epoch + 1}
+        if self.early_stopping is not None:
+            state['early_stopping'] = {'wait': self.early_stopping.wait, 'best': float(self.early_stopping.best), 'best_epoch': self.early_stopping.best_epoch}
+            if self.early_stopping.best_weights is not None:
+                savez(os.path.join(self.directory, BEST_WEIGHTS_FILE), *self.early_stopping.best_weights)
+        with open(os.path.join(self.directory, STATE_FILE), 'w') as file:
+            json.dump(state, file)
+
+
+def checkpoint_callbacks(model: keras.Model, patience: int = 0, checkpoint_dir: str = '', checkpoint_every: int = 1, resume: bool = False, monitor: str = 'val_loss') -> (list, int):
+    '''Creates the early stopping and checkpoint callbacks of fit_model and restores the latest checkpoint when resuming.
+        Parameters:
+            model (Model): Compiled model about to be trained.
+            patience (int): Epochs without improvement of the monitored loss before training stops and the best weights are restored. 0 switches early stopping off.
+            checkpoint_dir (str): Directory of the checkpoints. Empty switches checkpoints off.
+            checkpoint_every (int): Epochs between two checkpoints.
+            resume (bool): Restore weights, optimizer state and epoch of the latest checkpoint in checkpoint_dir.
+            monitor (str): Loss watched by early stopping.
+        Returns:
+            callbacks (list): Callbacks to pass to model.fit.
+            initial_epoch (int): Epoch to continue training from.
+    '''
+    if resume and not checkpoint_dir:
+        raise ValueError('Resuming needs the checkpoint_dir of the interrupted run')
+    callbacks = []
+    early_stopping = None
+    if patience:
+        early_stopping = keras.callbacks.EarlyStopping(monitor=monitor, patience=patience, restore_best_weights=True)
+        callbacks.append(early_stopping)
+    initial_epoch = 0
+    if checkpoint_dir:
+        checkpoint = TrainingCheckpoint(checkpoint_dir, checkpoint_every, early_stopping=early_stopping)
+        if resume:
+            initial_epoch = checkpoint.restore(model)
+        callbacks.append(checkpoint) # after early stopping, so the saved state includes the current epoch
+    return callbacks, initial_epoch
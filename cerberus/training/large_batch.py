@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+from math import sqrt
+
+from cerberus.lazy import LazyImport
+
+keras = LazyImport('tensorflow', 'keras')
+
+REFERENCE_BATCH_SIZE = 10 # batch size the default learning rates of the create_* builders are tuned for
+SCALING_RULES = ('linear', 'sqrt')
+
+
+def scaled_learning_rate(learning_rate: float, batch_size: int, reference_batch_size: int = REFERENCE_BATCH_SIZE, rule: str = 'sqrt') -> float:
+    '''Scales a learning rate tuned for reference_batch_size to a larger batch size.
+        Parameters:
+            learning_rate (float): Learning rate tuned for the reference batch size.
+            batch_size (int): Batch size the model will be trained with.
+            reference_batch_size (int): Batch size the learning rate was tuned for.
+            rule (str): 'linear' (suited for SGD) or 'sqrt' (suited for adaptive optimizers such as Adam).
+        Returns:
+            (float): Scaled learning rate.
+    '''
+    if rule not in SCALING_RULES:
+        raise ValueError(f'Unknown learning rate scaling rule {rule}, expected one of {SCALING_RULES}')
+    factor = batch_size / reference_batch_size
+    return learning_rate * (factor if rule == 'linear' else sqrt(factor))
+
+
+class LearningRateWarmup(keras.callbacks.Callback):
+    '''Ramps the optimizer learning rate linearly from its current value up to a target value over the first epochs, then holds it. The original learning rate is restored when training ends.
+    '''
+    def __init__(self, target_learning_rate: float, warmup_epochs: int = 5):
+        '''
+            Parameters:
+                target_learning_rate (float): Learning rate reached at the end of the warm-up.
+                warmup_epochs (int): Number of epochs to ramp over. 0 starts at the target right away.
+        '''
+        super().__init__()
+        self.target_learning_rate = target_learning_rate
+        self.warmup_epochs = warmup_epochs
+
+    def _set(self, learning_rate: float):
+        self.model.optimizer.learning_rate.assign(learning_rate)
+
+    def on_train_begin(self, logs=None):
+        self.initial_learning_rate = float(keras.backend.get_value(self.model.optimizer.learning_rate))
+        self.epoch = 0
+
+    def on_epoch_begin(self, epoch, logs=None):
+        self.epoch = epoch
+        if not self.params.get('steps'):
+            self._set(self._rate(epoch))
+
+    def on_train_batch_begin(self, batch, logs=None):
+        steps = self.params.get('steps')
+        if steps:
+            self._set(self._rate(self.epoch + batch / steps))
+
+    def on_train_end(self, logs=None):
+        self._set(self.initial_learning_rate)
+
+    def _rate(self, progress: float) -> float:
+        '''Learning rate after progress (in epochs) of training.
+        '''
+        if progress >= self.warmup_epochs:
+            return self.target_learning_rate
+        return self.initial_learning_rate + (self.target_learning_rate - self.initial_learning_rate) * progress / self.warmup_epochs
+
+
+def large_batch_callbacks(model, batch_size: int, large_batch: bool, warmup_epochs: int = 5, rule: str = 'sqrt') -> list:
+    '''Creates the callbacks of the large batch training mode of fit_model.
+        Parameters:
+            model (Model): Compiled model about to be trained.
+            batch_size (int): Batch size the model will be trained with.
+            large_batch (bool): Scale the learning rate to the batch size and warm it up. False returns no callbacks.
+            warmup_epochs (int): Epochs to ramp the learning rate over.
+            rule (str): Learning rate scaling rule, see scaled_learning_rate.
+        Returns:
+            callbacks (list): Callbacks to pass to model.fit.
+    '''
+    if not large_batch:
+        return []
+    learning_rate = float(keras.backend.get_value(model.optimizer.learning_rate))
+    return [LearningRateWarmup(scaled_learning_rate(learning_rate, batch_size, rule=rule), warmup_epochs)]
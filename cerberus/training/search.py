@@ -0,0 +1,239 @@
+import os
+import json
+import math
+import random
+import shutil
+import sqlite3
+import inspect
+import tempfile
+import itertools
+import multiprocessing
+from time import perf_counter
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from pandas import DataFrame
+
+from cerberus.workers import limit_threads
+from cerberus.evaluation.backtest import walk_forward
+from cerberus.preprocessing.windowing import window_count
+from cerberus.predictors.blueprints_predictors.abstract_multivariate import MultiVariateMultiStep
+from cerberus.training.tournament import PREPARATION, architectures_of
+from cerberus.lazy import LazyImport
+
+caching = LazyImport('cerberus.preprocessing.cache') # scikit-learn is imported once a search runs
+
+SCHEMA = '''
+CREATE TABLE IF NOT EXISTS trials (
+    id INTEGER PRIMARY KEY,
+    key TEXT UNIQUE NOT NULL,
+    predictor TEXT NOT NULL,
+    params TEXT NOT NULL,
+    architecture TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS results (
+    trial INTEGER NOT NULL REFERENCES trials (id),
+    rung INTEGER NOT NULL,
+    epochs INTEGER NOT NULL,
+    val_loss REAL,
+    score REAL,
+    train_seconds REAL NOT NULL,
+    error TEXT,
+    PRIMARY KEY (trial, rung)
+);
+'''
+
+
+def rungs(min_epochs: int, max_epochs: int, eta: int) -> list:
+    '''Epoch budgets of the successive halving rungs, growing by eta from min_epochs up to max_epochs.
+        Parameters:
+            min_epochs (int): Budget of the first rung.
+            max_epochs (int): Largest budget a configuration is trained for.
+            eta (int): Budget growth per rung, only the best 1/eta of the configurations are promoted.
+        Returns:
+            budgets (list): Total epochs trained after every rung.
+    '''
+    if min_epochs <= 0 or max_epochs < min_epochs or eta < 2:
+        raise ValueError('Successive halving needs 0 < min_epochs <= max_epochs and eta >= 2')
+    budgets = [min_epochs]
+    while budgets[-1] * eta <= max_epochs:
+        budgets.append(budgets[-1] * eta)
+    return budgets
+
+
+def candidates(predictor_classes: list, space: dict, samples: int = None, seed: int = 0) -> list:
+    '''Expands a search space into trial configurations. Every parameter is only applied to the predictor classes whose constructor takes it, architectures to the classes defining the builder.
+        Parameters:
+            predictor_classes (list): Predictor classes such as BasicMultStepUniVar and HybridMultStepUniVar.
+            space (dict): Maps constructor arguments such as steps_past, sub_seq or scale to lists of values. The optional key architecture lists create_* builders and defaults to all builders of every class.
+            samples (int): Draws this many configurations at random instead of the full grid.
+            seed (int): Seed of the sampling.
+        Returns:
+            trials (list): (predictor class, constructor arguments, architecture) tuples.
+    '''
+    space = dict(space)
+    architectures = space.pop('architecture', None)
+    trials = []
+    for predictor_class in predictor_classes:
+        accepted = inspect.signature(predictor_class.__init__).parameters
+        names = [name for name in space if name in accepted]
+        builders = [name for name in (architectures or architectures_of(predictor_class)) if name in architectures_of(predictor_class)]
+        for values in itertools.product(*(space[name] for name in names)):
+            params = dict(zip(names, values))
+            if 'sub_seq' in params and params.get('steps_past', 0) % params['sub_seq']:
+                continue # hybrids split steps_past into sub_seq equally long sub sequences
+            trials += [(predictor_class, params, builder) for builder in builders]
+    if not trials:
+        raise ValueError('The search space holds no valid configuration')
+    if samples is not None and samples < len(trials):
+        trials = random.Random(seed).sample(trials, samples)
+    return trials
+
+
+def _class_name(predictor_class: type) -> str:
+    return f'{predictor_class.__module__}.{predictor_class.__qualname__}'
+
+
+def _arguments(predictor_class: type, config: dict, params: dict) -> dict:
+    '''Constructor arguments of one trial, dropping shared arguments the class does not take.
+    '''
+    accepted = inspect.signature(predictor_class.__init__).parameters
+    return {name: value for name, value in {**config, **params}.items() if name in accepted}
+
+
+def _target_offset(predictor_class: type) -> int:
+    return -1 if issubclass(predictor_class, MultiVariateMultiStep) else 0 # multivariate targets start on the last input step
+
+
+def holdout(trials: list, config: dict, validation_split: float) -> (int, int, int):
+    '''Forecast origins all trials are scored on. The validation loss of a trial is in the units of its scaling and averages over its own validation windows, so trials are ranked on forecasts in original units from the same origins instead. The origins lie within the validation windows of every trial.
+        Parameters:
+            trials (list): (predictor class, constructor arguments, architecture) tuples.
+            config (dict): Constructor arguments shared by all trials, config['data'] holds the series.
+            validation_split (float): Fraction of samples fit_model holds out for validation.
+        Returns:
+            start (int): Row of the first forecast target.
+            origins (int): Number of consecutive origins.
+            horizon (int): Forecast steps scored, the shortest steps_future of all trials.
+    '''
+    length = len(config['data'])
+    start, longest, horizon = 0, 0, None
+    for predictor_class, params, _ in trials:
+        arguments = _arguments(predictor_class, config, params)
+        steps_past, steps_future = arguments['steps_past'], arguments['steps_future']
+        samples = window_count(length, steps_past, steps_future, _target_offset(predictor_class))
+        start = max(start, math.floor(samples * (1. - validation_split)) + steps_past + _target_offset(predictor_class)) # first validation target, split like keras
+        longest = max(longest, steps_future)
+        horizon = steps_future if horizon is None else min(horizon, steps_future)
+    origins = length - longest - start + 1
+    if validation_split <= 0 or origins <= 0:
+        raise ValueError('The validation split leaves no forecast origin shared by all trials')
+    return start, origins, horizon
+
+
+def _tail(data, start: int):
+    return data.iloc[start:] if hasattr(data, 'iloc') else data[start:]
+
+
+def _trial(predictor_class: type, config: dict, store: str, architecture: str, epochs: int, fit_options: dict, checkpoint_dir: str, data, origins: int, horizon: int) -> tuple:
+    '''Trains one configuration up to the epoch budget of a rung in a worker and scores it on the shared forecast origins. Training continues from the checkpoint of the previous rung.
+    '''
+    predictor = predictor_class(**config, store=store)
+    getattr(predictor, architecture)()
+    start = perf_counter()
+    history = predictor.fit_model(epochs, show_progress=0, checkpoint_dir=checkpoint_dir, checkpoint_every=epochs, resume=True, **fit_options).history
+    losses = history.get('val_loss') or history.get('loss')
+    if not losses: # a loss from an earlier run must not be reported for this budget
+        raise ValueError(f'No epoch was trained, the checkpoint in {checkpoint_dir} already holds {epochs} or more epochs')
+    seconds = perf_counter() - start
+    forecasts, actuals = walk_forward(predictor, data)
+    score = ((forecasts - actuals)[:origins, :horizon] ** 2).mean()
+    return losses[-1], float(score), seconds
+
+
+def run_search(predictor_classes: list, config: dict, space: dict, storage: str = 'search.sqlite', min_epochs: int = 1, max_epochs: int = 27, eta: int = 3, samples: int = None, seed: int = 0, fit_options: dict = None, processes: int = None, threads_per_worker: int = 1) -> DataFrame:
+    '''Successive halving search over predictor parameters and architectures. All configurations train for min_epochs, the best 1/eta are promoted and trained on up to eta times the epochs, until max_epochs. Trials of a rung run in parallel worker processes and continue from their checkpoints of the previous rung.
+    Configurations are ranked by their score, the mean squared error in original units of forecasts from the forecast origins of the validation data shared by all of them. Validation losses are not comparable between scalings or forecast horizons.
+    Trials and results are stored in a SQLite file. Running the same search again skips every finished trial, so an interrupted search resumes where it stopped. Trials are identified by their configuration together with the shared config and the rung budgets, a search over other data or budgets starts from scratch.
+        Parameters:
+            predictor_classes (list): Predictor classes to search over, sharing the same kind of data.
+            config (dict): Constructor arguments shared by all trials, such as data and features. Arguments a class does not take are dropped.
+            space (dict): Lists of values per constructor argument (steps_past, steps_future, sub_seq, scale, ...) and optionally per architecture.
+            storage (str): Path of the SQLite file. Checkpoints are kept in a directory next to it.
+            min_epochs (int): Epochs of the first rung.
+            max_epochs (int): Largest number of epochs a configuration is trained for.
+            eta (int): Promotion rate, 1/eta of the configurations reach the next rung.
+            samples (int): Draws this many configurations at random instead of the full grid.
+            seed (int): Seed of the sampling.
+            fit_options (dict): Further arguments of fit_model, such as batch_size or validation_split.
+            processes (int): Number of workers. Defaults to the CPU count divided by threads_per_worker.
+            threads_per_worker (int): Size of the tensorflow thread pools of each worker.
+        Returns:
+            leaderboard (DataFrame): One row per configuration with the highest rung it reached, its epochs, validation loss and score there, best first. Configurations that failed to train hold the error.
+    '''
+    budgets = rungs(min_epochs, max_epochs, eta)
+    trials = candidates(predictor_classes, space, samples, seed)
+    if processes is None:
+        processes = max(1, (os.cpu_count() or 1) // threads_per_worker)
+    checkpoints = os.path.splitext(storage)[0] + '_checkpoints'
+
+    fit_options = fit_options or {}
+    start, origins, horizon = holdout(trials, config, fit_options.get('validation_split', 0.20))
+    settings = caching.fingerprint(config['data'], config={name: value for name, value in config.items() if name != 'data'}, budgets=budgets, fit_options=fit_options) # trials of other data, rungs or training options never match
+
+    connection = sqlite3.connect(storage)
+    connection.executescript(SCHEMA)
+    ids = []
+    for predictor_class, params, architecture in trials:
+        key = json.dumps([_class_name(predictor_class), params, architecture, settings], sort_keys=True)
+        connection.execute('INSERT OR IGNORE INTO trials (key, predictor, params, architecture) VALUES (?, ?, ?, ?)', (key, predictor_class.__name__, json.dumps(params, sort_keys=True), architecture))
+        ids.append(connection.execute('SELECT id FROM trials WHERE key = ?', (key,)).fetchone()[0])
+    connection.commit()
+    by_id = dict(zip(ids, trials))
+
+    shared = tempfile.mkdtemp(prefix='cerberus-', dir='/dev/shm' if os.path.isdir('/dev/shm') else None)
+    try:
+        stores = {} # the scaled series only depends on the class and the scaling, not on the window lengths
+        for trial, (predictor_class, params, _) in by_id.items():
+            arguments = _arguments(predictor_class, config, params)
+            store_key = (_class_name(predictor_class), arguments.get('scale', ''))
+            if store_key not in stores:
+                stores[store_key] = os.path.join(shared, str(len(stores)))
+                predictor_class(**arguments).save_store(stores[store_key])
+            stores[trial] = stores[store_key]
+
+        context = multiprocessing.get_context('spawn') # tensorflow is not fork safe
+        with ProcessPoolExecutor(processes, mp_context=context, initializer=limit_threads, initargs=(threads_per_worker,)) as pool:
+            survivors = ids
+            for rung, epochs in enumerate(budgets):
+                done = {trial for (trial,) in connection.execute(f'SELECT trial FROM results WHERE rung = ? AND epochs = ? AND trial IN ({",".join("?" * len(survivors))})', (rung, epochs, *survivors))}
+                futures = {}
+                for trial in survivors:
+                    if trial in done:
+                        continue
+                    predictor_class, params, architecture = by_id[trial]
+                    arguments = _arguments(predictor_class, config, params)
+                    data = _tail(config['data'], start - arguments['steps_past'] - _target_offset(predictor_class)) # the first origin targets row start
+                    arguments = {name: value for name, value in arguments.items() if name not in PREPARATION}
+                    futures[pool.submit(_trial, predictor_class, arguments, stores[trial], architecture, epochs, fit_options, os.path.join(checkpoints, str(trial)), data, origins, horizon)] = trial
+                for future in as_completed(futures): # every finished trial is stored right away
+                    error = future.exception()
+                    val_loss, score, seconds = (math.nan, math.nan, 0.0) if error else future.result() # a failing configuration ranks last instead of ending the search
+                    connection.execute('INSERT INTO results (trial, rung, epochs, val_loss, score, train_seconds, error) VALUES (?, ?, ?, ?, ?, ?, ?)', (futures[future], rung, epochs, None if math.isnan(val_loss) else val_loss, None if math.isnan(score) else score, seconds, error and f'{type(error).__name__}: {error}'))
+                    connection.commit()
+
+                ranked = connection.execute(f'SELECT trial FROM results WHERE rung = ? AND epochs = ? AND trial IN ({",".join("?" * len(survivors))}) ORDER BY score IS NULL, score', (rung, epochs, *survivors)).fetchall()
+                survivors = [trial for (trial,) in ranked[:max(1, math.ceil(len(ranked) / eta))]]
+
+        rows = connection.execute(f'''
+            SELECT trials.id, trials.predictor, trials.params, trials.architecture, results.rung, results.epochs, results.val_loss, results.score, totals.train_seconds, results.error
+            FROM trials
+            JOIN results ON results.trial = trials.id
+            JOIN (SELECT trial, MAX(rung) AS rung, SUM(train_seconds) AS train_seconds FROM results GROUP BY trial) AS totals ON totals.trial = results.trial AND totals.rung = results.rung
+            WHERE trials.id IN ({",".join("?" * len(ids))})''', ids).fetchall()
+    finally:
+        connection.close()
+        shutil.rmtree(shared, ignore_errors=True)
+
+    leaderboard = DataFrame(rows, columns=['trial', 'predictor', 'params', 'architecture', 'rung', 'epochs', 'val_loss', 'score', 'train_seconds', 'error'])
+    leaderboard['params'] = leaderboard['params'].map(json.loads)
+    return leaderboard.sort_values(['rung', 'score'], ascending=[False, True], ignore_index=True)
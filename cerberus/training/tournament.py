@@ -0,0 +1,87 @@
+import os
+import math
+import shutil
+import tempfile
+import multiprocessing
+from time import perf_counter
+from concurrent.futures import ProcessPoolExecutor
+
+from pandas import DataFrame
+
+from cerberus.workers import limit_threads
+
+PREPARATION = ('data', 'scale', 'store', 'cache') # constructor arguments replaced by the shared window store
+RANKING = 'mean_squared_error' # default metric of every builder, entrants may differ in their loss
+
+
+def _train(predictor_class: type, config: dict, store: str, architecture: str, options: dict, epochs: int, fit_options: dict, model_directory: str) -> dict:
+    '''Trains a single architecture in a worker. The predictor memory maps its windows from the shared store.
+    '''
+    predictor = predictor_class(**config, store=store)
+    getattr(predictor, architecture)(**options)
+    start = perf_counter()
+    details = predictor.fit_model(epochs, show_progress=0, **fit_options)
+    seconds = perf_counter() - start
+    if model_directory:
+        predictor.save_model(os.path.join(model_directory, architecture))
+
+    history = details.history
+    return {
+        'architecture': architecture,
+        'model_id': predictor.model_id,
+        'val_mse': min(history[f'val_{RANKING}']) if f'val_{RANKING}' in history else math.nan,
+        'val_loss': min(history['val_loss']) if 'val_loss' in history else math.nan,
+        'loss': history['loss'][-1],
+        'train_seconds': seconds,
+        'parameters': predictor.model.count_params(),
+    }
+
+
+def architectures_of(predictor_class: type) -> list:
+    '''Lists the create_* builders of a predictor class.
+        Parameters:
+            predictor_class (type): Predictor class such as BasicMultStepUniVar.
+        Returns:
+            architectures (list): Names of all builders.
+    '''
+    return sorted(name for name in dir(predictor_class) if name.startswith('create_'))
+
+
+def run_tournament(predictor_class: type, config: dict, epochs: int, architectures: list = None, fit_options: dict = None, processes: int = None, threads_per_worker: int = 1, model_directory: str = None) -> DataFrame:
+    '''Trains several architectures of one predictor configuration concurrently in a process pool and ranks them by validation mean squared error, which every builder tracks as metric whatever loss it is compiled with.
+    The data is prepared once and written to a window store in shared memory (/dev/shm where available), every worker memory maps it instead of receiving a pickled copy.
+        Parameters:
+            predictor_class (type): Predictor class such as BasicMultStepVar or HybridMultStepUniVar.
+            config (dict): Constructor arguments of the predictor, including data and scale.
+            epochs (int): Number of epochs to train every architecture.
+            architectures (list): Builder names such as 'create_lstm', or (name, options) tuples passing options to the builder. Defaults to all builders of the class.
+            fit_options (dict): Further arguments of fit_model, such as batch_size or validation_split.
+            processes (int): Number of workers. Defaults to the CPU count divided by threads_per_worker.
+            threads_per_worker (int): Size of the tensorflow thread pools of each worker.
+            model_directory (str): Saves every trained model to a subdirectory named after its builder.
+        Returns:
+            leaderboard (DataFrame): One row per architecture with validation mean squared error and loss, final training loss, training time and parameter count, best first.
+    '''
+    entries = [(entry, {}) if isinstance(entry, str) else tuple(entry) for entry in (architectures or architectures_of(predictor_class))]
+    unknown = [name for name, _ in entries if name not in architectures_of(predictor_class)]
+    if unknown:
+        raise ValueError(f'{predictor_class.__name__} has no builders {unknown}')
+    if any(options.get('metrics', RANKING) != RANKING for _, options in entries):
+        raise ValueError(f'Entrants are ranked on the {RANKING} metric, it can not be replaced')
+    if processes is None:
+        processes = max(1, (os.cpu_count() or 1) // threads_per_worker)
+    processes = min(processes, len(entries))
+
+    shared = tempfile.mkdtemp(prefix='cerberus-', dir='/dev/shm' if os.path.isdir('/dev/shm') else None)
+    try:
+        predictor_class(**config).save_store(shared)
+        worker_config = {key: value for key, value in config.items() if key not in PREPARATION}
+
+        context = multiprocessing.get_context('spawn') # tensorflow is not fork safe
+        with ProcessPoolExecutor(processes, mp_context=context, initializer=limit_threads, initargs=(threads_per_worker,)) as pool:
+            futures = [pool.submit(_train, predictor_class, worker_config, shared, name, options, epochs, fit_options or {}, model_directory) for name, options in entries]
+            results = [future.result() for future in futures]
+    finally:
+        shutil.rmtree(shared, ignore_errors=True)
+
+    return DataFrame(results).sort_values('val_mse', ignore_index=True)
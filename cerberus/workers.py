@@ -0,0 +1,12 @@
+import os
+
+
+def limit_threads(threads: int):
+    '''Process pool initializer capping the tensorflow thread pools of a worker before any op runs.
+        Parameters:
+            threads (int): Threads per pool of the worker.
+    '''
+    os.environ['OMP_NUM_THREADS'] = str(threads)
+    import tensorflow as tf
+    tf.config.threading.set_intra_op_parallelism_threads(threads)
+    tf.config.threading.set_inter_op_parallelism_threads(threads)
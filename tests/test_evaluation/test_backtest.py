@@ -0,0 +1,68 @@
+import numpy as np
+import unittest
+import pandas as pd
+
+from cerberus.evaluation.backtest import *
+from cerberus.predictors.univarstandard import BasicMultStepUniVar
+from cerberus.predictors.multivarstandard import BasicMultStepVar
+
+data = pd.read_csv('tests/example_dataset/CaliforniaHousing.csv')[:400]
+
+features = ['target', 'HouseAge', 'AveRooms', 'Latitude']
+
+test0 = BasicMultStepUniVar(4, 2, data=data['target'][:300], scale='minmax')
+test0.create_mlp()
+test0.fit_model(1, show_progress=0, batch_size=64)
+
+test1 = BasicMultStepVar(4, 3, data=data[:300], features=features, scale='standard')
+test1.create_gru()
+test1.fit_model(1, show_progress=0, batch_size=64)
+
+
+class TestBacktest(unittest.TestCase):
+
+    def test_forecast_origins_align_with_training(self):
+        X, y = forecast_origins(test0, data['target'][:300])
+        np.testing.assert_allclose(test0.scaler.transform(X.reshape(-1, 1)).reshape(X.shape), test0.get_X_input.reshape(X.shape))
+        np.testing.assert_allclose(test0.scaler.transform(y.reshape(-1, 1)).reshape(y.shape), test0.get_y_input.reshape(y.shape))
+
+        X, y = forecast_origins(test1, data[:300])
+        np.testing.assert_allclose(test1.scaler.transform(X.reshape(-1, 3)).reshape(X.shape), test1.get_X_input)
+        np.testing.assert_allclose(y, test1.get_y_input)
+
+    def test_stride(self):
+        X, y = forecast_origins(test1, data[300:], stride=5)
+        self.assertEqual(len(X), len(range(0, 100 - 4 + 1 - 3 + 1, 5)))
+        np.testing.assert_array_equal(y[1], data['target'][308:311])
+
+    def test_walk_forward_matches_predict(self):
+        forecasts, actuals = walk_forward(test0, data['target'][300:])
+        expected = test0.scaler.inverse_transform(np.array(test0.predict(data['target'][310:314])))
+        np.testing.assert_allclose(forecasts[10], expected.reshape(-1), rtol=1e-5)
+        self.assertEqual(forecasts.shape, actuals.shape)
+
+    def test_horizon_scores(self):
+        scores = horizon_scores(np.array([[1., 2.], [3., 4.]]), np.array([[2., 2.], [1., 0.]]))
+        np.testing.assert_allclose(scores['mae'], [1.5, 2.])
+        np.testing.assert_allclose(scores['rmse'], [np.sqrt(2.5), np.sqrt(8.)])
+        np.testing.assert_allclose(scores['mape'], [125., 0.])
+        self.assertEqual(list(scores.index), [1, 2])
+
+    def test_backtest(self):
+        scores = backtest(test1, data[300:], batch_size=16)
+        self.assertEqual(scores.shape, (3, 3))
+        self.assertTrue(np.isfinite(scores.values).all())
+
+    def test_too_short(self):
+        with self.assertRaises(ValueError):
+            backtest(test0, data['target'][:5])
+
+    def test_expanding_backtest(self):
+        config = dict(steps_past=4, steps_future=2, data=data['target'], scale='standard')
+        scores, fold_scores = expanding_backtest(BasicMultStepUniVar, config, 'create_mlp', 1, folds=2, processes=2)
+        self.assertEqual(list(scores.index), [1, 2])
+        self.assertEqual(sorted(fold_scores['fold'].unique()), [0, 1])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,47 @@
+import numpy as np
+import unittest
+import pandas as pd
+
+from cerberus.inference.batching import *
+from cerberus.predictors.univarstandard import BasicMultStepUniVar
+from cerberus.predictors.multivarhybrid import HybridMultStepVar
+
+data = pd.read_csv('tests/example_dataset/CaliforniaHousing.csv')[:200]
+features = ['target', 'HouseAge', 'AveRooms', 'Latitude']
+
+test0 = BasicMultStepUniVar(4, 2, data=data['target'], scale='standard')
+test0.create_mlp()
+
+test1 = HybridMultStepVar(2, 4, 2, data=data, features=features, scale='standard')
+test1.create_cnnlstm()
+
+windows_univariate = np.array([data['target'][i:i + 4] for i in range(20)])
+windows_multivariate = np.array([data[features[1:]][i:i + 4] for i in range(20)])
+
+
+class TestBatching(unittest.TestCase):
+
+    def test_window_batches_array(self):
+        batches = list(window_batches(np.arange(10).reshape(5, 2), 2))
+        self.assertEqual([len(batch) for batch in batches], [2, 2, 1])
+
+    def test_window_batches_iterable(self):
+        batches = list(window_batches((np.ones(3) for _ in range(5)), 4))
+        self.assertEqual([batch.shape for batch in batches], [(4, 3), (1, 3)])
+
+    def test_predict_batch_univariate_matches_predict(self):
+        forecasts = test0.predict_batch(windows_univariate, batch_size=8)
+        self.assertEqual(forecasts.shape, (20, 2))
+        np.testing.assert_allclose(forecasts[3], test0.predict(windows_univariate[3]).iloc[:, 0], rtol=1e-5)
+
+    def test_predict_batch_iterable_matches_array(self):
+        forecasts = test1.predict_batch(iter(windows_multivariate), batch_size=7)
+        np.testing.assert_allclose(forecasts, test1.predict_batch(windows_multivariate), rtol=1e-5)
+        np.testing.assert_allclose(forecasts[5], test1.predict(windows_multivariate[5]).iloc[:, 0], rtol=1e-5)
+
+    def test_hybrid_layout_matches_training_layout(self):
+        np.testing.assert_array_equal(test1._input_layout(np.ascontiguousarray(test1.data[1:].transpose())[None, :4]), test1.get_X_input[:1])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,49 @@
+import gc
+import weakref
+import numpy as np
+import unittest
+import pandas as pd
+
+from cerberus.inference.compiled import *
+from cerberus.predictors.univarstandard import BasicMultStepUniVar
+from cerberus.predictors.univarhybrid import HybridMultStepUniVar
+
+data = pd.read_csv('tests/example_dataset/CaliforniaHousing.csv')[:200]
+
+test0 = BasicMultStepUniVar(4, 2, data=data['target'], scale='standard')
+test0.create_mlp()
+
+test1 = HybridMultStepUniVar(2, 4, 2, data=data['target'], scale='standard')
+test1.create_cnngru()
+
+window = np.array(data['target'][10:14])
+
+
+class TestCompiled(unittest.TestCase):
+
+    def test_input_signature(self):
+        self.assertEqual(tuple(input_signature(test0.model).shape), (None, 4))
+
+    def test_forward_is_cached(self):
+        self.assertIs(compiled_forward(test0.model), compiled_forward(test0.model))
+
+    def test_forward_does_not_keep_model(self):
+        predictor = BasicMultStepUniVar(4, 2, data=data['target'], scale='standard')
+        predictor.create_mlp()
+        compiled_forward(predictor.model)(window[None])
+        model = weakref.ref(predictor.model)
+        del predictor
+        gc.collect()
+        self.assertIsNone(model())
+
+    def test_forward_matches_predict(self):
+        batch = test0.get_X_input[:16]
+        np.testing.assert_allclose(compiled_forward(test0.model)(batch), test0.model.predict(batch, verbose=0), rtol=1e-5)
+
+    def test_low_latency_predict(self):
+        np.testing.assert_allclose(test0.predict(window, low_latency=True), test0.predict(window), rtol=1e-5)
+        np.testing.assert_allclose(test1.predict(window, low_latency=True), test1.predict(window), rtol=1e-5)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,79 @@
+import tempfile
+import numpy as np
+import unittest
+import pandas as pd
+
+from cerberus.inference.lite import *
+from cerberus.inference.lite import _calibration_inputs
+from cerberus.predictors.univarstandard import BasicMultStepUniVar
+from cerberus.predictors.multivarhybrid import HybridMultStepVar
+from cerberus.predictors.univarglobal import GlobalMultStepUniVar
+
+data = pd.read_csv('tests/example_dataset/CaliforniaHousing.csv')[:200]
+features = ['target', 'HouseAge', 'AveRooms', 'Latitude']
+
+test0 = BasicMultStepUniVar(4, 2, data=data['target'], scale='standard')
+test0.create_lstm()
+
+test1 = HybridMultStepVar(2, 4, 2, data=data, features=features, scale='standard')
+test1.create_cnnlstm()
+
+test2 = BasicMultStepUniVar(4, 2, data=data['target'], scale='standard')
+test2.create_mlp()
+
+windows_univariate = np.array([data['target'][i:i + 4] for i in range(40)])
+windows_multivariate = np.array([data[features[1:]][i:i + 4] for i in range(40)])
+
+
+def exported(predictor, fresh, **options):
+    '''Exports a predictor and loads the flatbuffer into a freshly constructed one.
+    '''
+    with tempfile.TemporaryDirectory() as location:
+        export_tflite(predictor, location, **options)
+        return load_tflite(fresh, location)
+
+
+class TestLite(unittest.TestCase):
+
+    def test_univariate_matches_keras(self):
+        lite = exported(test0, BasicMultStepUniVar(4, 2, data=data['target'], scale='standard'), batch_size=16)
+        self.assertIsInstance(lite.model, LiteModel)
+        np.testing.assert_allclose(lite.predict_batch(windows_univariate), test0.predict_batch(windows_univariate), atol=1e-5)
+        np.testing.assert_allclose(lite.predict(windows_univariate[3]), test0.predict(windows_univariate[3]), atol=1e-5)
+        np.testing.assert_allclose(lite.predict_batch(windows_univariate, low_latency=True), test0.predict_batch(windows_univariate), atol=1e-5)
+
+    def test_multivariate_hybrid_matches_keras(self):
+        lite = exported(test1, HybridMultStepVar(2, 4, 2, data=data, features=features, scale='standard'))
+        np.testing.assert_allclose(lite.predict_batch(windows_multivariate), test1.predict_batch(windows_multivariate), atol=1e-5)
+
+    def test_streaming_calibration_inputs(self):
+        streaming = HybridMultStepVar(2, 4, 2, data=data, features=features, scale='standard', streaming=True)
+        self.assertIsNone(streaming.get_X_input)
+        np.testing.assert_allclose(_calibration_inputs(streaming, 64)[0], test1.get_X_input[:64])
+
+    def test_quantisation(self):
+        for quantize, tolerance in (('float16', 1e-3), ('dynamic', 1e-2), ('int8', 1e-1)):
+            lite = exported(test2, BasicMultStepUniVar(4, 2, data=data['target'], scale='standard'), quantize=quantize)
+            self.assertEqual(lite.model.quantize, quantize)
+            np.testing.assert_allclose(lite.predict_batch(windows_univariate), test2.predict_batch(windows_univariate), atol=tolerance)
+
+    def test_global_int8(self):
+        panel = {'a': data['target'][:100], 'b': data['target'][100:]}
+        latest = {key: values[-4:] for key, values in panel.items()}
+        for embedding_dim in (0, 3):
+            predictor = GlobalMultStepUniVar(4, 2, data=panel, scale='standard', embedding_dim=embedding_dim)
+            predictor.create_mlp()
+            lite = exported(predictor, GlobalMultStepUniVar(4, 2, data=panel, scale='standard', embedding_dim=embedding_dim), quantize='int8')
+            self.assertEqual(lite.model.quantize, 'int8')
+            np.testing.assert_allclose(lite.predict(latest).to_numpy(dtype=float), predictor.predict(latest).to_numpy(dtype=float), rtol=1e-1)
+
+    def test_invalid_quantisation(self):
+        with tempfile.TemporaryDirectory() as location:
+            with self.assertRaises(ValueError):
+                export_tflite(test2, location, quantize='int4')
+            with self.assertRaises(ValueError): # recurrent layers need dynamic range quantisation
+                export_tflite(test0, location, quantize='int8')
+
+
+if __name__ == '__main__':
+    unittest.main()
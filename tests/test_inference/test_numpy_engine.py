@@ -0,0 +1,72 @@
+import os
+import sys
+import subprocess
+import tempfile
+import numpy as np
+import unittest
+import pandas as pd
+
+from cerberus.inference.numpy_engine import *
+from cerberus.predictors.univarstandard import BasicMultStepUniVar
+from cerberus.predictors.multivarstandard import BasicMultStepVar
+from cerberus.predictors.univarhybrid import HybridMultStepUniVar
+
+data = pd.read_csv('tests/example_dataset/CaliforniaHousing.csv')[:200]
+features = ['target', 'HouseAge', 'AveRooms', 'Latitude']
+
+windows_univariate = np.array([data['target'][i:i + 6] for i in range(50)])
+windows_multivariate = np.array([data[features[1:]][i:i + 6] for i in range(50)])
+
+
+def exported(predictor):
+    '''Exports a predictor and loads it into the NumPy engine.
+    '''
+    with tempfile.TemporaryDirectory() as location:
+        path = os.path.join(location, 'model.npz')
+        export_numpy(predictor, path)
+        return NumpyPredictor(path)
+
+
+class TestNumpyEngine(unittest.TestCase):
+
+    def test_univariate_mlp(self):
+        predictor = BasicMultStepUniVar(6, 3, data=data['target'], scale='minmax')
+        predictor.create_mlp()
+        engine = exported(predictor)
+        np.testing.assert_allclose(engine.predict_batch(windows_univariate), predictor.predict_batch(windows_univariate), rtol=1e-4, atol=1e-5)
+        pd.testing.assert_frame_equal(engine.predict(windows_univariate[0]), predictor.predict(windows_univariate[0]), rtol=1e-4, atol=1e-5)
+
+    def test_univariate_cnn(self):
+        predictor = BasicMultStepUniVar(6, 3, data=data['target'], scale='standard')
+        predictor.create_cnn()
+        engine = exported(predictor)
+        np.testing.assert_allclose(engine.predict_batch(windows_univariate, batch_size=16), predictor.predict_batch(windows_univariate), rtol=1e-4, atol=1e-5)
+
+    def test_multivariate(self):
+        for builder in ('create_mlp', 'create_cnn'):
+            predictor = BasicMultStepVar(6, 3, data=data, features=features, scale='standard')
+            getattr(predictor, builder)()
+            engine = exported(predictor)
+            np.testing.assert_allclose(engine.predict_batch(windows_multivariate), predictor.predict_batch(windows_multivariate), rtol=1e-4, atol=1e-5)
+
+    def test_unsupported_model(self):
+        predictor = HybridMultStepUniVar(2, 6, 3, data=data['target'], scale='standard')
+        predictor.create_cnnlstm()
+        with self.assertRaises(ValueError):
+            exported(predictor)
+
+    def test_inference_without_tensorflow(self):
+        predictor = BasicMultStepUniVar(6, 3, data=data['target'], scale='standard')
+        predictor.create_cnn()
+        with tempfile.TemporaryDirectory() as location:
+            path = os.path.join(location, 'model.npz')
+            export_numpy(predictor, path)
+            code = ('import sys\nfrom cerberus.inference.numpy_engine import NumpyPredictor\n'
+                    f'NumpyPredictor({path!r}).predict_batch([list(range(6))])\n'
+                    "print(' '.join(m for m in ('tensorflow', 'sklearn') if m in sys.modules))")
+            loaded = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, check=True).stdout.split()
+        self.assertEqual(loaded, [])
+
+
+if __name__ == '__main__':
+    unittest.main()
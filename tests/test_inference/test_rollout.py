@@ -0,0 +1,61 @@
+import numpy as np
+import unittest
+import pandas as pd
+
+from cerberus.inference.rollout import *
+from cerberus.predictors.univarhybrid import HybridMultStepUniVar
+
+data = pd.read_csv('tests/example_dataset/CaliforniaHousing.csv')['target'][:300]
+
+test0 = HybridMultStepUniVar(2, 4, 3, data=data, scale='standard')
+test0.create_cnngru()
+
+windows = np.array([data[i:i + 4] for i in range(0, 40, 4)])
+
+
+def shifted_sum(batch):
+    '''Toy model forecasting two steps: the sum of the window and the sum plus one.
+    '''
+    total = batch.sum(axis=1, keepdims=True)
+    return np.hstack((total, total + 1))
+
+
+class TestRollout(unittest.TestCase):
+
+    def test_ring_buffer(self):
+        ring = RingBuffer(np.arange(8.).reshape(2, 4))
+        ring.push(np.array([[10., 11.], [12., 13.]]))
+        np.testing.assert_array_equal(ring.window(), [[2., 3., 10., 11.], [6., 7., 12., 13.]])
+        self.assertTrue(np.shares_memory(ring.window(), ring.buffer))
+        ring.push(np.arange(10., 16.).reshape(2, 3) * 10)
+        np.testing.assert_array_equal(ring.window(), [[11., 100., 110., 120.], [13., 130., 140., 150.]])
+        ring.push(np.zeros((2, 6)))
+        np.testing.assert_array_equal(ring.window(), np.zeros((2, 4)))
+
+    def test_recursive_forecast_matches_loop(self):
+        calls = []
+        start = np.arange(12.).reshape(4, 3)
+        forecasts = recursive_forecast(lambda batch: calls.append(len(batch)) or shifted_sum(batch), start, 5)
+        self.assertEqual(calls, [4, 4, 4])
+
+        for series, window in enumerate(start):
+            window, expected = list(window), []
+            while len(expected) < 5:
+                predicted = shifted_sum(np.array([window[-3:]]))[0]
+                expected.extend(predicted)
+                window.extend(predicted)
+            np.testing.assert_allclose(forecasts[series], expected[:5])
+
+    def test_invalid_horizon(self):
+        with self.assertRaises(ValueError):
+            recursive_forecast(shifted_sum, np.ones((1, 3)), 0)
+
+    def test_predictor_rollout(self):
+        forecasts = test0.predict_recursive(windows, 8, batch_size=4)
+        self.assertEqual(forecasts.shape, (10, 8))
+        np.testing.assert_allclose(forecasts[:, :3], test0.predict_batch(windows), rtol=1e-5, atol=1e-6)
+        np.testing.assert_allclose(test0.predict_recursive(windows, 8, low_latency=True), forecasts, rtol=1e-4, atol=1e-5)
+
+
+if __name__ == '__main__':
+    unittest.main()
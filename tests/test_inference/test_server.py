@@ -0,0 +1,62 @@
+import os
+import asyncio
+import tempfile
+import numpy as np
+import unittest
+import pandas as pd
+
+from cerberus.inference.server import *
+from cerberus.predictors.multivarstandard import BasicMultStepVar
+
+data = pd.read_csv('tests/example_dataset/CaliforniaHousing.csv')[:200]
+features = ['target', 'HouseAge', 'AveRooms', 'Latitude']
+
+test0 = BasicMultStepVar(4, 2, data=data, features=features, scale='standard')
+test0.create_mlp()
+
+windows = np.array([data[features[1:]][i:i + 4] for i in range(20)])
+
+
+async def concurrent_requests(server, requests):
+    async with server:
+        return await asyncio.gather(*(server.predict(window) for window in requests))
+
+
+class TestServer(unittest.TestCase):
+
+    def test_results_match_predict_batch(self):
+        server = MicroBatchServer(test0, max_batch_size=8, max_wait=0.05)
+        forecasts = asyncio.run(concurrent_requests(server, windows))
+        np.testing.assert_allclose(np.array(forecasts), test0.predict_batch(windows), rtol=1e-5, atol=1e-6)
+        self.assertEqual(server.batches, 3) # 20 concurrent requests in batches of at most 8
+
+    def test_load(self):
+        with tempfile.TemporaryDirectory() as location:
+            test0.save_model(os.path.join(location, 'model'))
+            predictor = BasicMultStepVar(4, 2, data=data, features=features, scale='standard')
+            server = MicroBatchServer.load(predictor, os.path.join(location, 'model'), max_wait=0.01)
+            forecasts = asyncio.run(concurrent_requests(server, windows[:5]))
+        np.testing.assert_allclose(np.array(forecasts), test0.predict_batch(windows[:5]), rtol=1e-5, atol=1e-6)
+
+    def test_failing_batch(self):
+        async def requests():
+            async with MicroBatchServer(test0, max_wait=0.05) as server:
+                batched = await asyncio.gather(server.predict(windows[0]), server.predict(windows[0][:3]), server.predict(windows[2]), return_exceptions=True)
+                return batched, await server.predict(windows[1]) # the server keeps serving
+        (first, malformed, third), later = asyncio.run(requests())
+        self.assertIsInstance(malformed, ValueError) # only the caller with the short window fails
+        np.testing.assert_allclose(np.array([first, third, later]), test0.predict_batch(windows[[0, 2, 1]]), rtol=1e-5, atol=1e-6)
+
+    def test_not_running(self):
+        with self.assertRaises(RuntimeError):
+            asyncio.run(MicroBatchServer(test0).predict(windows[0]))
+
+    def test_invalid_options(self):
+        with self.assertRaises(ValueError):
+            MicroBatchServer(test0, max_batch_size=0)
+        with self.assertRaises(ValueError):
+            MicroBatchServer(test0, max_wait=-1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,46 @@
+import subprocess
+import sys
+import unittest
+
+from cerberus.lazy import *
+
+HEAVY = ('tensorflow', 'matplotlib', 'sklearn')
+
+
+def imported_after(statement):
+    '''Runs a statement in a fresh interpreter and returns which heavy dependencies it imported.
+    '''
+    code = f'import sys\n{statement}\nprint(" ".join(m for m in {HEAVY!r} if m in sys.modules))'
+    return subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, check=True).stdout.split()
+
+
+class TestLazy(unittest.TestCase):
+
+    def test_package_import_is_light(self):
+        self.assertEqual(imported_after('import cerberus'), [])
+
+    def test_predictor_access_is_light(self):
+        self.assertEqual(imported_after('from cerberus import BasicMultStepUniVar, HybridMultStepVar\nfrom cerberus.predictors import HybridMultStepUniVar'), [])
+
+    def test_windowing_and_batching_are_light(self):
+        self.assertEqual(imported_after('import cerberus.preprocessing.windowing, cerberus.inference.batching, cerberus.preprocessing.pipeline'), [])
+
+    def test_star_import_exports_predictors(self):
+        for package in ('cerberus', 'cerberus.predictors'):
+            namespace = {}
+            exec(f'from {package} import *', namespace)
+            for name in ('BasicMultStepVar', 'HybridMultStepVar', 'BasicMultStepUniVar', 'HybridMultStepUniVar', 'GlobalMultStepUniVar'):
+                self.assertIsInstance(namespace[name], type)
+
+    def test_lazy_import_resolves_path(self):
+        path = LazyImport('os', 'path')
+        self.assertEqual(path.join('a', 'b'), 'a/b' if path.sep == '/' else 'a\\b')
+
+    def test_unknown_export(self):
+        import cerberus
+        with self.assertRaises(AttributeError):
+            cerberus.NoSuchPredictor
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -23,6 +23,18 @@ test0 = HybridMultStepVar(
         'MedInc'],
         scale = 'standard')
 
+test1 = HybridMultStepVar(
+    2,
+    6,
+    3,
+    data=data,
+    features=[
+        'target',
+        'HouseAge',
+        'AveRooms',
+        'Latitude'],
+        scale = 'standard')
+
 X = np.array([[[0.98214266],
                [-0.60701891],
                [1.85618152],
@@ -84,6 +96,35 @@ class TestHybrid(unittest.TestCase):
     def test_get_y_input_shape(self):
         np.testing.assert_allclose(test0.get_y_input_shape, shape_y)
 
+    def test_multistep_prep_matches_dstack(self):
+        X = np.dstack([test1._sequence_prep(test1.data[i], 2, 6, 3)[0] for i in range(1, len(test1.data))])
+        np.testing.assert_array_equal(test1.get_X_input, X)
+
+    def test_fit_model_honours_batch_size_and_split(self):
+        test1.create_cnnlstm()
+        details = test1.fit_model(1, show_progress=0, validation_split=0.5, batch_size=2048)
+        self.assertEqual(details.params['steps'], int(np.ceil(np.ceil(len(test1.get_X_input) * 0.5) / 2048)))
+
+    def test_update_appends_windows_and_fine_tunes(self):
+        features = ['target', 'HouseAge', 'AveRooms']
+        for streaming in (False, True):
+            predictor = HybridMultStepVar(2, 4, 2, data=data[:200], features=features, scale='standard', streaming=streaming)
+            predictor.create_cnngru()
+            predictor.update(data[200:220], replay=8, seed=0)
+            self.assertEqual(len(predictor.get_y_input), 216)
+            np.testing.assert_allclose(predictor.get_y_input[-1], data['target'][218:220])
+            if not streaming:
+                window = predictor.scaler.transform(np.array(data[features[1:]][215:219]))
+                np.testing.assert_allclose(predictor.get_X_input[-1], predictor._input_layout(window[None])[0])
+
+
+    def test_cnntransformer(self):
+        features = ['target', 'HouseAge', 'AveRooms']
+        predictor = HybridMultStepVar(2, 4, 2, data=data[:200], features=features, scale='standard')
+        predictor.create_cnntransformer()
+        predictor.fit_model(1, show_progress=0, batch_size=32)
+        self.assertEqual(predictor.model.output_shape, (None, 2))
+        self.assertEqual(predictor.predict(np.array(data[features[1:]][:4])).shape, (2, 1))
 
 if __name__ == '__main__':
     unittest.main()
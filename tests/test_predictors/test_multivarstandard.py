@@ -48,6 +48,35 @@ class TestStandard(unittest.TestCase):
     def test_get_y_input_shape(self):
         np.testing.assert_allclose(test0.get_y_input_shape, shape_y)
 
+    def test_update_appends_windows_and_fine_tunes(self):
+        features = ['target', 'HouseAge', 'AveRooms']
+        predictor = BasicMultStepVar(4, 2, data=data[:200], features=features, scale='standard')
+        predictor.create_lstm()
+        details = predictor.update(data[200:220], replay=8, seed=0)
+        self.assertEqual(len(details.history['loss']), 1)
+        self.assertEqual(details.params['steps'], 3) # 16 new and 8 replay windows, not the history
+        self.assertTrue(predictor._stale_windows)
+        self.assertEqual(len(predictor.get_y_input), 216)
+        self.assertFalse(predictor._stale_windows)
+        np.testing.assert_allclose(predictor.get_y_input[-1], data['target'][218:220])
+        np.testing.assert_allclose(predictor.get_X_input[-1], predictor.scaler.transform(np.array(data[features[1:]][215:219])))
+
+
+    def test_tcn(self):
+        features = ['target', 'HouseAge', 'AveRooms']
+        predictor = BasicMultStepVar(6, 2, data=data[:200], features=features, scale='standard')
+        predictor.create_tcn(spec='compact')
+        predictor.fit_model(1, show_progress=0, batch_size=32)
+        self.assertEqual(predictor.model.output_shape, (None, 2))
+        self.assertEqual(predictor.predict(np.array(data[features[1:]][:6])).shape, (2, 1))
+
+    def test_transformer(self):
+        features = ['target', 'HouseAge', 'AveRooms']
+        predictor = BasicMultStepVar(6, 2, data=data[:200], features=features, scale='standard')
+        predictor.create_transformer(spec=dict(units=(16,)), heads=2)
+        predictor.fit_model(1, show_progress=0, batch_size=32)
+        self.assertEqual(predictor.model.output_shape, (None, 2))
+        self.assertEqual(predictor.predict(np.array(data[features[1:]][:6])).shape, (2, 1))
 
 if __name__ == '__main__':
     unittest.main()
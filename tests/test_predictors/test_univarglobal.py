@@ -0,0 +1,69 @@
+import numpy as np
+import tempfile
+import unittest
+import pandas as pd
+
+from cerberus.predictors.univarglobal import *
+
+data = pd.read_csv('tests/example_dataset/CaliforniaHousing.csv')[:600]
+
+# long format frame of 20 series, each 30 steps long and on a different level
+long = pd.DataFrame({
+    'series': np.repeat([f'sku{i}' for i in range(20)], 30),
+    'value': np.array(data['target']) * np.repeat(np.arange(1, 21), 30),
+    'time': np.tile(np.arange(30), 20)})
+
+test0 = GlobalMultStepUniVar(4, 2, data=long.sample(frac=1, random_state=0), time_column='time', scale='standard')
+test1 = GlobalMultStepUniVar(4, 2, data={key: group['value'] for key, group in long.groupby('series')}, scale='standard', embedding_dim=3)
+
+
+class TestGlobalMultStepUniVar(unittest.TestCase):
+
+    def test_windows_of_all_series(self):
+        self.assertEqual(test0.get_X_input_shape, (20 * 25, 4, 1))
+        self.assertEqual(test0.get_y_input_shape, (20 * 25, 2))
+        self.assertEqual(sorted(test0.scaler.ids), sorted(test1.scaler.ids))
+
+    def test_series_are_scaled_independently(self):
+        values = long[long['series'] == 'sku3']['value'].to_numpy()
+        code = test1.scaler.codes(['sku3'])[0]
+        np.testing.assert_allclose(test1.get_X_input[test1.input_codes == code][0, :, 0], (values[:4] - values.mean()) / values.std())
+
+    def test_validation_holds_out_latest_windows(self):
+        mask = test0._validation_mask(0.2)
+        self.assertEqual(mask.sum(), 20 * 5)
+        self.assertTrue(mask.reshape(20, 25)[:, -5:].all())
+
+    def test_fit_and_predict_all_series(self):
+        for predictor in (test0, test1):
+            predictor.create_lstm()
+            predictor.fit_model(1, show_progress=0, batch_size=64)
+            forecast = predictor.predict(long, batch_size=8)
+            self.assertEqual(forecast.shape, (20, 2))
+            np.testing.assert_allclose(predictor.predict(long, low_latency=True).loc[forecast.index], forecast, rtol=1e-4, atol=1e-4)
+        self.assertEqual(len(test1.model.inputs), 2)
+
+    def test_predict_recursive(self):
+        test1.create_mlp()
+        forecast = test1.predict_recursive(long, 7)
+        self.assertEqual(list(forecast.columns), list(range(1, 8)))
+        np.testing.assert_allclose(forecast[[1, 2]], test1.predict(long), rtol=1e-5)
+
+    def test_predict_unknown_series(self):
+        test0.create_mlp()
+        with self.assertRaises(ValueError):
+            test0.predict({'new': np.arange(10.)})
+        with self.assertRaises(ValueError):
+            test0.predict({'sku1': np.arange(3.)})
+
+    def test_save_and_load(self):
+        test1.create_cnn()
+        with tempfile.TemporaryDirectory() as location:
+            test1.save_model(location)
+            restored = GlobalMultStepUniVar(4, 2, embedding_dim=3)
+            restored.load_model(location)
+        np.testing.assert_allclose(restored.predict(long), test1.predict(long), rtol=1e-5)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -48,6 +48,23 @@ class TestUnivarhybrid(unittest.TestCase):
     def test_get_y_input_shape(self):
         np.testing.assert_allclose(test0.get_y_input_shape, shape_y)
 
+    def test_update_appends_windows_and_fine_tunes(self):
+        predictor = HybridMultStepUniVar(2, 4, 2, data=data[:200], scale='minmax')
+        predictor.create_cnnlstm()
+        details = predictor.update(data[200:220], replay=8, seed=0)
+        self.assertEqual(len(details.history['loss']), 1)
+        self.assertEqual(predictor.get_X_input_shape, (215, 2, 2, 1))
+        np.testing.assert_allclose(predictor.get_y_input[-1].reshape(-1), predictor.scaler.transform(np.array(data[218:220]).reshape(-1, 1)).reshape(-1))
+
+
+    def test_cnntransformer(self):
+        predictor = HybridMultStepUniVar(4, 8, 2, data=data[:200], scale='minmax')
+        predictor.create_cnntransformer(spec='compact', heads=2)
+        predictor.fit_model(1, show_progress=0, batch_size=32)
+        self.assertEqual(predictor.model.output_shape, (None, 2))
+        self.assertEqual(predictor.predict(np.array(data[:8])).shape, (2, 1))
+        # the sub sequence axis is left open, the attention blocks take any number of sub sequences
+        self.assertEqual(predictor.model.predict(np.zeros((3, 7, 2, 1)), verbose=0).shape, (3, 2))
 
 if __name__ == '__main__':
     unittest.main()
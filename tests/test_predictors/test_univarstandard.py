@@ -1,4 +1,5 @@
 import numpy as np
+import tempfile
 import unittest
 import pandas as pd
 
@@ -20,6 +21,12 @@ y = np.array([[1.17289952],
               [0.54461086],
               [0.80025935]])
 
+test1 = BasicMultStepUniVar(
+    2,
+    3,
+    data=data[:100],
+    scale = 'standard')
+
 shape_x = (20636, 2, 1)
 shape_y = (20636, 3, 1)
 
@@ -38,6 +45,58 @@ class TestUnivarstandard(unittest.TestCase):
     def test_get_y_input_shape(self):
         np.testing.assert_allclose(test0.get_y_input_shape, shape_y)
 
+    def test_input_layout_recorded(self):
+        test1.create_lstm()
+        self.assertFalse(test1.flatten_input)
+        test1.create_mlp()
+        self.assertTrue(test1.flatten_input)
+        self.assertEqual(test1.predict(data[:2]).shape, (3, 1))
+
+    def test_predict_raises_on_wrong_window(self):
+        test1.create_mlp()
+        with self.assertRaises(Exception):
+            test1.predict(data[:5])
+
+    def test_update_appends_windows_and_fine_tunes(self):
+        predictor = BasicMultStepUniVar(4, 2, data=data[:200], scale='standard')
+        predictor.create_mlp()
+        mean = predictor.scaler.mean_.copy()
+        details = predictor.update(data[200:220], epochs=2, replay=16, seed=0)
+        self.assertEqual(len(details.history['loss']), 2)
+        self.assertEqual(predictor.get_X_input_shape, (215, 4))
+        np.testing.assert_allclose(predictor.scaler.mean_, mean)
+        np.testing.assert_allclose(predictor.get_X_input[-1], (np.array(data[214:218]) - mean) / predictor.scaler.scale_)
+
+    def test_update_reads_store_into_memory(self):
+        with tempfile.TemporaryDirectory() as location:
+            BasicMultStepUniVar(4, 2, data=data[:200], scale='standard').save_store(location)
+            predictor = BasicMultStepUniVar(4, 2, store=location)
+            predictor.create_mlp()
+            with self.assertWarns(UserWarning):
+                predictor.update(data[200:220])
+        self.assertEqual(predictor.get_X_input_shape, (215, 4))
+
+
+    def test_tcn_sees_whole_window(self):
+        predictor = BasicMultStepUniVar(12, 3, data=data[:200], scale='standard')
+        predictor.create_tcn()
+        predictor.fit_model(1, show_progress=0, batch_size=32)
+        window = np.array(data[:12])
+        forecast = predictor.predict(window)
+        self.assertEqual(forecast.shape, (3, 1))
+        window[0] += 5 # the first step of the window reaches the output through the dilated convolutions
+        self.assertFalse(np.allclose(predictor.predict(window), forecast))
+
+    def test_transformer_save_and_load(self):
+        predictor = BasicMultStepUniVar(8, 3, data=data[:200], scale='standard')
+        predictor.create_transformer()
+        predictor.fit_model(1, show_progress=0, batch_size=32)
+        forecast = predictor.predict(np.array(data[:8]))
+        self.assertEqual(forecast.shape, (3, 1))
+        with tempfile.TemporaryDirectory() as location:
+            predictor.save_model(location)
+            predictor.load_model(location)
+        np.testing.assert_allclose(predictor.predict(np.array(data[:8])), forecast, rtol=1e-5)
 
 if __name__ == '__main__':
     unittest.main()
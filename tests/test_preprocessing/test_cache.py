@@ -0,0 +1,70 @@
+import numpy as np
+import os
+import tempfile
+import unittest
+import pandas as pd
+
+from cerberus.preprocessing.cache import *
+from cerberus.predictors.univarstandard import BasicMultStepUniVar
+from cerberus.predictors.multivarhybrid import HybridMultStepVar
+
+data = pd.read_csv('tests/example_dataset/CaliforniaHousing.csv')[:300]
+
+features = ['target', 'HouseAge', 'AveRooms', 'Latitude']
+
+
+class TestCache(unittest.TestCase):
+
+    def test_fingerprint(self):
+        self.assertEqual(fingerprint(data, steps_past=4), fingerprint(data.copy(), steps_past=4))
+        self.assertNotEqual(fingerprint(data, steps_past=4), fingerprint(data, steps_past=5))
+        changed = data.copy()
+        changed.iloc[10, 2] += 1
+        self.assertNotEqual(fingerprint(data), fingerprint(changed))
+        self.assertNotEqual(fingerprint(np.zeros(4)), fingerprint(np.zeros((2, 2))))
+
+    def test_predictor_hit_matches_preparation(self):
+        with tempfile.TemporaryDirectory() as directory:
+            cache = PreparedCache(directory)
+            miss = HybridMultStepVar(2, 6, 3, data=data, features=features, scale='standard', cache=cache)
+            hit = HybridMultStepVar(2, 6, 3, data=data, features=features, scale='standard', cache=cache)
+            self.assertEqual(len(os.listdir(directory)), 1)
+            self.assertIsInstance(hit.input_x, np.memmap)
+            np.testing.assert_array_equal(hit.get_X_input, miss.get_X_input)
+            np.testing.assert_array_equal(hit.get_y_input, miss.get_y_input)
+            np.testing.assert_allclose(hit.scaler.mean_, miss.scaler.mean_)
+            self.assertEqual(hit.modified_back, miss.modified_back)
+
+            HybridMultStepVar(2, 6, 2, data=data, features=features, scale='standard', cache=cache)
+            self.assertEqual(len(os.listdir(directory)), 2)
+
+    def test_streaming_entry_without_x(self):
+        with tempfile.TemporaryDirectory() as directory:
+            cache = PreparedCache(directory)
+            HybridMultStepVar(2, 6, 3, data=data, features=features, streaming=True, cache=cache)
+            hit = HybridMultStepVar(2, 6, 3, data=data, features=features, streaming=True, cache=cache)
+            self.assertIsNone(hit.input_x)
+            self.assertEqual(hit.get_X_input_shape[1:], (2, 9, 1))
+
+    def test_lru_eviction(self):
+        with tempfile.TemporaryDirectory() as directory:
+            cache = PreparedCache(directory, max_bytes=0)
+            for steps_past in (4, 6):
+                BasicMultStepUniVar(steps_past, 2, data=data['target'], cache=cache)
+            self.assertEqual(len(os.listdir(directory)), 1) # only the entry just written survives
+
+            cache.max_bytes = 10**9
+            first = fingerprint(data['target'], predictor='BasicMultStepUniVar', steps_past=6, steps_future=2, scale='')
+            BasicMultStepUniVar(8, 2, data=data['target'], cache=cache)
+            os.utime(os.path.join(directory, first), (0, 0))
+            cache.max_bytes = cache.size() - 1
+            cache.evict()
+            self.assertNotIn(first, os.listdir(directory))
+            self.assertEqual(len(os.listdir(directory)), 1)
+
+            cache.clear()
+            self.assertEqual(cache.size(), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
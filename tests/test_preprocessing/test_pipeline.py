@@ -0,0 +1,56 @@
+import numpy as np
+import unittest
+import pandas as pd
+
+from cerberus.preprocessing.pipeline import *
+from cerberus.predictors.multivarhybrid import HybridMultStepVar
+
+data = pd.read_csv('tests/example_dataset/CaliforniaHousing.csv')
+series = np.array(data['target'][:500]).reshape(-1, 1)
+
+features = ['target', 'HouseAge', 'AveRooms', 'Latitude']
+test0 = HybridMultStepVar(2, 6, 3, data=data[:500], features=features, scale='standard')
+test1 = HybridMultStepVar(2, 6, 3, data=data[:500], features=features, scale='standard', streaming=True)
+
+
+def collect(dataset):
+    X, y = zip(*[(X.numpy(), y.numpy()) for X, y in dataset])
+    return np.concatenate(X), np.concatenate(y)
+
+
+class TestPipeline(unittest.TestCase):
+
+    def test_window_dataset_matches_windows(self):
+        X, y = collect(window_dataset(series, series, 4, 2, (4, 1), (2, 1), batch_size=32))
+        np.testing.assert_allclose(X[7], series[7:11], rtol=1e-6)
+        np.testing.assert_allclose(y[7], series[11:13], rtol=1e-6)
+        self.assertEqual(X.shape, (495, 4, 1))
+
+    def test_validation_split(self):
+        train, validation = train_validation_datasets(series, series, 4, 2, (4, 1), (2, 1), validation_split=0.2, batch_size=32)
+        self.assertEqual(len(collect(train)[0]), 396)
+        self.assertEqual(len(collect(validation)[0]), 99)
+
+    def test_hybrid_layout_matches_multistep_prep(self):
+        matrix = np.ascontiguousarray(test1.data[1:].transpose())
+        X, y = collect(window_dataset(matrix, test1.data[0], 6, 3, test1.get_X_input_shape[1:], (3,), target_offset=-1, layout=test1._stream_layout, batch_size=64))
+        np.testing.assert_allclose(X, test0.get_X_input, rtol=1e-6)
+        np.testing.assert_allclose(y, test0.get_y_input, rtol=1e-6)
+
+    def test_streaming_keeps_no_window_tensor(self):
+        self.assertIsNone(test1.get_X_input)
+        self.assertEqual(test1.get_X_input_shape, test0.get_X_input_shape)
+
+    def test_streaming_fit_matches_arrays(self):
+        test0.create_cnnlstm()
+        test1.create_cnnlstm()
+        test0.fit_model(1, show_progress=0, batch_size=32)
+        test1.fit_model(1, show_progress=0, batch_size=32)
+        self.assertEqual(test1.details.params['steps'], test0.details.params['steps'])
+        split = int(len(test0.get_X_input) * 0.8)
+        loss = test1.model.evaluate(test0.get_X_input[split:], test0.get_y_input[split:], batch_size=32, verbose=0, return_dict=True)['loss']
+        self.assertAlmostEqual(test1.details.history['val_loss'][-1], loss, places=5)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,60 @@
+import numpy as np
+import pickle
+import tempfile
+import unittest
+import pandas as pd
+
+from cerberus.preprocessing.scaling import *
+from cerberus.predictors.univarstandard import BasicMultStepUniVar
+
+data = pd.read_csv('tests/example_dataset/CaliforniaHousing.csv')[:200]
+
+test0 = BasicMultStepUniVar(4, 2, data=data['target'], scale='standard')
+test0.create_mlp()
+
+window = np.array(data['target'][10:14])
+
+
+class TestScaling(unittest.TestCase):
+
+    def test_scalers_are_picklable(self):
+        for method in ['', 'standard', 'minmax', 'maxabs', 'normalize']:
+            scaler = get_scaler(method).fit(np.arange(6.).reshape(3, 2))
+            restored = pickle.loads(pickle.dumps(scaler))
+            np.testing.assert_allclose(restored.transform([[1., 2.]]), scaler.transform([[1., 2.]]))
+
+    def test_normalize_uses_fitted_range(self):
+        scaler = get_scaler('normalize').fit(np.array([[0.], [10.]]))
+        np.testing.assert_allclose(scaler.transform([[5.], [20.]]), [[0.5], [2.0]])
+
+    def test_series_scaler(self):
+        scaler = SeriesScaler('minmax').fit({'a': [0., 10.], 'b': [5., 5., 7.]})
+        codes = scaler.codes(['b', 'a'])
+        scaled = scaler.transform([[6., 7.], [5., 0.]], codes)
+        np.testing.assert_allclose(scaled, [[0.5, 1.], [0.5, 0.]])
+        np.testing.assert_allclose(scaler.inverse_transform(scaled, codes), [[6., 7.], [5., 0.]])
+        with self.assertRaises(ValueError):
+            scaler.codes(['c'])
+        with self.assertRaises(ValueError):
+            SeriesScaler('robust')
+
+    def test_unknown_method(self):
+        with self.assertRaises(ValueError):
+            get_scaler('robust')
+
+    def test_predict_does_not_refit(self):
+        mean = test0.scaler.mean_.copy()
+        test0.predict(window)
+        np.testing.assert_array_equal(test0.scaler.mean_, mean)
+
+    def test_save_and_load_restore_scaler(self):
+        with tempfile.TemporaryDirectory() as location:
+            test0.save_model(location)
+            restored = BasicMultStepUniVar(4, 2, scale='standard')
+            restored.load_model(location)
+        np.testing.assert_array_equal(restored.scaler.mean_, test0.scaler.mean_)
+        np.testing.assert_allclose(restored.predict_batch(window[None]), test0.predict_batch(window[None]), rtol=1e-5)
+
+
+if __name__ == '__main__':
+    unittest.main()
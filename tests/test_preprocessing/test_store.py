@@ -0,0 +1,70 @@
+import numpy as np
+import tempfile
+import unittest
+import pandas as pd
+
+from cerberus.preprocessing.store import *
+from cerberus.predictors.univarhybrid import HybridMultStepUniVar
+from cerberus.predictors.multivarstandard import BasicMultStepVar
+from cerberus.predictors.multivarhybrid import HybridMultStepVar
+
+data = pd.read_csv('tests/example_dataset/CaliforniaHousing.csv')[:300]
+
+features = ['target', 'HouseAge', 'AveRooms', 'Latitude']
+
+
+class TestStore(unittest.TestCase):
+
+    def test_open_store_memory_maps(self):
+        series = np.arange(12.).reshape(6, 2)
+        with tempfile.TemporaryDirectory() as location:
+            write_store(location, series, None, ['a', 'b'])
+            opened, scaler, meta = open_store(location)
+            self.assertIsInstance(opened, np.memmap)
+            self.assertFalse(opened.flags.writeable)
+            np.testing.assert_array_equal(opened, series)
+            self.assertIsNone(scaler)
+            self.assertEqual(meta['features'], ['a', 'b'])
+            del opened
+
+    def test_missing_store(self):
+        with tempfile.TemporaryDirectory() as location:
+            with self.assertRaises(FileNotFoundError):
+                open_store(location)
+
+    def test_univariate_predictor_reopens_windows(self):
+        original = HybridMultStepUniVar(2, 4, 2, data=data['target'], scale='minmax')
+        with tempfile.TemporaryDirectory() as location:
+            original.save_store(location)
+            reopened = HybridMultStepUniVar(2, 4, 2, store=location)
+            np.testing.assert_array_equal(reopened.get_X_input, original.get_X_input)
+            np.testing.assert_array_equal(reopened.get_y_input, original.get_y_input)
+            self.assertTrue(np.shares_memory(reopened.get_X_input, reopened.data))
+            np.testing.assert_allclose(reopened.scaler.data_max_, original.scaler.data_max_)
+
+    def test_multivariate_predictor_reopens_windows(self):
+        original = BasicMultStepVar(4, 2, data=data, features=features, scale='standard')
+        with tempfile.TemporaryDirectory() as location:
+            original.save_store(location)
+            reopened = BasicMultStepVar(6, 3, store=location)
+            expected = BasicMultStepVar(6, 3, data=data, features=features, scale='standard')
+            np.testing.assert_allclose(reopened.get_X_input, expected.get_X_input)
+            np.testing.assert_allclose(reopened.get_y_input, expected.get_y_input)
+            self.assertTrue(np.shares_memory(reopened.get_X_input, reopened.data))
+            self.assertEqual(reopened.features, features)
+
+            hybrid = HybridMultStepVar(2, 6, 3, store=location, features=features)
+            self.assertEqual(hybrid.get_X_input_shape, HybridMultStepVar(2, 6, 3, data=data, features=features, scale='standard').get_X_input_shape)
+
+    def test_store_kind_is_checked(self):
+        original = BasicMultStepVar(4, 2, data=data, features=features, scale='standard')
+        with tempfile.TemporaryDirectory() as location:
+            original.save_store(location)
+            with self.assertRaises(ValueError):
+                BasicMultStepVar(4, 2, store=location, features=features[:2])
+            with self.assertRaises(ValueError):
+                HybridMultStepUniVar(2, 4, 2, store=location)
+
+
+if __name__ == '__main__':
+    unittest.main()
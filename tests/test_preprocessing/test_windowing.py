@@ -0,0 +1,92 @@
+import numpy as np
+import tempfile
+import unittest
+import pandas as pd
+
+from cerberus.preprocessing.windowing import *
+
+data = pd.read_csv('tests/example_dataset/CaliforniaHousing.csv')
+series = np.array(data['target']).reshape(-1, 1)
+row = np.array(data['HouseAge'])
+matrix = np.array(data[['target', 'HouseAge', 'AveRooms', 'Latitude']]).transpose()
+
+
+def loop_windows(input_sequence, steps_past, steps_future, target_offset):
+    '''Reference implementation of the original per-index windowing loop.
+    '''
+    X = []
+    y = []
+    length = len(input_sequence)
+    for i in range(length):
+        last = i + steps_past
+        if last > length - steps_future:
+            if target_offset < 0:
+                X.append(input_sequence[i:last])
+                y.append(input_sequence[last-1:last-1 + steps_future])
+            break
+        X.append(input_sequence[i:last])
+        y.append(input_sequence[last + target_offset:last + target_offset + steps_future])
+    return np.array(X), np.array(y)
+
+
+class TestWindowing(unittest.TestCase):
+
+    def test_sliding_windows_shape(self):
+        self.assertEqual(sliding_windows(series, 4).shape, (20637, 4, 1))
+
+    def test_sliding_windows_read_only(self):
+        windows = sliding_windows(series, 4)
+        self.assertFalse(windows.flags.writeable)
+        self.assertTrue(np.shares_memory(windows, series))
+
+    def test_univariate_matches_loop(self):
+        X, y = sequence_windows(series, 7, 3)
+        X_loop, y_loop = loop_windows(series, 7, 3, 0)
+        np.testing.assert_array_equal(X, X_loop)
+        np.testing.assert_array_equal(y, y_loop)
+
+    def test_multivariate_matches_loop(self):
+        X, y = sequence_windows(row, 5, 4, target_offset=-1)
+        X_loop, y_loop = loop_windows(row, 5, 4, -1)
+        np.testing.assert_array_equal(X, X_loop)
+        np.testing.assert_array_equal(y, y_loop)
+
+    def test_multivariate_short_sequence(self):
+        X, y = sequence_windows(row[:6], 5, 4, target_offset=-1)
+        X_loop, y_loop = loop_windows(row[:6], 5, 4, -1)
+        np.testing.assert_array_equal(X, X_loop)
+        np.testing.assert_array_equal(y, y_loop)
+
+    def test_multivariate_windows_matches_dstack(self):
+        X, y = multivariate_windows(matrix, 6, 2)
+        X_loop = np.dstack([loop_windows(matrix[i], 6, 2, -1)[0].reshape(-1, 6, 1) for i in range(1, len(matrix))])
+        _, y_loop = loop_windows(matrix[0], 6, 2, -1)
+        np.testing.assert_array_equal(X, X_loop)
+        np.testing.assert_array_equal(y, y_loop)
+
+    def test_panel_windows_match_per_sequence(self):
+        sequences = [row[:30], row[30:32], row[32:50]]
+        X, y, index = panel_windows(sequences, 4, 2)
+        expected = [sequence_windows(sequence, 4, 2) for sequence in (sequences[0], sequences[2])]
+        np.testing.assert_array_equal(X, np.concatenate([X for X, _ in expected]))
+        np.testing.assert_array_equal(y, np.concatenate([y for _, y in expected]))
+        np.testing.assert_array_equal(index, [0] * 25 + [2] * 13)
+
+    def test_append_series_warns_on_memmap(self):
+        with tempfile.TemporaryDirectory() as location:
+            stored = np.lib.format.open_memmap(f'{location}/series.npy', mode='w+', dtype=float, shape=(10,))
+            with self.assertWarns(UserWarning):
+                appended = append_series(stored, np.ones(2))
+            del stored
+        self.assertNotIsInstance(appended, np.memmap)
+        self.assertEqual(appended.shape, (12,))
+
+    def test_invalid_steps(self):
+        with self.assertRaises(ValueError):
+            sequence_windows(series[:3], 3, 1)
+        with self.assertRaises(ValueError):
+            sequence_windows(series, 3, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,38 @@
+import numpy as np
+import unittest
+import pandas as pd
+
+from tensorflow import keras
+
+from cerberus.training.acceleration import *
+from cerberus.predictors.univarstandard import BasicMultStepUniVar
+
+data = pd.read_csv('tests/example_dataset/CaliforniaHousing.csv')[:200]
+
+test0 = BasicMultStepUniVar(4, 2, data=data['target'], scale='standard')
+
+
+class TestAcceleration(unittest.TestCase):
+
+    def test_precision_policy_restores(self):
+        with precision_policy(True):
+            self.assertEqual(keras.mixed_precision.global_policy().name, MIXED_POLICY)
+        self.assertEqual(keras.mixed_precision.global_policy().name, 'float32')
+
+    def test_jit_compile(self):
+        test0.create_lstm(jit_compile=True)
+        self.assertTrue(test0.model.jit_compile)
+        test0.fit_model(1, show_progress=0, batch_size=64, jit_compile=False)
+        self.assertFalse(test0.model.jit_compile)
+
+    @unittest.skipUnless(bfloat16_supported(), 'CPU without bfloat16 support')
+    def test_mixed_precision(self):
+        test0.create_gru(mixed_precision=True)
+        self.assertEqual(test0.model.layers[0].compute_dtype, 'bfloat16')
+        self.assertEqual(test0.model.output.dtype, 'float32')
+        self.assertEqual(keras.mixed_precision.global_policy().name, 'float32')
+        self.assertEqual(test0.predict(data['target'][:4]).shape, (2, 1))
+
+
+if __name__ == '__main__':
+    unittest.main()
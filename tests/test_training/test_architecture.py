@@ -0,0 +1,94 @@
+import numpy as np
+import unittest
+import pandas as pd
+
+from cerberus.training.architecture import *
+from cerberus.predictors.univarstandard import BasicMultStepUniVar
+from cerberus.predictors.univarhybrid import HybridMultStepUniVar
+from cerberus.predictors.multivarstandard import BasicMultStepVar
+from cerberus.predictors.univarglobal import GlobalMultStepUniVar
+
+data = pd.read_csv('tests/example_dataset/CaliforniaHousing.csv')[:200]
+
+test0 = BasicMultStepUniVar(10, 5, data=data['target'], scale='standard')
+test1 = HybridMultStepUniVar(2, 10, 5, data=data['target'], scale='standard')
+test2 = BasicMultStepVar(10, 5, data=data, features=['target', 'HouseAge', 'AveRooms'], scale='standard')
+test3 = GlobalMultStepUniVar(10, 5, data={'a': data['target'][:100], 'b': data['target'][100:]})
+
+
+class TestArchitecture(unittest.TestCase):
+
+    def test_sizes(self):
+        self.assertEqual(resolve_spec('default').sizes((40, 50, 50)), (40, 50, 50))
+        self.assertEqual(resolve_spec('compact').sizes((40, 50, 50)), (25,))
+        self.assertEqual(ArchitectureSpec(width=2, depth=4).sizes((40, 50, 50)), (80, 80, 100, 100))
+        self.assertEqual(ArchitectureSpec(width=2, units=(8, 4)).sizes((40, 50, 50)), (8, 4))
+        self.assertEqual(resolve_spec({'width': 0.01}).scaled(50), 1)
+
+    def test_temporal_depth(self):
+        self.assertEqual(temporal_depth(10), 3)
+        self.assertGreaterEqual(receptive_field(temporal_depth(100, 3), 3), 100)
+        self.assertLess(receptive_field(temporal_depth(100, 3) - 1, 3), 100)
+
+    def test_tcn_report(self):
+        test0.create_tcn()
+        report = test0.model_report()
+        self.assertEqual(report.params.sum(), test0.model.count_params())
+        self.assertFalse(report.flops.isna().any())
+        self.assertEqual(test0.model.output_shape, (None, 5))
+
+    def test_invalid_spec(self):
+        with self.assertRaises(ValueError):
+            resolve_spec('tiny')
+        with self.assertRaises(ValueError):
+            ArchitectureSpec(depth=0)
+        with self.assertRaises(ValueError):
+            ArchitectureSpec(width=-1)
+
+    def test_lstm_report(self):
+        test0.create_lstm()
+        report = test0.model_report()
+        self.assertEqual(report.params.sum(), test0.model.count_params())
+        # LSTM(40) on one feature, LSTM(50), LSTM(50) over 10 steps and the Dense(5) output
+        flops = 2 * 4 * 10 * ((1 + 40) * 40 + (40 + 50) * 50 + (50 + 50) * 50) + 2 * 50 * 5
+        self.assertEqual(report.flops.sum(), flops)
+
+    def test_compact(self):
+        test0.create_lstm()
+        default = test0.model_report().sum()
+        test0.create_lstm(spec='compact')
+        compact = test0.model_report().sum()
+        self.assertEqual(len(test0.model.layers), 2)
+        self.assertLess(compact.params * 10, default.params)
+        self.assertLess(compact.flops * 10, default.flops)
+        self.assertEqual(test0.predict(data['target'][:10]).shape, (5, 1))
+
+    def test_encdec_spec(self):
+        test0.create_encdec_gru(spec=ArchitectureSpec(units=(16, 8)))
+        self.assertEqual([layer.units for layer in test0.model.layers if hasattr(layer, 'units')][:4], [16, 8, 8, 16])
+        self.assertFalse(test0.model_report().flops.isna().any())
+
+    def test_hybrid_report(self):
+        test1.create_cnnbilstm(spec='compact')
+        report = test1.model_report()
+        self.assertEqual(report.params.sum(), test1.model.count_params())
+        self.assertFalse(report.flops.isna().any())
+        test1.fit_model(1, show_progress=0)
+        self.assertEqual(test1.predict(data['target'][:10]).shape, (5, 1))
+
+    def test_multivariate_cnn(self):
+        test2.create_cnn(spec=ArchitectureSpec(width=0.5, depth=3))
+        self.assertEqual([layer.filters for layer in test2.model.layers if type(layer).__name__ == 'Conv1D'], [32, 32, 16])
+        report = test2.model_report()
+        self.assertEqual(report.params.sum(), test2.model.count_params())
+        self.assertFalse(report.flops.isna().any())
+
+    def test_global_spec(self):
+        test3.create_mlp(spec=ArchitectureSpec(width=2, depth=3))
+        widths = [layer.units for layer in test3.model.layers if type(layer).__name__ == 'Dense']
+        self.assertEqual(widths, [100, 100, 50, 50, 5])
+        self.assertEqual(test3.model_report().params.sum(), test3.model.count_params())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,32 @@
+import numpy as np
+import unittest
+
+from tensorflow import keras
+
+from cerberus.training.attention import *
+from cerberus.training.architecture import model_report
+
+
+class TestAttention(unittest.TestCase):
+
+    def test_positional_encoding(self):
+        encoded = PositionalEncoding()(np.zeros((2, 5, 4), dtype='float32')).numpy()
+        np.testing.assert_allclose(encoded[0], encoded[1])
+        np.testing.assert_allclose(encoded[0, :, 0], np.sin(np.arange(5)), atol=1e-6)
+        np.testing.assert_allclose(encoded[0, :, 1], np.cos(np.arange(5)), atol=1e-6)
+        np.testing.assert_allclose(encoded[0, :, 2], np.sin(np.arange(5) / 100), atol=1e-6)
+
+    def test_attention_blocks(self):
+        inputs = keras.Input(shape=(None, 3))
+        model = keras.Model(inputs, attention_blocks(inputs, (16, 8), heads=2))
+        self.assertEqual(model.output_shape, (None, 8))
+        self.assertEqual(model.predict(np.zeros((4, 7, 3)), verbose=0).shape, (4, 8))
+        report = model_report(model, steps=7)
+        self.assertEqual(report.params.sum(), model.count_params())
+        attention = report[report.type == 'MultiHeadAttention'].flops.iloc[0]
+        # query, key, value and output projections plus scores and weighted values over 7 steps of width 16
+        self.assertEqual(attention, 4 * 2 * 7 * 16 * 16 + 2 * 2 * 7 * 7 * 16)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,76 @@
+import os
+import json
+import tempfile
+import numpy as np
+import unittest
+import pandas as pd
+
+from tensorflow import keras
+
+from cerberus.training.checkpoints import *
+from cerberus.predictors.univarstandard import BasicMultStepUniVar
+from cerberus.predictors.multivarhybrid import HybridMultStepVar
+
+data = pd.read_csv('tests/example_dataset/CaliforniaHousing.csv')[:300]
+features = ['target', 'HouseAge', 'AveRooms', 'Latitude']
+
+
+def predictor(initial_weights=None):
+    '''Predictor with an MLP, optionally starting from given weights.
+    '''
+    test = BasicMultStepUniVar(4, 2, data=data['target'], scale='standard')
+    test.create_mlp()
+    if initial_weights is not None:
+        test.model.set_weights(initial_weights)
+    return test
+
+
+class TestCheckpoints(unittest.TestCase):
+
+    def test_early_stopping(self):
+        test = predictor()
+        test.model.compile(optimizer=keras.optimizers.Adam(0.0), loss='mean_squared_error') # validation loss never improves
+        history = test.fit_model(20, show_progress=0, early_stopping=2)
+        self.assertEqual(len(history.history['val_loss']), 3)
+
+    def test_checkpoints_written(self):
+        with tempfile.TemporaryDirectory() as location:
+            test = HybridMultStepVar(2, 4, 2, data=data, features=features, scale='standard')
+            test.create_cnnlstm()
+            test.fit_model(4, show_progress=0, early_stopping=3, checkpoint_dir=location, checkpoint_every=2)
+            with open(os.path.join(location, STATE_FILE)) as file:
+                state = json.load(file)
+            self.assertEqual(state['epoch'], 4)
+            self.assertEqual(set(state['early_stopping']), {'wait', 'best', 'best_epoch'})
+            self.assertTrue(os.path.exists(os.path.join(location, 'ckpt-2.index')))
+            self.assertTrue(os.path.exists(os.path.join(location, BEST_WEIGHTS_FILE)))
+
+            resumed = test.fit_model(5, show_progress=0, early_stopping=3, checkpoint_dir=location, resume=True)
+            self.assertEqual(resumed.epoch, [4])
+
+    def test_resume(self):
+        initial = predictor().model.get_weights()
+        with tempfile.TemporaryDirectory() as location:
+            interrupted = predictor(initial)
+            interrupted.fit_model(2, show_progress=0, checkpoint_dir=location) # without early stopping the last weights are kept
+            iterations = int(interrupted.model.optimizer.iterations.numpy())
+
+            resumed = predictor(initial)
+            history = resumed.fit_model(2, show_progress=0, checkpoint_dir=location, resume=True) # nothing left to train
+            self.assertEqual(history.history, {})
+            for restored, saved in zip(resumed.model.get_weights(), interrupted.model.get_weights()):
+                np.testing.assert_array_equal(restored, saved)
+
+            history = resumed.fit_model(3, show_progress=0, early_stopping=5, checkpoint_dir=location, resume=True)
+            self.assertEqual(history.epoch, [2])
+            self.assertEqual(int(resumed.model.optimizer.iterations.numpy()), iterations * 3 // 2) # optimizer state continued
+            with open(os.path.join(location, STATE_FILE)) as file:
+                self.assertEqual(json.load(file)['epoch'], 3)
+
+    def test_resume_needs_directory(self):
+        with self.assertRaises(ValueError):
+            predictor().fit_model(2, show_progress=0, resume=True)
+
+
+if __name__ == '__main__':
+    unittest.main()
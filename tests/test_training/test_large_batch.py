@@ -0,0 +1,56 @@
+import numpy as np
+import unittest
+import pandas as pd
+
+from tensorflow import keras
+
+from cerberus.training.large_batch import *
+from cerberus.predictors.univarstandard import BasicMultStepUniVar
+
+data = pd.read_csv('tests/example_dataset/CaliforniaHousing.csv')[:2000]
+
+test0 = BasicMultStepUniVar(4, 2, data=data['target'], scale='standard')
+
+
+class RecordLearningRate(keras.callbacks.Callback):
+
+    def on_train_begin(self, logs=None):
+        self.rates = []
+
+    def on_train_batch_end(self, batch, logs=None):
+        self.rates.append(float(keras.backend.get_value(self.model.optimizer.learning_rate)))
+
+
+class TestLargeBatch(unittest.TestCase):
+
+    def test_scaled_learning_rate(self):
+        self.assertAlmostEqual(scaled_learning_rate(0.001, 40, rule='linear'), 0.004)
+        self.assertAlmostEqual(scaled_learning_rate(0.001, 40, rule='sqrt'), 0.002)
+        self.assertAlmostEqual(scaled_learning_rate(0.001, 10), 0.001)
+
+    def test_unknown_rule(self):
+        with self.assertRaises(ValueError):
+            scaled_learning_rate(0.001, 40, rule='cubic')
+
+    def test_no_callbacks_by_default(self):
+        test0.create_mlp()
+        self.assertEqual(large_batch_callbacks(test0.model, 1000, False), [])
+
+    def test_warmup_ramps_and_restores(self):
+        test0.create_mlp()
+        recorder = RecordLearningRate()
+        warmup = LearningRateWarmup(0.01, warmup_epochs=2)
+        test0.model.fit(test0.input_x, test0.input_y, batch_size=500, epochs=3, verbose=0, callbacks=[warmup, recorder])
+        self.assertTrue(np.all(np.diff(recorder.rates[:8]) > 0))
+        self.assertAlmostEqual(recorder.rates[-1], 0.01, places=6)
+        self.assertAlmostEqual(float(keras.backend.get_value(test0.model.optimizer.learning_rate)), 0.001, places=6)
+
+    def test_fit_model_large_batch(self):
+        test0.create_lstm()
+        details = test0.fit_model(2, show_progress=0, batch_size=1024, large_batch=True, warmup_epochs=1)
+        self.assertEqual(len(details.history['loss']), 2)
+        self.assertTrue(np.isfinite(details.history['loss']).all())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,93 @@
+import os
+import math
+import sqlite3
+import tempfile
+import unittest
+import pandas as pd
+
+from cerberus.training.search import *
+from cerberus.training.search import _trial
+from cerberus.predictors.univarstandard import BasicMultStepUniVar
+from cerberus.predictors.univarhybrid import HybridMultStepUniVar
+
+data = pd.read_csv('tests/example_dataset/CaliforniaHousing.csv')[:300]
+
+space = {'steps_past': [4, 6], 'steps_future': [2], 'sub_seq': [2, 4], 'scale': ['standard'], 'architecture': ['create_mlp', 'create_cnn', 'create_cnnlstm']}
+
+
+class TestSearch(unittest.TestCase):
+
+    def test_rungs(self):
+        self.assertEqual(rungs(1, 27, 3), [1, 3, 9, 27])
+        self.assertEqual(rungs(2, 10, 2), [2, 4, 8])
+        with self.assertRaises(ValueError):
+            rungs(4, 2, 3)
+
+    def test_candidates(self):
+        trials = candidates([BasicMultStepUniVar, HybridMultStepUniVar], space)
+        standard = [(params, builder) for cls, params, builder in trials if cls is BasicMultStepUniVar]
+        hybrid = [(params, builder) for cls, params, builder in trials if cls is HybridMultStepUniVar]
+        self.assertEqual(len(standard), 4) # sub_seq does not apply, create_cnnlstm is not a builder of the class
+        self.assertEqual(len(hybrid), 3) # steps_past 6 cannot be split into 4 sub sequences
+        self.assertTrue(all('sub_seq' not in params for params, _ in standard))
+        self.assertEqual(len(candidates([BasicMultStepUniVar, HybridMultStepUniVar], space, samples=3)), 3)
+        with self.assertRaises(ValueError):
+            candidates([BasicMultStepUniVar], {'architecture': ['create_cnnlstm']})
+
+    def test_successive_halving_resumes(self):
+        config = dict(data=data['target'])
+        with tempfile.TemporaryDirectory() as directory:
+            storage = os.path.join(directory, 'search.sqlite')
+            leaderboard = run_search([BasicMultStepUniVar, HybridMultStepUniVar], config, space, storage, min_epochs=1, max_epochs=3, eta=3, fit_options=dict(batch_size=32), processes=2)
+            self.assertEqual(len(leaderboard), 7)
+            self.assertEqual(list(leaderboard['rung']), [1, 1, 1, 0, 0, 0, 0]) # ceil(7 / 3) promoted
+            self.assertEqual(list(leaderboard['epochs'][:3]), [3, 3, 3])
+            self.assertTrue(leaderboard['score'][:3].is_monotonic_increasing)
+            self.assertEqual(leaderboard['error'].notna().sum(), 1) # 4 sub sequences of length 1 are too short for the pooling of create_cnnlstm
+            self.assertTrue(pd.isna(leaderboard['val_loss'].iloc[-1]))
+            self.assertTrue(pd.isna(leaderboard['score'].iloc[-1]))
+
+            with sqlite3.connect(storage) as connection:
+                results = connection.execute('SELECT COUNT(*) FROM results').fetchone()[0]
+            again = run_search([BasicMultStepUniVar, HybridMultStepUniVar], config, space, storage, min_epochs=1, max_epochs=3, eta=3, fit_options=dict(batch_size=32), processes=1)
+            with sqlite3.connect(storage) as connection:
+                self.assertEqual(connection.execute('SELECT COUNT(*) FROM results').fetchone()[0], results) # nothing trained again
+            pd.testing.assert_frame_equal(again, leaderboard)
+
+            longer = run_search([BasicMultStepUniVar], config, {**space, 'architecture': ['create_mlp']}, storage, min_epochs=1, max_epochs=9, eta=3, fit_options=dict(batch_size=32), processes=1)
+            self.assertEqual(set(longer['trial']) & set(leaderboard['trial']), set()) # other rung budgets are new trials
+            self.assertEqual(longer['epochs'].max(), 9)
+            smaller = run_search([BasicMultStepUniVar], config, {**space, 'architecture': ['create_mlp']}, storage, min_epochs=1, max_epochs=3, eta=3, fit_options=dict(batch_size=16), processes=1)
+            self.assertEqual(set(smaller['trial']) & set(leaderboard['trial']), set()) # other training options are new trials
+
+    def test_trial_without_new_epochs_fails(self):
+        with tempfile.TemporaryDirectory() as directory:
+            store, checkpoint_dir = os.path.join(directory, 'store'), os.path.join(directory, 'checkpoints')
+            BasicMultStepUniVar(4, 2, data=data['target'], scale='standard').save_store(store)
+            config = dict(steps_past=4, steps_future=2)
+            val_loss, score, _ = _trial(BasicMultStepUniVar, config, store, 'create_mlp', 2, {}, checkpoint_dir, data['target'], 10, 2)
+            self.assertFalse(math.isnan(val_loss) or math.isnan(score))
+            with self.assertRaises(ValueError): # the checkpoint already holds 2 epochs
+                _trial(BasicMultStepUniVar, config, store, 'create_mlp', 1, {}, checkpoint_dir, data['target'], 10, 2)
+
+    def test_holdout(self):
+        trials = candidates([BasicMultStepUniVar], {'steps_past': [4, 6], 'steps_future': [2, 3], 'architecture': ['create_mlp']})
+        # validation targets start at row 240 for steps_past 4 and steps_future 2, origins end 3 steps before the last row
+        self.assertEqual(holdout(trials, dict(data=data['target']), 0.2), (240, 58, 2))
+        with self.assertRaises(ValueError):
+            holdout(trials, dict(data=data['target']), 0)
+
+    def test_scalings_are_ranked_in_original_units(self):
+        config = dict(data=data['target'])
+        mixed = {'steps_past': [4], 'steps_future': [2, 3], 'scale': ['standard', 'minmax'], 'architecture': ['create_mlp']}
+        with tempfile.TemporaryDirectory() as directory:
+            leaderboard = run_search([BasicMultStepUniVar], config, mixed, os.path.join(directory, 'search.sqlite'), min_epochs=2, max_epochs=2, fit_options=dict(batch_size=32), processes=2)
+        self.assertTrue(leaderboard['score'].is_monotonic_increasing)
+        scales = leaderboard['params'].map(lambda params: params['scale'])
+        # minmax losses are in units of the [0, 1] range, an order of magnitude below the standardised ones, scores are not
+        self.assertLess(leaderboard['val_loss'][scales == 'minmax'].max() * 5, leaderboard['val_loss'][scales == 'standard'].min())
+        self.assertLess(leaderboard['score'].max(), leaderboard['score'].min() * 5)
+
+
+if __name__ == '__main__':
+    unittest.main()
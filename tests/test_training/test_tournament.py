@@ -0,0 +1,40 @@
+import os
+import tempfile
+import unittest
+import pandas as pd
+
+from cerberus.training.tournament import *
+from cerberus.predictors.univarstandard import BasicMultStepUniVar
+from cerberus.predictors.multivarhybrid import HybridMultStepVar
+
+data = pd.read_csv('tests/example_dataset/CaliforniaHousing.csv')[:300]
+
+
+class TestTournament(unittest.TestCase):
+
+    def test_leaderboard(self):
+        config = dict(steps_past=4, steps_future=2, data=data['target'], scale='standard')
+        with tempfile.TemporaryDirectory() as directory:
+            leaderboard = run_tournament(BasicMultStepUniVar, config, 1, ['create_mlp', ('create_cnn', {'loss': 'mae'})], fit_options=dict(batch_size=32), processes=2, model_directory=directory)
+            self.assertEqual(sorted(os.listdir(directory)), ['create_cnn', 'create_mlp'])
+        self.assertEqual(sorted(leaderboard['architecture']), ['create_cnn', 'create_mlp'])
+        self.assertTrue(leaderboard['val_mse'].is_monotonic_increasing) # create_cnn is trained on mae, both are ranked on mse
+        cnn = leaderboard.set_index('architecture').loc['create_cnn']
+        self.assertNotAlmostEqual(cnn['val_loss'], cnn['val_mse'])
+        self.assertTrue((leaderboard['train_seconds'] > 0).all())
+
+    def test_unknown_architecture(self):
+        with self.assertRaises(ValueError):
+            run_tournament(BasicMultStepUniVar, dict(steps_past=4, steps_future=2, data=data['target']), 1, ['create_cnnlstm'])
+
+    def test_replaced_ranking_metric(self):
+        with self.assertRaises(ValueError):
+            run_tournament(BasicMultStepUniVar, dict(steps_past=4, steps_future=2, data=data['target']), 1, [('create_mlp', {'metrics': 'mae'})])
+
+    def test_architectures_of(self):
+        self.assertIn('create_cnnlstm', architectures_of(HybridMultStepVar))
+        self.assertNotIn('create_mlp', architectures_of(HybridMultStepVar))
+
+
+if __name__ == '__main__':
+    unittest.main()